@@ -1,16 +1,31 @@
 from fluent.syntax import FluentParser
 from fluent.syntax.ast import Resource
 
+from .archive import ArchiveResourceLoader
 from .bundle import FluentBundle
-from .fallback import AbstractResourceLoader, FluentLocalization, FluentResourceLoader, FormattedMessage
+from .fallback import (
+    AbstractResourceLoader,
+    FluentLocalization,
+    FluentResourceLoader,
+    FormattedMessage,
+    MappedFluentResourceLoader,
+)
+from .instrumentation import FormatEvent, LocalizationMetrics, MessageProfiler
+from .lazy import LazyFluentResource
 
 __all__ = [
     "FluentLocalization",
     "AbstractResourceLoader",
+    "ArchiveResourceLoader",
     "FluentResourceLoader",
+    "MappedFluentResourceLoader",
     "FluentResource",
+    "LazyFluentResource",
     "FluentBundle",
     "FormattedMessage",
+    "FormatEvent",
+    "LocalizationMetrics",
+    "MessageProfiler",
 ]
 
 
@@ -0,0 +1,134 @@
+import os
+import zipfile
+from collections.abc import Generator
+from typing import Any, Union
+
+from fluent.syntax import FluentParser
+
+from .fallback import AbstractResourceLoader, LoadedResource, get_stamp
+
+
+class ArchiveResourceLoader(AbstractResourceLoader):
+    """
+    Resource loader to read Fluent files from zip archives.
+
+    Each locale has its own archive, of which the paths should encode the
+    locale code as `{locale}`. The resource_ids are the names of the files
+    in the archives. Each archive is opened once, and its central directory
+    is only read then. Call `refresh` to pick up archives which were added,
+    removed or modified since.
+    """
+
+    def __init__(self, paths: Union[str, list[str]]):
+        """
+        Create a resource loader. The paths may be a string for a single
+        archive per locale, or a list of strings.
+        """
+        self.paths = [paths] if isinstance(paths, str) else paths
+        self._archives: dict[str, Union[zipfile.ZipFile, None]] = {}
+        # The modification time and size of the archives when they were opened.
+        self._stamps: dict[str, Union[tuple[int, int], None]] = {}
+        self._resources: dict[tuple[str, str], LoadedResource] = {}
+
+    def resources(
+        self, locale: str, resource_ids: list[str]
+    ) -> Generator[list[LoadedResource], None, None]:
+        for path in self.paths:
+            archive_path = path.format(locale=locale)
+            archive = self.get_archive(archive_path)
+            if archive is None:
+                continue
+            resources: list[Any] = []
+            for resource_id in resource_ids:
+                name = resource_id.format(locale=locale)
+                try:
+                    resource = self._resources[archive_path, name]
+                except KeyError:
+                    try:
+                        content = archive.read(name)
+                    except KeyError:
+                        continue
+                    resource = FluentParser().parse(content.decode("utf-8"))
+                    self._resources[archive_path, name] = resource
+                resources.append(resource)
+            if resources:
+                yield resources
+
+    def get_archive(self, path: str) -> Union[zipfile.ZipFile, None]:
+        """
+        Open the archive at path, or return None if there is none.
+        """
+        if path not in self._archives:
+            self._stamps[path] = get_stamp(path)
+            try:
+                self._archives[path] = zipfile.ZipFile(path)
+            except FileNotFoundError:
+                self._archives[path] = None
+        return self._archives[path]
+
+    def refresh(self) -> None:
+        """
+        Close the archives which were added, removed or modified since they
+        were opened, and forget their resources.
+        """
+        for path, stamp in list(self._stamps.items()):
+            if get_stamp(path) == stamp:
+                continue
+            archive = self._archives.pop(path)
+            if archive is not None:
+                archive.close()
+            del self._stamps[path]
+            for key in [key for key in self._resources if key[0] == path]:
+                del self._resources[key]
+
+    def close(self) -> None:
+        """
+        Close the archives opened so far.
+        """
+        for archive in self._archives.values():
+            if archive is not None:
+                archive.close()
+        self._archives.clear()
+        self._stamps.clear()
+        self._resources.clear()
+
+
+def build_archive(directory: str, archive_path: str) -> list[str]:
+    """
+    Pack the Fluent files in a directory tree into a zip archive for
+    `ArchiveResourceLoader`, and return their names in the archive.
+
+    The files are named by their paths relative to the directory, with `/`
+    separators. The archive doesn't depend on the order or the times of the
+    files, so that it only changes when their contents change.
+    """
+    names = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".ftl"):
+                path = os.path.relpath(os.path.join(dirpath, filename), directory)
+                names.append(path.replace(os.sep, "/"))
+
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            with open(os.path.join(directory, name), "rb") as file:
+                content = file.read()
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, content)
+    return names
+
+
+def build_archives(root: str, archive_path: str) -> dict[str, str]:
+    """
+    Build an archive for each locale directory in root, at archive_path
+    formatted with `{locale}`. Return the paths of the archives by locale.
+    """
+    archives = {}
+    for entry in sorted(os.scandir(root), key=lambda entry: entry.name):
+        if entry.is_dir():
+            path = archive_path.format(locale=entry.name)
+            build_archive(entry.path, path)
+            archives[entry.name] = path
+    return archives
@@ -1,3 +1,4 @@
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Callable, Literal, Union, cast
 
 import babel
@@ -6,11 +7,22 @@ import babel.plural
 from fluent.syntax import ast as FTL
 
 from .builtins import BUILTINS
-from .prepare import Compiler
-from .resolver import CurrentEnvironment, Message, Pattern, ResolverEnvironment
-from .utils import native_to_fluent
+from .instrumentation import FormatEvent
+from .lazy import LazyFluentResource
+from .prepare import Compiler, Inliner
+from .resolver import (
+    CurrentEnvironment,
+    FluentArgs,
+    Message,
+    MessageReference,
+    Pattern,
+    ResolverEnvironment,
+    TermReference,
+)
+from .utils import collect_references
 
 if TYPE_CHECKING:
+    from .instrumentation import Observer
     from .types import FluentNone, FluentType
 
 PluralCategory = Literal["zero", "one", "two", "few", "many", "other"]
@@ -29,6 +41,9 @@ class FluentBundle:
     external arguments, conditional logic in form of select expressions, traits
     which describe their grammatical features, and can use Fluent builtins.
     See the documentation of the Fluent syntax for more information.
+
+    Set `observer` to a callable to have it called with a `FormatEvent` after
+    each call of `format_pattern`, for example a `MessageProfiler`.
     """
 
     def __init__(
@@ -36,6 +51,7 @@ class FluentBundle:
         locales: list[str],
         functions: Union[dict[str, Callable[..., "FluentType"]], None] = None,
         use_isolating: bool = True,
+        observer: Union["Observer", None] = None,
     ):
         self.locales = locales
         self._functions = {**BUILTINS, **(functions or {})}
@@ -43,10 +59,28 @@ class FluentBundle:
         self._messages: dict[str, Union[FTL.Message, FTL.Term]] = {}
         self._terms: dict[str, Union[FTL.Message, FTL.Term]] = {}
         self._compiled: dict[str, Message] = {}
+        # The ids of the messages and terms referenced by each compiled entry.
+        self._references: dict[str, set[str]] = {}
+        # The ids of the compiled patterns, while there's an observer, and the
+        # patterns which weren't formatted since they were compiled with an
+        # observer.
+        self._pattern_ids: dict[Pattern, str] = {}
+        self._unformatted: set[Pattern] = set()
+        self.observer = observer
+        # Whether the formatted patterns might use external arguments.
+        self._uses_args: dict[Pattern, bool] = {}
+        # The patterns which message and term references of compiled entries
+        # resolved to. These are cleared when entries are replaced.
+        self._links: dict[Union[MessageReference, TermReference], Pattern] = {}
+        # Lazy resources which might define a message or term, in order
+        # of precedence. These are parsed the first time they're needed.
+        self._lazy_messages: dict[str, list[LazyFluentResource]] = {}
+        self._lazy_terms: dict[str, list[LazyFluentResource]] = {}
         # The compiler is not typed, and this cast is only valid for the public API
         self._compiler = cast(
             Callable[[Union[FTL.Message, FTL.Term]], Message], Compiler()
         )
+        self._inliner = Inliner(self)
         self._babel_locale = self._get_babel_locale()
         self._plural_form = cast(
             Callable[[Any], Callable[[Union[int, float]], PluralCategory]],
@@ -57,25 +91,129 @@ class FluentBundle:
             babel.plural.to_python,
         )(self._babel_locale.ordinal_form)
 
+    @property
+    def observer(self) -> Union["Observer", None]:
+        return self._observer
+
+    @observer.setter
+    def observer(self, observer: Union["Observer", None]) -> None:
+        # Only keep the ids of the patterns while they're reported.
+        self._observer = observer
+        self._pattern_ids.clear()
+        if observer is not None:
+            for compiled_id, compiled in list(self._compiled.items()):
+                self._add_pattern_ids(compiled_id, compiled)
+
     def add_resource(
-        self, resource: FTL.Resource, allow_overrides: bool = False
+        self,
+        resource: Union[FTL.Resource, LazyFluentResource],
+        allow_overrides: bool = False,
     ) -> None:
         # TODO - warn/error about duplicates
-        for item in resource.body:
-            if not isinstance(item, (FTL.Message, FTL.Term)):
+        # Don't keep the patterns of replaced entries.
+        self._uses_args.clear()
+        # The ids of the messages and terms which are overridden, with a
+        # leading "-" for terms.
+        replaced: set[str] = set()
+        if isinstance(resource, LazyFluentResource):
+            for message_id in resource.messages:
+                if self._add_lazy(
+                    self._lazy_messages,
+                    self._messages,
+                    message_id,
+                    resource,
+                    allow_overrides,
+                ):
+                    replaced.add(message_id)
+            for term_id in resource.terms:
+                if self._add_lazy(
+                    self._lazy_terms, self._terms, term_id, resource, allow_overrides
+                ):
+                    replaced.add("-" + term_id)
+        else:
+            for item in resource.body:
+                if not isinstance(item, (FTL.Message, FTL.Term)):
+                    continue
+                is_term = isinstance(item, FTL.Term)
+                map_ = self._terms if is_term else self._messages
+                lazy = self._lazy_terms if is_term else self._lazy_messages
+                full_id = item.id.name
+                if allow_overrides and (full_id in map_ or full_id in lazy):
+                    replaced.add("-" + full_id if is_term else full_id)
+                if full_id in lazy:
+                    if allow_overrides:
+                        del lazy[full_id]
+                    else:
+                        self._load_lazy(full_id, term=is_term)
+                if full_id not in map_ or allow_overrides:
+                    map_[full_id] = item
+        if replaced:
+            self._forget_compiled(self._get_dependents(replaced))
+
+    def _add_lazy(
+        self,
+        lazy: dict[str, list[LazyFluentResource]],
+        map_: dict[str, Union[FTL.Message, FTL.Term]],
+        entry_id: str,
+        resource: LazyFluentResource,
+        allow_overrides: bool,
+    ) -> bool:
+        """
+        Add a lazy resource defining an entry. Returns whether it overrides
+        an entry which was added before.
+        """
+        if allow_overrides:
+            replaced = entry_id in map_ or entry_id in lazy
+            lazy.setdefault(entry_id, []).insert(0, resource)
+            return replaced
+        elif entry_id not in map_:
+            lazy.setdefault(entry_id, []).append(resource)
+        return False
+
+    def _forget_compiled(self, compiled_ids: set[str]) -> None:
+        """
+        Drop the compiled entries, to compile them again when they're used,
+        and all links of references to compiled patterns.
+        """
+        for compiled_id in compiled_ids:
+            compiled = self._compiled.pop(compiled_id, None)
+            self._references.pop(compiled_id, None)
+            if compiled is None:
                 continue
-            map_ = self._messages if isinstance(item, FTL.Message) else self._terms
-            full_id = item.id.name
-            if full_id not in map_ or allow_overrides:
-                map_[full_id] = item
+            for pattern in [compiled.value, *compiled.attributes.values()]:
+                if pattern is not None:
+                    self._pattern_ids.pop(pattern, None)
+                    self._unformatted.discard(pattern)
+        self._links.clear()
+
+    def _load_lazy(self, entry_id: str, term: bool = False) -> None:
+        # The entry is only dropped from the lazy ones after it's added, so
+        # that other threads find it in either while it's parsed.
+        lazy = self._lazy_terms if term else self._lazy_messages
+        resources = lazy.get(entry_id)
+        if resources is None:
+            return
+        map_ = self._terms if term else self._messages
+        for resource in resources:
+            entry = resource.get_entry(entry_id, term=term)
+            if entry is not None:
+                map_[entry_id] = entry
+                break
+        lazy.pop(entry_id, None)
 
     def has_message(self, message_id: str) -> bool:
+        if message_id in self._lazy_messages:
+            self._load_lazy(message_id)
         return message_id in self._messages
 
     def get_message(self, message_id: str) -> Message:
         return self._lookup(message_id)
 
-    def _lookup(self, entry_id: str, term: bool = False) -> Message:
+    def _lookup(
+        self, entry_id: str, term: bool = False, active: frozenset[str] = frozenset()
+    ) -> Message:
+        # active has the ids of the entries being inlined, which reference
+        # this one.
         if term:
             compiled_id = "-" + entry_id
         else:
@@ -84,18 +222,85 @@ class FluentBundle:
             return self._compiled[compiled_id]
         except LookupError:
             pass
+        if entry_id in (self._lazy_terms if term else self._lazy_messages):
+            self._load_lazy(entry_id, term=term)
         entry = self._terms[entry_id] if term else self._messages[entry_id]
-        self._compiled[compiled_id] = self._compiler(entry)
-        return self._compiled[compiled_id]
+        self._references[compiled_id] = collect_references(entry)
+        compiled: Message = self._inliner(compiled_id, self._compiler(entry), active)
+        self._compiled[compiled_id] = compiled
+        if self.observer is not None:
+            self._add_pattern_ids(compiled_id, compiled)
+            self._unformatted.update(compiled.attributes.values())
+            if compiled.value is not None:
+                self._unformatted.add(compiled.value)
+        return compiled
+
+    def _add_pattern_ids(self, compiled_id: str, compiled: Message) -> None:
+        if compiled.value is not None:
+            self._pattern_ids[compiled.value] = compiled_id
+        for name, pattern in compiled.attributes.items():
+            self._pattern_ids[pattern] = f"{compiled_id}.{name}"
+
+    def _get_dependents(self, entry_ids: set[str]) -> set[str]:
+        """
+        Returns entry_ids and the ids of the compiled entries which reference
+        any of them, directly or not. Term ids start with "-".
+        """
+        referrers: dict[str, list[str]] = {}
+        for compiled_id, references in list(self._references.items()):
+            for reference in references:
+                referrers.setdefault(reference, []).append(compiled_id)
+        dependents = set(entry_ids)
+        stack = list(entry_ids)
+        while stack:
+            for referrer in referrers.get(stack.pop(), ()):
+                if referrer not in dependents:
+                    dependents.add(referrer)
+                    stack.append(referrer)
+        return dependents
+
+    def _adopt_compiled(self, bundle: "FluentBundle", changed: set[str]) -> None:
+        """
+        Reuse the entries compiled by a bundle with the same locales, options
+        and functions, except for those which depend on the changed messages
+        and terms.
+        """
+        stale = bundle._get_dependents(changed)
+        for compiled_id, compiled in list(bundle._compiled.items()):
+            if compiled_id not in stale and compiled_id not in self._compiled:
+                self._references[compiled_id] = bundle._references[compiled_id]
+                self._compiled[compiled_id] = compiled
+                if self.observer is not None:
+                    self._add_pattern_ids(compiled_id, compiled)
 
     def format_pattern(
         self, pattern: Pattern, args: Union[dict[str, Any], None] = None
     ) -> tuple[Union[str, "FluentNone"], list[Exception]]:
-        if args is not None:
-            fluent_args = {
-                argname: native_to_fluent(argvalue)
-                for argname, argvalue in args.items()
-            }
+        if self.observer is None:
+            return self._format_pattern(pattern, args)
+        start = perf_counter()
+        result = self._format_pattern(pattern, args)
+        duration = perf_counter() - start
+        cache_hit = pattern not in self._unformatted
+        if not cache_hit:
+            self._unformatted.discard(pattern)
+        self.observer(
+            FormatEvent(
+                self._pattern_ids.get(pattern),
+                duration,
+                len(args) if args else 0,
+                result[1],
+                cache_hit,
+            )
+        )
+        return result
+
+    def _format_pattern(
+        self, pattern: Pattern, args: Union[dict[str, Any], None]
+    ) -> tuple[Union[str, "FluentNone"], list[Exception]]:
+        fluent_args: dict[str, Any]
+        if args and self._may_use_args(pattern):
+            fluent_args = FluentArgs(args)
         else:
             fluent_args = {}
 
@@ -110,6 +315,32 @@ class FluentBundle:
             result = "{???}"
         return (result, errors)
 
+    def _may_use_args(self, pattern: Pattern) -> bool:
+        """
+        Whether a compiled pattern might use external arguments, because it
+        has variable references outside of terms, or references messages.
+        The referenced messages aren't looked up, so that checking doesn't
+        compile them before they're formatted.
+        """
+        try:
+            return self._uses_args[pattern]
+        except KeyError:
+            pass
+        result = False
+        stack: list[Any] = [pattern]
+        while stack and not result:
+            node = stack.pop()
+            if isinstance(node, (list, tuple)):
+                stack.extend(node)
+            elif isinstance(node, (FTL.VariableReference, FTL.MessageReference)):
+                result = True
+            elif isinstance(node, FTL.TermReference):
+                stack.append(node.arguments)
+            elif isinstance(node, FTL.BaseNode):
+                stack.extend(vars(node).values())
+        self._uses_args[pattern] = result
+        return result
+
     def _get_babel_locale(self) -> babel.Locale:
         for lc in self.locales:
             try:
@@ -1,18 +1,26 @@
 import os
-from collections.abc import Generator
+import threading
+import weakref
+from collections.abc import Generator, Iterator
 from typing import TYPE_CHECKING, Any, Callable, Union, cast
 
 from fluent.syntax import FluentParser
+from fluent.syntax import ast as FTL
 from typing import NamedTuple
 
 from .bundle import FluentBundle
+from .instrumentation import LocalizationMetrics
+from .lazy import LazyFluentResource, map_resource
+from .resolver import Message
 
 if TYPE_CHECKING:
-    from fluent.syntax.ast import Resource
-
+    from .instrumentation import Observer
     from .types import FluentType
 
 
+LoadedResource = Union[FTL.Resource, LazyFluentResource]
+
+
 class FormattedMessage(NamedTuple):
     value: Union[str, None]
     attributes: dict[str, str]
@@ -24,6 +32,10 @@ class FluentLocalization:
 
     This handles language fallback, bundle creation and string localization.
     It uses the given resource loader to load and parse Fluent data.
+
+    The observer is set on all bundles, see `FluentBundle`. Pass
+    `LocalizationMetrics` as metrics to count fallbacks, missing messages
+    and errors.
     """
 
     def __init__(
@@ -34,6 +46,8 @@ class FluentLocalization:
         use_isolating: bool = False,
         bundle_class: type[FluentBundle] = FluentBundle,
         functions: Union[dict[str, Callable[[Any], "FluentType"]], None] = None,
+        observer: Union["Observer", None] = None,
+        metrics: Union[LocalizationMetrics, None] = None,
     ):
         self.locales = locales
         self.resource_ids = resource_ids
@@ -41,30 +55,40 @@ class FluentLocalization:
         self.use_isolating = use_isolating
         self.bundle_class = bundle_class
         self.functions = functions
-        self._bundle_cache: list[FluentBundle] = []
-        self._bundle_it = self._iterate_bundles()
+        self.metrics = metrics
+        self._observer = observer
+        # The locales and resources each bundle was created with.
+        self._bundle_resources: dict[
+            FluentBundle, tuple[list[str], list[LoadedResource]]
+        ] = {}
+        # The bundles created so far, and the iterator creating the next ones.
+        # reload replaces both at once.
+        self._bundle_state: tuple[list[FluentBundle], Iterator[FluentBundle]] = (
+            [],
+            self._iterate_bundles(self._iterate_resources(), self._bundle_resources),
+        )
+        self._reload_lock = threading.Lock()
 
     def format_message(
         self, msg_id: str, args: Union[dict[str, Any], None] = None
     ) -> FormattedMessage:
-        bundle, msg = next((
-            (bundle, bundle.get_message(msg_id))
-            for bundle in self._bundles()
-            if bundle.has_message(msg_id)
-        ), (None, None))
+        bundle, msg, depth = self._find_message(msg_id)
         if not bundle or not msg:
+            if self.metrics is not None:
+                self.metrics.record(msg_id, None, depth, [])
             return FormattedMessage(msg_id, {})
-        formatted_attrs = {
-            attr: cast(
-                str,
-                bundle.format_pattern(msg.attributes[attr], args)[0],
-            )
-            for attr in msg.attributes
-        }
+        errors: list[Exception] = []
+        formatted_attrs = {}
+        for attr in msg.attributes:
+            attr_val, attr_errors = bundle.format_pattern(msg.attributes[attr], args)
+            formatted_attrs[attr] = cast(str, attr_val)
+            errors.extend(attr_errors)
         if not msg.value:
             val = None
         else:
-            val, _errors = bundle.format_pattern(msg.value, args)
+            val, val_errors = bundle.format_pattern(msg.value, args)
+            errors.extend(val_errors)
+        self._record(msg_id, bundle, depth, errors)
         return FormattedMessage(
             # Never FluentNone when format_pattern called externally
             cast(str, val),
@@ -74,42 +98,160 @@ class FluentLocalization:
     def format_value(
         self, msg_id: str, args: Union[dict[str, Any], None] = None
     ) -> str:
-        bundle, msg = next((
-            (bundle, bundle.get_message(msg_id))
-            for bundle in self._bundles()
-            if bundle.has_message(msg_id)
-        ), (None, None))
-        if not bundle or not msg or not msg.value:
+        bundle, msg, depth = self._find_message(msg_id)
+        if not bundle or not msg:
+            if self.metrics is not None:
+                self.metrics.record(msg_id, None, depth, [])
             return msg_id
-        val, _errors = bundle.format_pattern(msg.value, args)
+        if not msg.value:
+            self._record(msg_id, bundle, depth, [])
+            return msg_id
+        val, errors = bundle.format_pattern(msg.value, args)
+        self._record(msg_id, bundle, depth, errors)
         return cast(
             str, val
         )  # Never FluentNone when format_pattern called externally
 
+    def _record(
+        self, msg_id: str, bundle: FluentBundle, depth: int, errors: list[Exception]
+    ) -> None:
+        """
+        Record a found message in the metrics, as a fallback if the bundle is
+        for another locale than the first one.
+        """
+        if self.metrics is not None:
+            locale = bundle.locales[0]
+            self.metrics.record(
+                msg_id, locale, depth, errors, fallback=locale != self.locales[0]
+            )
+
+    def _find_message(
+        self, msg_id: str
+    ) -> tuple[Union[FluentBundle, None], Union[Message, None], int]:
+        """
+        The first bundle with the message, the message, and the number of
+        bundles before it. If no bundle has it, return None and None with
+        the number of bundles.
+        """
+        depth = 0
+        for bundle in self._bundles():
+            if bundle.has_message(msg_id):
+                return bundle, bundle.get_message(msg_id), depth
+            depth += 1
+        return None, None, depth
+
+    @property
+    def observer(self) -> Union["Observer", None]:
+        return self._observer
+
+    @observer.setter
+    def observer(self, observer: Union["Observer", None]) -> None:
+        self._observer = observer
+        for bundle in self._bundle_cache:
+            bundle.observer = observer
+
     def _create_bundle(self, locales: list[str]) -> FluentBundle:
-        return self.bundle_class(
+        bundle = self.bundle_class(
             locales, functions=self.functions, use_isolating=self.use_isolating
         )
+        if self._observer is not None:
+            bundle.observer = self._observer
+        return bundle
+
+    @property
+    def _bundle_cache(self) -> list[FluentBundle]:
+        return self._bundle_state[0]
+
+    @property
+    def _bundle_it(self) -> Iterator[FluentBundle]:
+        return self._bundle_state[1]
 
     def _bundles(self) -> Generator[FluentBundle, None, None]:
+        # Keep using the bundles this started with, if reload replaces them.
+        bundle_cache, bundle_it = self._bundle_state
         bundle_pointer = 0
         while True:
-            if bundle_pointer == len(self._bundle_cache):
+            if bundle_pointer == len(bundle_cache):
                 try:
-                    self._bundle_cache.append(next(self._bundle_it))
+                    bundle_cache.append(next(bundle_it))
                 except StopIteration:
                     return
-            yield self._bundle_cache[bundle_pointer]
+            yield bundle_cache[bundle_pointer]
             bundle_pointer += 1
 
-    def _iterate_bundles(self) -> Generator[FluentBundle, None, None]:
+    def _iterate_bundles(
+        self,
+        resources_it: Iterator[tuple[list[str], list[LoadedResource]]],
+        bundle_resources: dict[FluentBundle, tuple[list[str], list[LoadedResource]]],
+    ) -> Generator[FluentBundle, None, None]:
+        """
+        Create the bundles for resources_it, and add their locales and
+        resources to bundle_resources.
+        """
+        for locs, resources in resources_it:
+            bundle = self._create_bundle(locs)
+            for resource in resources:
+                bundle.add_resource(resource)
+            bundle_resources[bundle] = (locs, resources)
+            yield bundle
+
+    def _iterate_resources(
+        self,
+    ) -> Generator[tuple[list[str], list[LoadedResource]], None, None]:
         for first_loc in range(0, len(self.locales)):
             locs = self.locales[first_loc:]
             for resources in self.resource_loader.resources(locs[0], self.resource_ids):
-                bundle = self._create_bundle(locs)
-                for resource in resources:
-                    bundle.add_resource(resource)
-                yield bundle
+                yield locs, resources
+
+    def reload(self) -> None:
+        """
+        Reload the resources which changed since they were loaded, and update
+        the bundles created so far.
+
+        Bundles of which no resources changed are kept. The others are
+        replaced by new bundles, which reuse the compiled messages and terms
+        of the old ones, except those depending on the changed resources.
+        The replaced resources aren't closed, as bundles taken before may
+        still be formatting with them. Memory maps are closed when their
+        resources are garbage collected.
+
+        This is safe to call from another thread while formatting.
+        """
+        with self._reload_lock:
+            self.resource_loader.refresh()
+            old_bundles = self._bundle_cache[:]
+            resources_it = self._iterate_resources()
+            bundles: list[FluentBundle] = []
+            bundle_resources: dict[
+                FluentBundle, tuple[list[str], list[LoadedResource]]
+            ] = {}
+            for old_bundle in old_bundles:
+                try:
+                    locs, resources = next(resources_it)
+                except StopIteration:
+                    break
+                old_locs, old_resources = self._bundle_resources[old_bundle]
+                if (
+                    locs == old_locs
+                    and len(resources) == len(old_resources)
+                    and all(new is old for new, old in zip(resources, old_resources))
+                ):
+                    bundle = old_bundle
+                else:
+                    bundle = self._create_bundle(locs)
+                    for resource in resources:
+                        bundle.add_resource(resource)
+                    if locs == old_locs:
+                        changed = get_changed_ids(old_resources, resources)
+                        bundle._adopt_compiled(old_bundle, changed)
+                bundles.append(bundle)
+                bundle_resources[bundle] = (locs, resources)
+
+            self._bundle_resources = bundle_resources
+            self._bundle_state = (
+                bundles,
+                self._iterate_bundles(resources_it, bundle_resources),
+            )
 
 
 class AbstractResourceLoader:
@@ -119,9 +261,9 @@ class AbstractResourceLoader:
 
     def resources(
         self, locale: str, resource_ids: list[str]
-    ) -> Generator[list["Resource"], None, None]:
+    ) -> Generator[list[LoadedResource], None, None]:
         """
-        Yield lists of FluentResource objects, corresponding to
+        Yield lists of FluentResource or LazyFluentResource objects, corresponding to
         each of the resource_ids.
         If there are multiple locations, this may yield multiple lists.
         If a resource isn't found in any location, yield a partial list,
@@ -129,6 +271,14 @@ class AbstractResourceLoader:
         """
         raise NotImplementedError
 
+    def refresh(self) -> None:
+        """
+        Forget the resources which changed since they were loaded, so that
+        `resources` loads them again. Resources which didn't change should
+        be yielded as the same objects.
+        Called by `FluentLocalization.reload`.
+        """
+
 
 class FluentResourceLoader(AbstractResourceLoader):
     """
@@ -139,6 +289,15 @@ class FluentResourceLoader(AbstractResourceLoader):
     the resource_ids.
     This loader does not support loading resources for one bundle from
     different roots.
+
+    Each directory is listed once, the first time a resource is looked up
+    in it. Files missing from a listing are checked on disk once, to find
+    names in a different case on case-insensitive file systems. Call
+    `refresh` to find files which were added or removed since.
+
+    Files are loaded again when their modification time or size changed.
+    Otherwise the resource loaded before is returned, for as long as it's
+    used elsewhere, like by the bundles of a `FluentLocalization`.
     """
 
     def __init__(self, roots: Union[str, list[str]]):
@@ -147,21 +306,180 @@ class FluentResourceLoader(AbstractResourceLoader):
         location on disk, or a list of strings.
         """
         self.roots = [roots] if isinstance(roots, str) else roots
+        self._directories: dict[str, frozenset[str]] = {}
+        # Whether files missing from the listings were found on disk.
+        self._probed: dict[str, bool] = {}
+        # The loaded resources which are still used, and the modification time
+        # and size of the files when they were loaded.
+        self._resources: "weakref.WeakValueDictionary[str, LoadedResource]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._stamps: dict[str, tuple[int, int]] = {}
 
     def resources(
         self, locale: str, resource_ids: list[str]
-    ) -> Generator[list["Resource"], None, None]:
+    ) -> Generator[list[LoadedResource], None, None]:
         for root in self.roots:
             resources: list[Any] = []
             for resource_id in resource_ids:
                 path = self.localize_path(os.path.join(root, resource_id), locale)
-                if not os.path.isfile(path):
+                if not self.is_file(path):
+                    continue
+                try:
+                    resources.append(self.get_resource(path))
+                except FileNotFoundError:
+                    # Removed since the directory was listed.
                     continue
-                with open(path, "r", encoding="utf-8", newline="\n") as file:
-                    content = file.read()
-                resources.append(FluentParser().parse(content))
             if resources:
                 yield resources
 
     def localize_path(self, path: str, locale: str) -> str:
         return path.format(locale=locale)
+
+    def is_file(self, path: str) -> bool:
+        """
+        Check if there's a file at path in the listing of its directory, or
+        on disk if it's not listed. Both are cached until `refresh` is
+        called, so files added or removed since may be missed or found.
+        """
+        directory, name = os.path.split(path)
+        try:
+            files = self._directories[directory]
+        except KeyError:
+            files = self._directories[directory] = list_files(directory)
+        if name in files:
+            return True
+        try:
+            return self._probed[path]
+        except KeyError:
+            found = self._probed[path] = os.path.isfile(path)
+            return found
+
+    def refresh(self) -> None:
+        """
+        Forget the directory listings, to list them again when needed, and
+        the resources of files which were modified or removed.
+        """
+        self._directories.clear()
+        self._probed.clear()
+        for path, stamp in list(self._stamps.items()):
+            if path not in self._resources or get_stamp(path) != stamp:
+                self._resources.pop(path, None)
+                del self._stamps[path]
+
+    def get_resource(self, path: str) -> LoadedResource:
+        """
+        Return the resource in the file at path, loading it if it wasn't
+        loaded yet or changed since.
+        """
+        stamp = get_stamp(path)
+        resource = self._resources.get(path)
+        if (
+            resource is not None
+            and stamp is not None
+            and stamp == self._stamps.get(path)
+        ):
+            return resource
+        resource = self.load_resource(path)
+        if stamp is not None:
+            self._resources[path] = resource
+            self._stamps[path] = stamp
+        return resource
+
+    def load_resource(self, path: str) -> LoadedResource:
+        """
+        Load the resource in the file at path. Override this to customize
+        how resources are read and parsed.
+        """
+        with open(path, "r", encoding="utf-8", newline="\n") as file:
+            content = file.read()
+        return FluentParser().parse(content)
+
+
+def get_stamp(path: str) -> Union[tuple[int, int], None]:
+    """
+    The modification time and size of a file, or None if it doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_definitions(resources: list[LoadedResource]) -> dict[str, list[Any]]:
+    """
+    The definitions of the messages and terms in resources by id, with a
+    leading "-" for terms. Definitions are AST nodes, or the source text for
+    lazy resources.
+    """
+    definitions: dict[str, list[Any]] = {}
+    for resource in resources:
+        if isinstance(resource, LazyFluentResource):
+            for prefix, index in (("", resource.messages), ("-", resource.terms)):
+                for entry_id, offsets in index.items():
+                    definitions.setdefault(prefix + entry_id, []).extend(
+                        resource.source[start:end] for start, end in offsets
+                    )
+        else:
+            for entry in resource.body:
+                if isinstance(entry, (FTL.Message, FTL.Term)):
+                    prefix = "-" if isinstance(entry, FTL.Term) else ""
+                    definitions.setdefault(prefix + entry.id.name, []).append(entry)
+    return definitions
+
+
+def same_definition(definition: Any, other: Any) -> bool:
+    if isinstance(definition, FTL.BaseNode) and isinstance(other, FTL.BaseNode):
+        return definition.equals(other, ignored_fields=["span", "comment"])
+    return type(definition) is type(other) and cast(bool, definition == other)
+
+
+def get_changed_ids(
+    old_resources: list[LoadedResource], resources: list[LoadedResource]
+) -> set[str]:
+    """
+    The ids of the messages and terms which are defined differently in the
+    resources which aren't in both lists.
+    """
+    old_definitions = get_definitions(
+        [old for old in old_resources if not any(old is new for new in resources)]
+    )
+    definitions = get_definitions(
+        [new for new in resources if not any(new is old for old in old_resources)]
+    )
+    return {
+        entry_id
+        for entry_id in old_definitions.keys() | definitions.keys()
+        if len(old_definitions.get(entry_id, ())) != len(definitions.get(entry_id, ()))
+        or not all(
+            same_definition(old, new)
+            for old, new in zip(old_definitions[entry_id], definitions[entry_id])
+        )
+    }
+
+
+def list_files(directory: str) -> frozenset[str]:
+    """
+    The names of the files in a directory, or none if it can't be listed.
+    """
+    try:
+        with os.scandir(directory or os.curdir) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset()
+
+
+class MappedFluentResourceLoader(FluentResourceLoader):
+    """
+    Resource loader which memory-maps Fluent files from disk.
+
+    The files are loaded as `LazyFluentResource` objects, which are scanned
+    for the boundaries of their entries on the mapped bytes, and only decode
+    and parse the entries which are used. Replace the files with new ones
+    to change them, instead of rewriting them, which changes the mapped
+    bytes under the resources.
+    """
+
+    def load_resource(self, path: str) -> LoadedResource:
+        return map_resource(path)
@@ -0,0 +1,249 @@
+"""
+Measure the memory used by Fluent resources, bundles and localizations.
+
+Run `python -m fluent.runtime.footprint DIRECTORY` to report the footprint
+of the Fluent files in a directory, by locale for the subdirectories.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Union
+
+from fluent.syntax import FluentParser
+from fluent.syntax import ast as FTL
+
+from .bundle import FluentBundle
+from .lazy import LazyFluentResource
+
+if TYPE_CHECKING:
+    from .fallback import FluentLocalization
+
+CONTAINERS = (list, tuple, dict, set, frozenset)
+
+
+class Footprint:
+    """
+    The deep size in bytes of Fluent data, as measured by `sys.getsizeof`.
+
+    `types` has the bytes of the nodes of each type, including their
+    attributes which aren't nodes, like lists and strings. The types are
+    prefixed with `ast.` for the syntax tree, and `resolver.` for compiled
+    messages and terms. `spans`, `comments` and `compiled` are the bytes of
+    those parts, and `entries` the bytes of each message and term, with a
+    leading "-" for terms.
+
+    Objects are counted once, even if they're added several times.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.types: Counter[str] = Counter()
+        self.spans = 0
+        self.comments = 0
+        self.compiled = 0
+        self.entries: Counter[str] = Counter()
+        self._seen: set[int] = set()
+
+    def add(
+        self, obj: Any, entry_id: Union[str, None] = None, compiled: bool = False
+    ) -> int:
+        """
+        Add the objects reachable from obj which weren't added yet, and
+        return their size.
+        """
+        added = 0
+        stack: list[tuple[Any, str, bool, bool]] = [(obj, type_name(obj), False, False)]
+        while stack:
+            obj, owner, in_span, in_comment = stack.pop()
+            if id(obj) in self._seen:
+                continue
+            self._seen.add(id(obj))
+            size = sys.getsizeof(obj)
+            if isinstance(obj, FTL.BaseNode) or has_fields(obj):
+                owner = type_name(obj)
+                in_span = in_span or isinstance(obj, FTL.Span)
+                in_comment = in_comment or isinstance(obj, FTL.BaseComment)
+                fields = vars(obj)
+                self._seen.add(id(fields))
+                size += sys.getsizeof(fields)
+                stack.extend(
+                    (value, owner, in_span, in_comment) for value in fields.values()
+                )
+            elif isinstance(obj, dict):
+                stack.extend((key, owner, in_span, in_comment) for key in obj)
+                stack.extend(
+                    (value, owner, in_span, in_comment) for value in obj.values()
+                )
+            elif isinstance(obj, CONTAINERS):
+                stack.extend((item, owner, in_span, in_comment) for item in obj)
+            self.types[owner] += size
+            if in_span:
+                self.spans += size
+            if in_comment:
+                self.comments += size
+            added += size
+        self.total += added
+        if compiled:
+            self.compiled += added
+        if entry_id is not None:
+            self.entries[entry_id] += added
+        return added
+
+    def largest(self, n: int = 10) -> list[tuple[str, int]]:
+        """
+        The n largest messages and terms, with their size.
+        """
+        return self.entries.most_common(n)
+
+    def report(self, n: int = 10) -> str:
+        lines = [
+            f"{self.total:>12,}  total",
+            f"{self.compiled:>12,}  compiled",
+            f"{self.spans:>12,}  spans",
+            f"{self.comments:>12,}  comments",
+            "",
+            "By type:",
+        ]
+        lines.extend(f"{size:>12,}  {name}" for name, size in self.types.most_common())
+        lines.extend(["", "Largest entries:"])
+        lines.extend(f"{size:>12,}  {name}" for name, size in self.largest(n))
+        return "\n".join(lines)
+
+
+def type_name(obj: Any) -> str:
+    cls = type(obj)
+    if isinstance(obj, FTL.BaseNode):
+        return f"{cls.__module__.rsplit('.', 1)[-1]}.{cls.__name__}"
+    return cls.__name__
+
+
+def has_fields(obj: Any) -> bool:
+    """
+    Whether to measure the attributes of obj, for objects of the Fluent
+    packages, like `LazyFluentResource` and `FluentNumber` values.
+    """
+    return hasattr(obj, "__dict__") and type(obj).__module__.startswith("fluent.")
+
+
+def resource_footprint(
+    resource: Union[FTL.Resource, LazyFluentResource],
+    footprint: Union[Footprint, None] = None,
+) -> Footprint:
+    """
+    The footprint of a resource, added to footprint if given.
+    """
+    if footprint is None:
+        footprint = Footprint()
+    if isinstance(resource, FTL.Resource):
+        for entry in resource.body:
+            if isinstance(entry, FTL.Message):
+                footprint.add(entry, entry.id.name)
+            elif isinstance(entry, FTL.Term):
+                footprint.add(entry, f"-{entry.id.name}")
+    footprint.add(resource)
+    return footprint
+
+
+def bundle_footprint(
+    bundle: FluentBundle, footprint: Union[Footprint, None] = None
+) -> Footprint:
+    """
+    The footprint of the messages and terms of a bundle, of their compiled
+    versions, and of the lazy resources which weren't parsed yet. Added to
+    footprint if given.
+    """
+    if footprint is None:
+        footprint = Footprint()
+    for prefix, entries in (("", bundle._messages), ("-", bundle._terms)):
+        for entry_id, entry in entries.items():
+            footprint.add(entry, prefix + entry_id)
+    for compiled_id, compiled in bundle._compiled.items():
+        footprint.add(compiled, compiled_id, compiled=True)
+    for lazy in (bundle._lazy_messages, bundle._lazy_terms):
+        for resources in lazy.values():
+            for resource in resources:
+                footprint.add(resource)
+    return footprint
+
+
+def localization_footprint(l10n: "FluentLocalization") -> dict[str, Footprint]:
+    """
+    The footprints of the bundles of a localization, by their first locale.
+    This loads all bundles.
+    """
+    footprints: dict[str, Footprint] = {}
+    for bundle in l10n._bundles():
+        locale = bundle.locales[0]
+        footprints[locale] = bundle_footprint(bundle, footprints.get(locale))
+    return footprints
+
+
+def find_catalogs(directory: str) -> dict[str, list[str]]:
+    """
+    The Fluent files in directory by locale. The locales are the names of
+    the subdirectories, or "" for the files in directory itself.
+    """
+    catalogs: dict[str, list[str]] = {}
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        relpath = os.path.relpath(dirpath, directory)
+        locale = "" if relpath == os.curdir else relpath.split(os.sep)[0]
+        for filename in sorted(filenames):
+            if filename.endswith(".ftl"):
+                catalogs.setdefault(locale, []).append(os.path.join(dirpath, filename))
+    return catalogs
+
+
+def load_bundle(
+    locale: str, paths: Iterable[str], with_spans: bool = True, compile: bool = False
+) -> FluentBundle:
+    parser = FluentParser(with_spans=with_spans)
+    bundle = FluentBundle([locale or "en"])
+    for path in paths:
+        with open(path, "r", encoding="utf-8", newline="\n") as file:
+            bundle.add_resource(parser.parse(file.read()))
+    if compile:
+        for message_id in list(bundle._messages):
+            bundle.get_message(message_id)
+        for term_id in list(bundle._terms):
+            bundle._lookup(term_id, term=True)
+    return bundle
+
+
+def main(argv: Union[list[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m fluent.runtime.footprint",
+        description="Report the memory used by the Fluent files in a directory.",
+    )
+    parser.add_argument("directory")
+    parser.add_argument(
+        "--compile", action="store_true", help="compile all messages and terms"
+    )
+    parser.add_argument(
+        "--no-spans",
+        action="store_false",
+        dest="with_spans",
+        help="parse without spans",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="number of largest entries to list"
+    )
+    args = parser.parse_args(argv)
+
+    catalogs = find_catalogs(args.directory)
+    if not catalogs:
+        print(f"No Fluent files in {args.directory}", file=sys.stderr)
+        return 1
+    for locale, paths in catalogs.items():
+        bundle = load_bundle(locale, paths, args.with_spans, args.compile)
+        print(f"{locale or args.directory}: {len(paths)} files")
+        print(bundle_footprint(bundle).report(args.top))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
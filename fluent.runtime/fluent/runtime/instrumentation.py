@@ -0,0 +1,215 @@
+import threading
+from collections import Counter, deque
+from typing import Any, Callable, NamedTuple, Union
+
+import attr
+
+
+class FormatEvent(NamedTuple):
+    """
+    A call of `FluentBundle.format_pattern`, as passed to observers.
+
+    The message_id is the id of the message the pattern belongs to, with
+    `.attr` for attributes and a leading "-" for terms, or None for patterns
+    which weren't compiled by the bundle. The duration is in seconds.
+    cache_hit is False for the first format of a pattern after it was
+    compiled.
+    """
+
+    message_id: Union[str, None]
+    duration: float
+    arg_count: int
+    errors: list[Exception]
+    cache_hit: bool
+
+
+Observer = Callable[[FormatEvent], None]
+
+
+@attr.s(slots=True)
+class MessageStats:
+    count: int = attr.ib(default=0)
+    total: float = attr.ib(default=0.0)
+    max: float = attr.ib(default=0.0)
+    errors: int = attr.ib(default=0)
+    misses: int = attr.ib(default=0)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class MessageProfiler:
+    """
+    Observer aggregating the format events of bundles by message id.
+
+    Pass an instance as the observer of a `FluentBundle` or
+    `FluentLocalization`, and call `report` to get the hottest and slowest
+    messages. It can observe bundles used from several threads.
+    """
+
+    def __init__(self) -> None:
+        self.stats: dict[Union[str, None], MessageStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: FormatEvent) -> None:
+        with self._lock:
+            try:
+                stats = self.stats[event.message_id]
+            except KeyError:
+                stats = self.stats[event.message_id] = MessageStats()
+            stats.count += 1
+            stats.total += event.duration
+            if event.duration > stats.max:
+                stats.max = event.duration
+            if event.errors:
+                stats.errors += 1
+            if not event.cache_hit:
+                stats.misses += 1
+
+    def _sorted(
+        self, key: Callable[[MessageStats], float], n: int
+    ) -> list[tuple[Union[str, None], MessageStats]]:
+        """
+        Copies of the stats of the n first messages, sorted by key.
+        """
+        with self._lock:
+            items = sorted(
+                self.stats.items(), key=lambda item: key(item[1]), reverse=True
+            )
+            return [(message_id, attr.evolve(stats)) for message_id, stats in items[:n]]
+
+    def hottest(self, n: int = 10) -> list[tuple[Union[str, None], MessageStats]]:
+        """
+        The n messages which were formatted most often, and their stats.
+        """
+        return self._sorted(lambda stats: stats.count, n)
+
+    def slowest(self, n: int = 10) -> list[tuple[Union[str, None], MessageStats]]:
+        """
+        The n messages which took the longest to format on average, and
+        their stats.
+        """
+        return self._sorted(lambda stats: stats.mean, n)
+
+    def report(self, n: int = 10) -> str:
+        """
+        A table of the n hottest and the n slowest messages.
+        """
+        lines = []
+        for title, items in (
+            ("Hottest messages", self.hottest(n)),
+            ("Slowest messages", self.slowest(n)),
+        ):
+            lines.append(title)
+            lines.append(
+                f"{'count':>8} {'total ms':>10} {'mean us':>10} {'max us':>10} "
+                f"{'errors':>7} {'misses':>7}  message"
+            )
+            for message_id, stats in items:
+                lines.append(
+                    f"{stats.count:>8} {stats.total * 1e3:>10.3f} "
+                    f"{stats.mean * 1e6:>10.1f} {stats.max * 1e6:>10.1f} "
+                    f"{stats.errors:>7} {stats.misses:>7}  {message_id}"
+                )
+            lines.append("")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+
+class LocalizationEvent(NamedTuple):
+    """
+    A message formatted by `FluentLocalization`, as sampled by
+    `LocalizationMetrics`.
+
+    The locale is the first locale of the bundle which had the message, or
+    None if none had it. The depth is the number of bundles before it, or
+    all bundles if the message is missing.
+    """
+
+    message_id: str
+    locale: Union[str, None]
+    depth: int
+    errors: list[Exception]
+
+
+class LocalizationMetrics:
+    """
+    Counters of the messages formatted by a `FluentLocalization`, by locale.
+
+    `formatted` counts the messages found in each locale, `fallbacks` those
+    found in a bundle for another locale than the first one requested, and
+    `errors` those with format errors. `depths` counts the messages by the
+    number of bundles searched before finding them, which can be more than
+    one per locale with several roots, and `missing` the messages not found
+    by id.
+
+    With sample_every set to n, every nth message is also kept as a
+    `LocalizationEvent` in `samples`, up to max_samples recent ones.
+    """
+
+    def __init__(self, sample_every: int = 0, max_samples: int = 1000):
+        self.sample_every = sample_every
+        self.formatted: Counter[str] = Counter()
+        self.fallbacks: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.depths: Counter[int] = Counter()
+        self.missing: Counter[str] = Counter()
+        self.samples: deque[LocalizationEvent] = deque(maxlen=max_samples)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        message_id: str,
+        locale: Union[str, None],
+        depth: int,
+        errors: list[Exception],
+        fallback: bool = False,
+    ) -> None:
+        with self._lock:
+            self._count += 1
+            if locale is None:
+                self.missing[message_id] += 1
+            else:
+                self.formatted[locale] += 1
+                self.depths[depth] += 1
+                if fallback:
+                    self.fallbacks[locale] += 1
+                if errors:
+                    self.errors[locale] += 1
+            if self.sample_every and self._count % self.sample_every == 0:
+                self.samples.append(
+                    LocalizationEvent(message_id, locale, depth, errors)
+                )
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        A copy of the counters and samples as plain dicts and lists.
+        """
+        with self._lock:
+            return {
+                "count": self._count,
+                "formatted": dict(self.formatted),
+                "fallbacks": dict(self.fallbacks),
+                "errors": dict(self.errors),
+                "depths": dict(self.depths),
+                "missing": dict(self.missing),
+                "samples": list(self.samples),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._count = 0
+            for counter in (
+                self.formatted,
+                self.fallbacks,
+                self.errors,
+                self.depths,
+                self.missing,
+            ):
+                counter.clear()
+            self.samples.clear()
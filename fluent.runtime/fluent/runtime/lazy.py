@@ -0,0 +1,181 @@
+import mmap
+import re
+import sys
+from collections.abc import Iterator
+from typing import Any, Union, cast
+
+from fluent.syntax import FluentParser
+from fluent.syntax import ast as FTL
+from fluent.syntax.stream import FluentParserStream
+
+# Lines which start an entry, like in FluentParserStream.skip_to_next_entry_start.
+# Message and term definitions also capture the term sigil and the identifier.
+ENTRY_START = re.compile(
+    r"^(?:(-?)([a-zA-Z][a-zA-Z0-9_-]*) *=|[a-zA-Z#-]|//|\[\[)", re.MULTILINE
+)
+
+# The same for UTF-8 encoded sources. Entries start on ASCII characters, so the
+# offsets found are always on character boundaries.
+ENTRY_START_BYTES = re.compile(ENTRY_START.pattern.encode("ascii"), re.MULTILINE)
+
+EntryIndex = dict[str, list[tuple[int, int]]]
+
+Source = Union[str, bytes, mmap.mmap]
+
+
+def scan_entries(source: Source) -> tuple[EntryIndex, EntryIndex]:
+    """
+    Find the messages and terms in a Fluent source, without parsing it.
+
+    Return the indexes for messages and terms, mapping each id to the
+    `(start, end)` offsets of its definitions. An entry ends where the next
+    line which looks like the start of an entry begins, the same way the
+    parser recovers from syntax errors.
+
+    For UTF-8 encoded sources, as bytes or memory maps, the offsets are
+    byte offsets.
+    """
+    messages: EntryIndex = {}
+    terms: EntryIndex = {}
+    current: Union[tuple[EntryIndex, str, int], None] = None
+    matches: Iterator[re.Match[Any]]
+    if isinstance(source, str):
+        matches = ENTRY_START.finditer(source)
+    else:
+        matches = ENTRY_START_BYTES.finditer(source)
+    for match in matches:
+        if current is not None:
+            index, entry_id, start = current
+            index.setdefault(entry_id, []).append((start, match.start()))
+        name = match.group(2)
+        if name is None:
+            current = None
+        else:
+            entry_id = name if isinstance(name, str) else name.decode("ascii")
+            current = (terms if match.group(1) else messages, entry_id, match.start())
+    if current is not None:
+        index, entry_id, start = current
+        index.setdefault(entry_id, []).append((start, len(source)))
+    return messages, terms
+
+
+class LazyFluentResource:
+    """
+    A Fluent resource which only parses its messages and terms on demand.
+
+    Creating one only scans the source for the offsets of entries. Add it
+    to a `FluentBundle` like any other resource, and the bundle will parse
+    the messages and terms it needs the first time they're used.
+
+    The source may also be UTF-8 encoded bytes or a memory map, see
+    `map_resource`, of which only the parsed entries are decoded. Call
+    `close`, or use the resource as a context manager, to close the memory
+    map when it's no longer needed. Closed resources have no entries left.
+    """
+
+    def __init__(self, source: Source):
+        self.source = source
+        self.messages, self.terms = scan_entries(source)
+        self._parser = FluentParser(with_spans=False)
+
+    def close(self) -> None:
+        """
+        Close the memory map of the source, if any. Entries which weren't
+        parsed yet can't be parsed afterwards.
+        """
+        source = self.source
+        if isinstance(source, mmap.mmap):
+            # Drop the entries before closing, so that they're not parsed
+            # from the closed map.
+            self.source = b""
+            self.messages, self.terms = {}, {}
+            source.close()
+
+    def __enter__(self) -> "LazyFluentResource":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def get_entry(
+        self, entry_id: str, term: bool = False
+    ) -> Union[FTL.Message, FTL.Term, None]:
+        """
+        Parse the message or term with the given id, or return None if it
+        doesn't exist or has syntax errors.
+        """
+        index = self.terms if term else self.messages
+        entry_type = FTL.Term if term else FTL.Message
+        for start, end in index.get(entry_id, ()):
+            entry = self._parse_entry(start, end)
+            if isinstance(entry, entry_type) and entry.id.name == entry_id:
+                return entry
+        return None
+
+    def _decode(self, start: int, end: Union[int, None] = None) -> str:
+        text = self.source[start:end]
+        return text if isinstance(text, str) else text.decode("utf-8")
+
+    def _parse_entry(self, start: int, end: int) -> Union[FTL.Entry, FTL.Junk]:
+        entry: Union[FTL.Entry, FTL.Junk] = self._parser.parse_entry(
+            self._decode(start, end)
+        )
+        if isinstance(entry, FTL.Junk):
+            # Placeables may continue on lines which look like the start of
+            # an entry. Parse from start in the rest of the source to be sure.
+            if isinstance(self.source, str):
+                ps = FluentParserStream(self.source)
+                ps.index = start
+                entry = self._parser.get_entry_or_junk(ps)
+            else:
+                entry = self._parse_encoded(start, end)
+        return entry
+
+    def _parse_encoded(self, start: int, end: int) -> Union[FTL.Entry, FTL.Junk]:
+        """
+        Parse the entry at start in the rest of an encoded source, decoding
+        only as much of it as needed.
+
+        The source is decoded in growing windows, which end after the first
+        line of an entry start. If the parser stopped before that line, the
+        rest of the source doesn't change the result.
+        """
+        source = cast(Union[bytes, mmap.mmap], self.source)
+        size = max(end - start, 1)
+        while True:
+            match = ENTRY_START_BYTES.search(source, start + 2 * size)
+            if match is None:
+                ps = FluentParserStream(self._decode(start))
+                return self._parser.get_entry_or_junk(ps)
+            cut = match.start()
+            line_end = source.find(b"\n", cut)
+            head = self._decode(start, cut)
+            text = head + self._decode(cut, None if line_end < 0 else line_end + 1)
+            ps = FluentParserStream(text)
+            entry = self._parser.get_entry_or_junk(ps)
+            if ps.index <= len(head):
+                return entry
+            size *= 2
+
+
+def map_resource(path: str) -> LazyFluentResource:
+    """
+    Create a `LazyFluentResource` from a memory map of a UTF-8 encoded file.
+
+    The file isn't read upfront, and only the entries which are parsed are
+    decoded. Close the resource when it's no longer used, to release the
+    mapping, and its file descriptor before Python 3.13.
+    """
+    kwargs: dict[str, Any] = {}
+    if sys.version_info >= (3, 13) and sys.platform != "win32":
+        # Don't keep a duplicate of the file descriptor.
+        kwargs["trackfd"] = False
+    with open(path, "rb") as file:
+        try:
+            source: Source = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ, **kwargs
+            )
+        except ValueError:
+            # Empty files can't be mapped.
+            source = b""
+    return LazyFluentResource(source)
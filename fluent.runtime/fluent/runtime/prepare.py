@@ -1,9 +1,12 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any, Union, cast
 
 from fluent.syntax import ast as FTL
 
 from . import resolver
 
+if TYPE_CHECKING:
+    from .bundle import FluentBundle
+
 
 class Compiler:
     def __call__(self, item: Any) -> Any:
@@ -40,3 +43,257 @@ class Compiler:
         if len(elements) == 1:
             return elements[0]
         return resolver.TextElement("".join(child(None) for child in elements))
+
+
+def literal_text(literal: Any) -> str:
+    # Literals don't use the environment.
+    return cast(str, literal(None))
+
+
+class Inliner:
+    """
+    Replace references to static messages and terms in compiled entries by
+    their text, with the isolation marks of the bundle.
+
+    Only references to messages and terms of which the value or attribute is
+    text, in the source or after inlining, are inlined, and only if they're
+    short enough to not exceed `MAX_PART_LENGTH`. Term references with arguments are specialized
+    for their arguments, see `specialize`. References to missing entries and
+    cyclic references are kept, so that they report their errors when
+    formatted.
+
+    The ids of the entries being inlined are passed down as `active`, and
+    to the bundle when it compiles referenced entries, so that one inliner
+    can be used from several threads.
+    """
+
+    def __init__(self, bundle: "FluentBundle"):
+        self.bundle = bundle
+
+    def __call__(
+        self, compiled_id: str, entry: Any, active: frozenset[str] = frozenset()
+    ) -> Any:
+        return self.inline(entry, active | {compiled_id})
+
+    def inline(self, node: Any, active: frozenset[str]) -> Any:
+        if isinstance(node, list):
+            return [self.inline(child, active) for child in node]
+        if isinstance(node, dict):
+            return {key: self.inline(value, active) for key, value in node.items()}
+        if not isinstance(node, FTL.BaseNode):
+            return node
+        for name, value in list(vars(node).items()):
+            setattr(node, name, self.inline(value, active))
+        if isinstance(node, resolver.Pattern):
+            return self.inline_pattern(node, active)
+        if isinstance(node, resolver.NeverIsolatingPlaceable):
+            expression = self.fold(node.expression, active)
+            if isinstance(expression, str):
+                return resolver.FoldedText(expression)
+            node.expression = expression
+        if isinstance(node, resolver.SelectExpression):
+            selector = self.fold(node.selector, active)
+            if isinstance(selector, str):
+                selector = resolver.FoldedText(selector)
+            node.selector = selector
+        return node
+
+    def inline_pattern(self, pattern: resolver.Pattern, active: frozenset[str]) -> Any:
+        elements: list[Any] = []
+        inlined = False
+        element: Any
+        for element in pattern.elements:
+            if isinstance(element, resolver.Placeable):
+                expression = self.fold(element.expression, active)
+                if isinstance(expression, str):
+                    if self.bundle.use_isolating:
+                        expression = "\u2068" + expression + "\u2069"
+                    element = resolver.FoldedText(expression)
+                    inlined = True
+                else:
+                    element.expression = expression
+            if (
+                elements
+                and isinstance(element, resolver.Literal)
+                and isinstance(elements[-1], resolver.Literal)
+            ):
+                # Longer elements fail when formatted, and must be kept.
+                text = literal_text(elements[-1]) + literal_text(element)
+                if len(text) <= resolver.MAX_PART_LENGTH:
+                    elements.pop()
+                    element = resolver.FoldedText(text)
+            elements.append(element)
+        if not inlined:
+            return pattern
+        if len(elements) == 1 and isinstance(elements[0], resolver.Literal):
+            return resolver.FoldedText(literal_text(elements[0]))
+        pattern.elements = elements
+        return pattern
+
+    def fold(self, expression: Any, active: frozenset[str]) -> Any:
+        """
+        The text of a reference to a static message or term, or of a term
+        reference with literal arguments. Otherwise the expression, or its
+        specialized term reference.
+        """
+        text = self.get_text(expression, active)
+        if text is not None:
+            return text
+        if isinstance(expression, resolver.TermReference):
+            return self.specialize(expression, active)
+        return expression
+
+    def get_text(self, expression: Any, active: frozenset[str]) -> Union[str, None]:
+        """
+        The text of a reference to a static message or term, or None. Entries
+        which became text when they were inlined are static too.
+        """
+        if not isinstance(
+            expression, (resolver.MessageReference, resolver.TermReference)
+        ):
+            return None
+        if isinstance(expression, resolver.TermReference) and expression.arguments:
+            return None
+        term = isinstance(expression, resolver.TermReference)
+        entry_id = expression.id.name
+        if ("-" + entry_id if term else entry_id) in active:
+            return None
+        try:
+            entry = self.bundle._lookup(entry_id, term=term, active=active)
+        except LookupError:
+            return None
+        target: Any
+        if expression.attribute:
+            target = entry.attributes.get(expression.attribute.name)
+        else:
+            target = entry.value
+        if isinstance(target, resolver.TextElement):
+            text = target.value
+        elif type(target) is resolver.StringLiteral:
+            text = target.parse()["value"]
+        else:
+            return None
+        if len(text) > resolver.MAX_PART_LENGTH:
+            return None
+        return text
+
+    def specialize(
+        self, reference: resolver.TermReference, active: frozenset[str]
+    ) -> Any:
+        """
+        Evaluate the selectors and variables of the referenced term, if all
+        arguments of the reference are literals. Return the text of the term
+        if that's all of it, or a `SpecializedTermReference` with what's left
+        of its pattern.
+
+        References with positional arguments are kept, as they report an
+        error.
+        """
+        arguments = reference.arguments
+        if arguments is None or arguments.positional:
+            return reference
+        if not all(
+            isinstance(kwarg.value, (resolver.StringLiteral, resolver.NumberLiteral))
+            for kwarg in arguments.named
+        ):
+            return reference
+        if "-" + reference.id.name in active:
+            return reference
+        try:
+            term = self.bundle._lookup(reference.id.name, term=True, active=active)
+        except LookupError:
+            return reference
+        if reference.attribute:
+            target = term.attributes.get(reference.attribute.name)
+        else:
+            target = term.value
+        if target is None:
+            return reference
+        env = resolver.ResolverEnvironment(
+            context=self.bundle,
+            errors=[],
+            current=resolver.CurrentEnvironment(error_for_missing_arg=False),
+        )
+        args = {kwarg.name.name: kwarg.value(env) for kwarg in arguments.named}
+        env.current.args = args
+        pattern = self.evaluate(target, env)
+        if env.errors:
+            return reference
+        if isinstance(pattern, resolver.Literal):
+            text = literal_text(pattern)
+            if len(text) > resolver.MAX_PART_LENGTH:
+                return reference
+            return text
+        return resolver.SpecializedTermReference(
+            id=reference.id,
+            attribute=reference.attribute,
+            arguments=arguments,
+            pattern=pattern,
+            args=args,
+            term_pattern=target,
+        )
+
+    def evaluate(self, node: Any, env: resolver.ResolverEnvironment) -> Any:
+        """
+        The parts of a compiled pattern which can be evaluated in env, as a
+        new pattern. The nodes of the pattern aren't modified.
+        """
+        if isinstance(node, resolver.Pattern):
+            elements: list[Any] = []
+            for element in node.elements:
+                element = self.evaluate(element, env)
+                if (
+                    elements
+                    and isinstance(element, resolver.Literal)
+                    and isinstance(elements[-1], resolver.Literal)
+                ):
+                    text = literal_text(elements[-1]) + literal_text(element)
+                    if len(text) <= resolver.MAX_PART_LENGTH:
+                        elements.pop()
+                        element = resolver.FoldedText(text)
+                elements.append(element)
+            if len(elements) == 1 and isinstance(elements[0], resolver.Literal):
+                return elements[0]
+            if all(new is old for new, old in zip(elements, node.elements)):
+                return node
+            return resolver.Pattern(elements=elements)
+        if isinstance(node, (resolver.Placeable, resolver.NeverIsolatingPlaceable)):
+            expression = self.evaluate(node.expression, env)
+            if expression is node.expression:
+                return node
+            if isinstance(node, resolver.NeverIsolatingPlaceable) and isinstance(
+                expression, resolver.Pattern
+            ):
+                # The selected variant, without a placeable around it.
+                return expression
+            if not isinstance(expression, resolver.Literal):
+                return type(node)(expression=expression)
+            text = literal_text(expression)
+            if isinstance(node, resolver.Placeable) and self.bundle.use_isolating:
+                text = "\u2068" + text + "\u2069"
+            return resolver.FoldedText(text)
+        if isinstance(node, (resolver.VariableReference, resolver.NumberLiteral)):
+            try:
+                text = resolver.resolve(node(env), env)
+            except ValueError:
+                # Too long, and fails when formatted.
+                return node
+            return resolver.FoldedText(text)
+        if isinstance(node, resolver.SelectExpression):
+            if not isinstance(
+                node.selector,
+                (resolver.VariableReference, resolver.NumberLiteral, resolver.Literal),
+            ):
+                return node
+            key = node.selector(env)
+            found = None
+            for variant in node.variants:
+                if variant.default and found is None:
+                    found = variant
+                if resolver.match(key, variant.key(env), env):
+                    found = variant
+                    break
+            if found is None:
+                return node
+            return self.evaluate(found.value, env)
+        return node
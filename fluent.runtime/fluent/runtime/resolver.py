@@ -7,7 +7,7 @@ from fluent.syntax import ast as FTL
 
 from .errors import FluentCyclicReferenceError, FluentFormatError, FluentReferenceError
 from .types import FluentFloat, FluentInt, FluentNone, FluentType
-from .utils import reference_to_id, unknown_reference_error_obj
+from .utils import native_to_fluent, reference_to_id, unknown_reference_error_obj
 
 if TYPE_CHECKING:
     from .bundle import FluentBundle
@@ -32,6 +32,21 @@ modifyable state in the resolver environment.
 MAX_PART_LENGTH = 2500
 
 
+class FluentArgs(dict[str, Any]):
+    """
+    The external arguments of a format call, which are converted to Fluent
+    types when they're first used. Only contains the converted arguments.
+    """
+
+    def __init__(self, args: dict[str, Any]):
+        super().__init__()
+        self.native_args = args
+
+    def __missing__(self, name: str) -> Any:
+        value = self[name] = native_to_fluent(self.native_args[name])
+        return value
+
+
 @attr.s
 class CurrentEnvironment:
     # The parts of ResolverEnvironment that we want to mutate (and restore)
@@ -168,7 +183,8 @@ class Pattern(FTL.Pattern, BaseResolver):
 
 
 def resolve(fluentish: Any, env: ResolverEnvironment) -> Any:
-    if isinstance(fluentish, FluentType):
+    # Most values are strings, which can skip the check for Fluent types.
+    if type(fluentish) is not str and isinstance(fluentish, FluentType):
         return fluentish.format(env.context._babel_locale)
     if isinstance(fluentish, str):
         if len(fluentish) > MAX_PART_LENGTH:
@@ -186,6 +202,13 @@ class TextElement(FTL.TextElement, Literal):
         return self.value
 
 
+class FoldedText(TextElement):
+    """
+    Text which replaced references to static messages and terms, when they
+    were inlined after compiling.
+    """
+
+
 class Placeable(FTL.Placeable, BaseResolver):
     expression: Union["InlineExpression", "Placeable", "SelectExpression"]
 
@@ -237,6 +260,8 @@ def resolveEntryReference(
             pattern = entry.attributes[ref.attribute.name]
         else:
             pattern = entry.value  # type: ignore
+        if pattern is not None:
+            env.context._links[ref] = pattern
         return pattern(env)
     except LookupError:
         ref_id = reference_to_id(ref)
@@ -253,7 +278,10 @@ class MessageReference(FTL.MessageReference, BaseResolver):
     attribute: Union["Identifier", None]
 
     def __call__(self, env: ResolverEnvironment) -> Union[str, FluentNone]:
-        return resolveEntryReference(self, env)
+        pattern = env.context._links.get(self)
+        if pattern is None:
+            return resolveEntryReference(self, env)
+        return pattern(env)
 
 
 class TermReference(FTL.TermReference, BaseResolver):
@@ -277,7 +305,53 @@ class TermReference(FTL.TermReference, BaseResolver):
         else:
             kwargs = None
         with env.modified_for_term_reference(args=kwargs):
-            return resolveEntryReference(self, env)
+            pattern = env.context._links.get(self)
+            if pattern is None:
+                return resolveEntryReference(self, env)
+            return pattern(env)
+
+
+class SpecializedTermReference(TermReference):
+    """
+    A term reference with literal arguments, with the parts of the term
+    which only depend on them evaluated when it was compiled.
+
+    The pattern of the term it was made from is active while it's resolved,
+    so that references back to the term are cyclic, like for `TermReference`.
+    """
+
+    pattern: Any
+    args: dict[str, Any]
+    term_pattern: Any
+
+    def __init__(
+        self,
+        id: "Identifier",
+        attribute: Union["Identifier", None] = None,
+        arguments: Union["CallArguments", None] = None,
+        pattern: Any = None,
+        args: Union[dict[str, Any], None] = None,
+        term_pattern: Any = None,
+        **kwargs: Any,
+    ):
+        super().__init__(id, attribute, arguments, **kwargs)
+        self.pattern = pattern
+        self.args = args if args is not None else {}
+        self.term_pattern = term_pattern
+
+    def __call__(self, env: ResolverEnvironment) -> Union[str, FluentNone]:
+        # Patterns make themselves active when they're called.
+        term_pattern = None if self.term_pattern is self.pattern else self.term_pattern
+        if term_pattern is not None and term_pattern in env.active_patterns:
+            env.errors.append(FluentCyclicReferenceError("Cyclic reference"))
+            return FluentNone()
+        with env.modified_for_term_reference(args=self.args):
+            if term_pattern is not None:
+                env.active_patterns.add(term_pattern)
+            try:
+                return cast(Union[str, FluentNone], self.pattern(env))
+            finally:
+                env.active_patterns.discard(term_pattern)
 
 
 class VariableReference(FTL.VariableReference, BaseResolver):
@@ -292,7 +366,7 @@ class VariableReference(FTL.VariableReference, BaseResolver):
                 env.errors.append(FluentReferenceError(f"Unknown external: {name}"))
             return FluentNone(name)
 
-        if isinstance(arg_val, (FluentType, str)):
+        if type(arg_val) is str or isinstance(arg_val, (FluentType, str)):
             return arg_val
         env.errors.append(
             TypeError(f"Unsupported external type: {name}, {type(arg_val)}")
@@ -1,8 +1,8 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Union
+from typing import Any, Callable, Union
 
-from fluent.syntax.ast import MessageReference, TermReference
+from fluent.syntax.ast import BaseNode, MessageReference, TermReference
 
 from .errors import FluentReferenceError
 from .types import FluentDate, FluentDateTime, FluentDecimal, FluentFloat, FluentInt
@@ -11,22 +11,48 @@ TERM_SIGIL = "-"
 ATTRIBUTE_SEPARATOR = "."
 
 
+# The conversions of Python values to Fluent types. Values of subclasses are
+# converted like the first of their base classes in this table.
+CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    int: FluentInt,
+    float: FluentFloat,
+    Decimal: FluentDecimal,
+    datetime: FluentDateTime.from_date_time,
+    date: FluentDate.from_date,
+}
+
+# The conversion of each type of value seen so far, or None if it's passed
+# as is.
+_converters: dict[type, Union[Callable[[Any], Any], None]] = {}
+
+
+def register_converter(cls: type, converter: Callable[[Any], Any]) -> None:
+    """
+    Convert the values of a type, and of its subclasses, with converter when
+    they're passed as arguments. The converter should return a Fluent type,
+    like a `FluentNumber` created with `fluent_number`, or a string.
+    """
+    CONVERTERS[cls] = converter
+    _converters.clear()
+
+
+def get_converter(cls: type) -> Union[Callable[[Any], Any], None]:
+    for base in cls.__mro__:
+        if base in CONVERTERS:
+            return CONVERTERS[base]
+    return None
+
+
 def native_to_fluent(val: Any) -> Any:
     """
     Convert a python type to a Fluent Type.
     """
-    if isinstance(val, int):
-        return FluentInt(val)
-    if isinstance(val, float):
-        return FluentFloat(val)
-    if isinstance(val, Decimal):
-        return FluentDecimal(val)
-
-    if isinstance(val, datetime):
-        return FluentDateTime.from_date_time(val)
-    if isinstance(val, date):
-        return FluentDate.from_date(val)
-    return val
+    cls = type(val)
+    try:
+        converter = _converters[cls]
+    except KeyError:
+        converter = _converters[cls] = get_converter(cls)
+    return val if converter is None else converter(val)
 
 
 def reference_to_id(ref: Union[MessageReference, TermReference]) -> str:
@@ -57,3 +83,23 @@ def unknown_reference_error_obj(ref_id: str) -> FluentReferenceError:
     if ref_id.startswith(TERM_SIGIL):
         return FluentReferenceError(f"Unknown term: {ref_id}")
     return FluentReferenceError(f"Unknown message: {ref_id}")
+
+
+def collect_references(node: Any) -> set[str]:
+    """
+    Returns the ids of the messages and terms referenced in an AST node,
+    with a leading "-" for terms.
+    """
+    references: set[str] = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif isinstance(node, BaseNode):
+            if isinstance(node, TermReference):
+                references.add(TERM_SIGIL + node.id.name)
+            elif isinstance(node, MessageReference):
+                references.add(node.id.name)
+            stack.extend(vars(node).values())
+    return references
@@ -1,6 +1,14 @@
 import unittest
+from datetime import datetime
 
 from fluent.runtime import FluentBundle, FluentResource
+from fluent.runtime.types import FluentDateTime, FluentInt, fluent_number
+from fluent.runtime.utils import (
+    CONVERTERS,
+    _converters,
+    native_to_fluent,
+    register_converter,
+)
 
 from ..utils import dedent_ftl
 
@@ -72,3 +80,51 @@ class TestStrings(unittest.TestCase):
         )
         self.assertEqual(val, "Argument")
         self.assertEqual(len(errs), 0)
+
+
+class Money:
+    def __init__(self, amount, currency):
+        self.amount = amount
+        self.currency = currency
+
+
+class Euros(Money):
+    def __init__(self, amount):
+        super().__init__(amount, "EUR")
+
+
+class TestConverters(unittest.TestCase):
+    def setUp(self):
+        self.bundle = FluentBundle(["en-US"], use_isolating=False)
+        self.bundle.add_resource(FluentResource("foo = Foo { $arg }\n"))
+        self.addCleanup(CONVERTERS.pop, Money, None)
+        self.addCleanup(_converters.clear)
+
+    def format(self, arg):
+        return self.bundle.format_pattern(
+            self.bundle.get_message("foo").value, {"arg": arg}
+        )
+
+    def test_subclasses(self):
+        class Number(int):
+            pass
+
+        self.assertIsInstance(native_to_fluent(Number(3)), FluentInt)
+        self.assertIsInstance(native_to_fluent(True), FluentInt)
+        self.assertIsInstance(native_to_fluent(datetime(2020, 1, 1)), FluentDateTime)
+        self.assertEqual(native_to_fluent("text"), "text")
+
+    def test_register(self):
+        val, errs = self.format(Euros(3))
+        self.assertEqual(val, "Foo arg")
+        self.assertEqual(len(errs), 1)
+
+        register_converter(
+            Money,
+            lambda money: fluent_number(
+                money.amount, style="currency", currency=money.currency
+            ),
+        )
+        val, errs = self.format(Euros(3))
+        self.assertEqual(val, "Foo €3.00")
+        self.assertEqual(errs, [])
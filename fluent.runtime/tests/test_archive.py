@@ -0,0 +1,78 @@
+import os
+import unittest
+import zipfile
+from os.path import join
+
+from fluent.runtime import ArchiveResourceLoader, FluentLocalization
+from fluent.runtime.archive import build_archive, build_archives
+
+from .utils import patch_files
+
+
+class TestArchiveResourceLoader(unittest.TestCase):
+    @patch_files(
+        {
+            "l10n": {
+                "de": {"one.ftl": "one = in German\n"},
+                "en": {
+                    "one.ftl": "one = in English\n",
+                    "sub": {"two.ftl": "two = { one } too\n"},
+                    "notes.txt": "Not Fluent",
+                },
+            },
+            "archives": {},
+        }
+    )
+    def test_localization(self, root):
+        archives = build_archives(
+            join(root, "l10n"), join(root, "archives", "{locale}.zip")
+        )
+        self.assertEqual(list(archives), ["de", "en"])
+        with zipfile.ZipFile(archives["en"]) as archive:
+            self.assertEqual(archive.namelist(), ["one.ftl", "sub/two.ftl"])
+
+        loader = ArchiveResourceLoader(join(root, "archives", "{locale}.zip"))
+        l10n = FluentLocalization(
+            ["de", "fr", "en"], ["one.ftl", "sub/two.ftl"], loader
+        )
+        self.assertEqual(l10n.format_value("one"), "in German")
+        self.assertEqual(l10n.format_value("two"), "in English too")
+        self.assertEqual(l10n.format_value("three"), "three")
+        self.assertIsNone(loader.get_archive(join(root, "archives", "fr.zip")))
+        loader.close()
+
+    @patch_files({"en": {"one.ftl": "one = exists"}})
+    def test_resources(self, root):
+        build_archive(join(root, "en"), join(root, "en.zip"))
+        loader = ArchiveResourceLoader(join(root, "{locale}.zip"))
+        resources_list = list(loader.resources("en", ["one.ftl", "two.ftl"]))
+        self.assertEqual(len(resources_list), 1)
+        self.assertEqual(len(resources_list[0]), 1)
+        self.assertEqual(list(loader.resources("de", ["one.ftl"])), [])
+        loader.close()
+
+    @patch_files({"en": {"one.ftl": "one = One"}})
+    def test_refresh(self, root):
+        build_archive(join(root, "en"), join(root, "en.zip"))
+        loader = ArchiveResourceLoader(join(root, "{locale}.zip"))
+        l10n = FluentLocalization(["de", "en"], ["one.ftl"], loader)
+        self.assertEqual(l10n.format_value("one"), "One")
+        (resources,) = loader.resources("en", ["one.ftl"])
+        loader.refresh()
+        self.assertEqual(list(loader.resources("en", ["one.ftl"])), [resources])
+
+        os.mkdir(join(root, "de"))
+        with open(join(root, "de", "one.ftl"), "w") as file:
+            file.write("one = Eins")
+        build_archive(join(root, "de"), join(root, "de.zip"))
+        l10n.reload()
+        self.assertEqual(l10n.format_value("one"), "Eins")
+        loader.close()
+
+    @patch_files({"en": {"one.ftl": "one = exists"}})
+    def test_reproducible(self, root):
+        build_archive(join(root, "en"), join(root, "first.zip"))
+        build_archive(join(root, "en"), join(root, "second.zip"))
+        with open(join(root, "first.zip"), "rb") as first:
+            with open(join(root, "second.zip"), "rb") as second:
+                self.assertEqual(first.read(), second.read())
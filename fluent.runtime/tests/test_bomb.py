@@ -29,6 +29,15 @@ class TestBillionLaughs(unittest.TestCase):
             elol6 = {elol5}{elol5}{elol5}{elol5}{elol5}{elol5}{elol5}{elol5}{elol5}{elol5}
             emptylolz = {elol6}
 
+            vlol0 = { $empty }
+            vlol1 = {vlol0}{vlol0}{vlol0}{vlol0}{vlol0}{vlol0}{vlol0}{vlol0}{vlol0}{vlol0}
+            vlol2 = {vlol1}{vlol1}{vlol1}{vlol1}{vlol1}{vlol1}{vlol1}{vlol1}{vlol1}{vlol1}
+            vlol3 = {vlol2}{vlol2}{vlol2}{vlol2}{vlol2}{vlol2}{vlol2}{vlol2}{vlol2}{vlol2}
+            vlol4 = {vlol3}{vlol3}{vlol3}{vlol3}{vlol3}{vlol3}{vlol3}{vlol3}{vlol3}{vlol3}
+            vlol5 = {vlol4}{vlol4}{vlol4}{vlol4}{vlol4}{vlol4}{vlol4}{vlol4}{vlol4}{vlol4}
+            vlol6 = {vlol5}{vlol5}{vlol5}{vlol5}{vlol5}{vlol5}{vlol5}{vlol5}{vlol5}{vlol5}
+            varlolz = {vlol6}
+
         """
                 )
             )
@@ -41,9 +50,17 @@ class TestBillionLaughs(unittest.TestCase):
         self.assertIn("Too many characters", str(errs[-1]))
 
     def test_max_expansions_protection(self):
-        # Without protection, emptylolz will take a really long time to
+        # Without protection, varlolz will take a really long time to
         # evaluate, although it generates an empty message.
-        val, errs = self.ctx.format_pattern(self.ctx.get_message("emptylolz").value)
+        val, errs = self.ctx.format_pattern(
+            self.ctx.get_message("varlolz").value, {"empty": ""}
+        )
         self.assertEqual(val, "{???}")
         self.assertEqual(len(errs), 1)
         self.assertIn("Too many parts", str(errs[-1]))
+
+    def test_static_expansions(self):
+        # The static references of emptylolz are inlined once per message.
+        val, errs = self.ctx.format_pattern(self.ctx.get_message("emptylolz").value)
+        self.assertEqual(val, "")
+        self.assertEqual(errs, [])
@@ -1,6 +1,11 @@
+import threading
 import unittest
+from unittest import mock
 
-from fluent.runtime import FluentBundle, FluentResource
+from fluent.runtime import FluentBundle, FluentResource, LazyFluentResource
+from fluent.runtime.errors import FluentCyclicReferenceError
+from fluent.runtime.resolver import FoldedText, Pattern, SpecializedTermReference
+from fluent.runtime.utils import native_to_fluent
 
 from .utils import dedent_ftl
 
@@ -136,3 +141,385 @@ class TestFluentBundle(unittest.TestCase):
         val, errs = self.bundle.format_pattern(self.bundle.get_message("foo").value, {})
         self.assertEqual(val, "Refers to \u2068Foo\u2069")
         self.assertEqual(errs, [])
+
+
+class TestArgumentConversion(unittest.TestCase):
+    def setUp(self):
+        self.bundle = FluentBundle(["en-US"], use_isolating=False)
+        self.bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            static = Static
+            static-term = { -term(three: "four") }
+            one = { $one }
+            nested = { one } and { $two }
+            -term = { $three } { one }
+            term = { -term(three: "four") } { $four }
+            select = { $key ->
+                [a] { $a }
+               *[b] { $b }
+            }
+            cyclic = { cyclic.attr } { $one }
+                .attr = { cyclic } { missing }
+        """
+                )
+            )
+        )
+
+    def test_may_use_args(self):
+        def may_use_args(message_id):
+            message = self.bundle.get_message(message_id)
+            return self.bundle._may_use_args(message.value)
+
+        self.assertFalse(may_use_args("static"))
+        self.assertFalse(may_use_args("static-term"))
+        self.assertTrue(may_use_args("one"))
+        self.assertTrue(may_use_args("nested"))
+        self.assertTrue(may_use_args("term"))
+        self.assertTrue(may_use_args("select"))
+        self.assertTrue(may_use_args("cyclic"))
+
+    def test_references_not_looked_up(self):
+        nested = self.bundle.get_message("nested").value
+        with mock.patch.object(self.bundle, "_lookup") as lookup:
+            self.assertTrue(self.bundle._may_use_args(nested))
+        lookup.assert_not_called()
+
+    def test_converted_on_demand(self):
+        args = {"key": "b", "a": 1, "b": 2, "unused": 3}
+        select = self.bundle.get_message("select").value
+        with mock.patch(
+            "fluent.runtime.resolver.native_to_fluent", wraps=native_to_fluent
+        ) as convert:
+            val, errs = self.bundle.format_pattern(select, args)
+        self.assertEqual((val, errs), ("2", []))
+        self.assertEqual([call.args[0] for call in convert.call_args_list], ["b", 2])
+
+    def test_static(self):
+        static = self.bundle.get_message("static").value
+        with mock.patch("fluent.runtime.bundle.FluentArgs") as fluent_args:
+            val, errs = self.bundle.format_pattern(static, {"one": 1})
+        self.assertEqual((val, errs), ("Static", []))
+        fluent_args.assert_not_called()
+
+    def test_add_resource(self):
+        message = self.bundle.get_message("nested")
+        self.assertTrue(self.bundle._may_use_args(message.value))
+        self.bundle.add_resource(
+            FluentResource("one = { $five }"), allow_overrides=True
+        )
+        self.assertEqual(self.bundle._uses_args, {})
+
+
+class TestReferenceLinks(unittest.TestCase):
+    def setUp(self):
+        self.bundle = FluentBundle(["en-US"], use_isolating=False)
+        self.bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            -brand =
+                { $case ->
+                   *[nominative] Firefox
+                    [genitive] Firefox's
+                }
+            about = About { -brand }
+            title = { about } and { help.title }
+            help =
+                .title = Help { $n }
+        """
+                )
+            )
+        )
+
+    def format(self, message_id):
+        return self.bundle.format_pattern(
+            self.bundle.get_message(message_id).value, {"n": 1}
+        )
+
+    def test_linked(self):
+        self.assertEqual(self.format("title"), ("About Firefox and Help 1", []))
+        self.assertEqual(len(self.bundle._links), 3)
+        with mock.patch(
+            "fluent.runtime.resolver.resolveEntryReference"
+        ) as resolve_entry_reference:
+            self.assertEqual(self.format("title"), ("About Firefox and Help 1", []))
+        resolve_entry_reference.assert_not_called()
+
+    def test_missing_not_linked(self):
+        self.bundle.add_resource(FluentResource("missing = { nope } { help }"))
+        val, errs = self.format("missing")
+        self.assertEqual(len(errs), 2)
+        self.assertEqual(self.bundle._links, {})
+
+    def test_override(self):
+        self.assertEqual(self.format("title"), ("About Firefox and Help 1", []))
+        self.bundle.add_resource(
+            FluentResource("-brand = Nightly\n"), allow_overrides=True
+        )
+        self.assertEqual(self.bundle._links, {})
+        self.assertNotIn("about", self.bundle._compiled)
+        self.assertNotIn("title", self.bundle._compiled)
+        self.assertIn("help", self.bundle._compiled)
+        self.assertEqual(self.format("title"), ("About Nightly and Help 1", []))
+
+    def test_override_lazy(self):
+        self.assertEqual(self.format("about"), ("About Firefox", []))
+        self.bundle.add_resource(
+            LazyFluentResource("-brand = Nightly\n"), allow_overrides=True
+        )
+        self.assertEqual(self.format("about"), ("About Nightly", []))
+
+    def test_no_override(self):
+        self.assertEqual(self.format("about"), ("About Firefox", []))
+        self.bundle.add_resource(FluentResource("-brand = Nightly\n"))
+        self.assertIn("about", self.bundle._compiled)
+        self.assertEqual(self.format("about"), ("About Firefox", []))
+
+
+class TestInlining(unittest.TestCase):
+    def setUp(self):
+        self.bundle = FluentBundle(["en-US"], use_isolating=False)
+        self.bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            -brand = Firefox
+                .gender = feminine
+            dynamic = { $name }
+            app = { -brand } Browser
+            welcome = Welcome to { app }
+            about = About { -brand } and { dynamic }
+            gender =
+                { -brand.gender ->
+                    [feminine] She
+                   *[other] It
+                }
+            args = { -brand("genitive") }
+            missing = { -missing } and { nope }
+            cycle = { cycle } and { other }
+            other = { cycle }
+        """
+                )
+            )
+        )
+
+    def format(self, message_id, args=None):
+        return self.bundle.format_pattern(
+            self.bundle.get_message(message_id).value, args
+        )
+
+    def test_static_term(self):
+        value = self.bundle.get_message("app").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(value.value, "Firefox Browser")
+        self.assertEqual(self.format("app"), ("Firefox Browser", []))
+
+    def test_transitive(self):
+        value = self.bundle.get_message("welcome").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(value.value, "Welcome to Firefox Browser")
+        self.assertEqual(self.format("welcome"), ("Welcome to Firefox Browser", []))
+        self.bundle.add_resource(
+            FluentResource("-brand = Nightly\n"), allow_overrides=True
+        )
+        self.assertEqual(self.format("welcome"), ("Welcome to Nightly Browser", []))
+
+    def test_transitive_isolating(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(
+            FluentResource("-brand = Firefox\napp = { -brand } App\nhi = Hi { app }")
+        )
+        value = bundle.get_message("hi").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(bundle.format_pattern(value), ("Hi ⁨⁨Firefox⁩ App⁩", []))
+
+    def test_dynamic(self):
+        value = self.bundle.get_message("about").value
+        self.assertIsInstance(value, Pattern)
+        self.assertEqual(len(value.elements), 2)
+        self.assertIsInstance(value.elements[0], FoldedText)
+        self.assertEqual(
+            self.format("about", {"name": "Foo"}), ("About Firefox and Foo", [])
+        )
+
+    def test_isolating(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(FluentResource("-brand = Firefox\napp = { -brand } App"))
+        value = bundle.get_message("app").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(bundle.format_pattern(value), ("⁨Firefox⁩ App", []))
+
+    def test_never_isolating(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(FluentResource("-brand = Firefox\napp = { -brand }"))
+        value = bundle.get_message("app").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(bundle.format_pattern(value), ("Firefox", []))
+
+    def test_selector(self):
+        self.assertEqual(self.format("gender"), ("She", []))
+
+    def test_positional_arguments(self):
+        value = self.bundle.get_message("args").value
+        self.assertNotIsInstance(value, FoldedText)
+        val, errs = self.format("args")
+        self.assertEqual(val, "Firefox")
+        self.assertEqual(len(errs), 1)
+
+    def test_missing(self):
+        val, errs = self.format("missing")
+        self.assertEqual(val, "{-missing} and {nope}")
+        self.assertEqual(len(errs), 2)
+
+    def test_cycle(self):
+        val, errs = self.format("cycle")
+        self.assertEqual(val, "??? and ???")
+        self.assertEqual(len(errs), 2)
+
+    def test_threads(self):
+        # Compile hello in another thread while welcome is being inlined,
+        # which must not see welcome as part of a cycle.
+        self.bundle.add_resource(FluentResource("hello = { welcome }\n"))
+        lookup = self.bundle._lookup
+        hello = []
+
+        def lookup_app(entry_id, *args, **kwargs):
+            if entry_id == "app" and not hello:
+                hello.append(None)
+                thread = threading.Thread(
+                    target=lambda: hello.append(self.bundle.get_message("hello"))
+                )
+                thread.start()
+                thread.join()
+            return lookup(entry_id, *args, **kwargs)
+
+        with mock.patch.object(self.bundle, "_lookup", side_effect=lookup_app):
+            self.bundle.get_message("welcome")
+        self.assertIsInstance(hello[1].value, FoldedText)
+        self.assertEqual(hello[1].value.value, "Welcome to Firefox Browser")
+
+    def test_override(self):
+        self.assertEqual(self.format("app"), ("Firefox Browser", []))
+        self.bundle.add_resource(
+            FluentResource("-brand = Nightly\n"), allow_overrides=True
+        )
+        self.assertEqual(self.format("app"), ("Nightly Browser", []))
+
+
+class TestTermSpecialization(unittest.TestCase):
+    def setUp(self):
+        self.bundle = FluentBundle(["en-US"], use_isolating=False)
+        self.bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            -brand =
+                { $case ->
+                   *[nominative] Firefox
+                    [genitive] Firefox's
+                }
+            -items =
+                { $count ->
+                    [one] one item
+                   *[other] { $count } items
+                }
+            -total =
+                { $case ->
+                   *[short] { NUMBER($amount, minimumFractionDigits: 2) }
+                    [long] Total: { NUMBER($amount, minimumFractionDigits: 2) }
+                }
+            genitive = Settings of { -brand(case: "genitive") }
+            default = { -brand(case: "dative") }
+            plural = { -items(count: 1) } and { -items(count: 3) }
+            function = { -total(case: "long", amount: 3) }
+        """
+                )
+            )
+        )
+
+    def format(self, message_id):
+        return self.bundle.format_pattern(self.bundle.get_message(message_id).value)
+
+    def test_variant(self):
+        value = self.bundle.get_message("genitive").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(value.value, "Settings of Firefox's")
+
+    def test_default(self):
+        self.assertEqual(self.format("default"), ("Firefox", []))
+
+    def test_plural(self):
+        value = self.bundle.get_message("plural").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(value.value, "one item and 3 items")
+
+    def test_isolating(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            -items =
+                { $count ->
+                    [one] one item
+                   *[other] { $count } items
+                }
+            plural = Has { -items(count: 3) }
+        """
+                )
+            )
+        )
+        value = bundle.get_message("plural").value
+        self.assertIsInstance(value, FoldedText)
+        self.assertEqual(
+            bundle.format_pattern(value), ("Has \u2068\u20683\u2069 items\u2069", [])
+        )
+
+    def test_specialized(self):
+        reference = self.bundle.get_message("function").value.expression
+        self.assertIsInstance(reference, SpecializedTermReference)
+        self.assertEqual(reference.args, {"case": "long", "amount": 3})
+        self.assertIsInstance(reference.pattern, Pattern)
+        with mock.patch(
+            "fluent.runtime.resolver.resolveEntryReference"
+        ) as resolve_entry_reference:
+            self.assertEqual(self.format("function"), ("Total: 3.00", []))
+        resolve_entry_reference.assert_not_called()
+
+    def test_term_unchanged(self):
+        self.format("genitive")
+        self.format("function")
+        term = self.bundle._lookup("brand", term=True)
+        self.assertEqual(len(term.value.expression.variants), 2)
+        self.assertEqual(self.format("default"), ("Firefox", []))
+
+    def test_recursive(self):
+        bundle = FluentBundle(["en-US"], use_isolating=False)
+        bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            -s = p { $a ->
+                    [x] { -s(a: "y") }
+                   *[y] Y
+                }
+            m2 = { -s(a: "x") }
+        """
+                )
+            )
+        )
+        reference = bundle.get_message("m2").value.expression
+        self.assertIsInstance(reference, SpecializedTermReference)
+        val, errs = bundle.format_pattern(bundle.get_message("m2").value)
+        self.assertEqual(val, "p ???")
+        self.assertEqual(len(errs), 1)
+        self.assertIsInstance(errs[0], FluentCyclicReferenceError)
+
+    def test_override(self):
+        self.assertEqual(self.format("genitive"), ("Settings of Firefox's", []))
+        self.bundle.add_resource(
+            FluentResource("-brand = Nightly\n"), allow_overrides=True
+        )
+        self.assertEqual(self.format("genitive"), ("Settings of Nightly", []))
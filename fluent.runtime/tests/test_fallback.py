@@ -1,8 +1,16 @@
+import os
+import threading
 import unittest
 from os.path import join
+from unittest import mock
 from .utils import patch_files
 
-from fluent.runtime import FluentLocalization, FluentResourceLoader
+from fluent.runtime import (
+    FluentLocalization,
+    FluentResourceLoader,
+    LazyFluentResource,
+    MappedFluentResourceLoader,
+)
 
 
 class TestLocalization(unittest.TestCase):
@@ -116,3 +124,290 @@ class TestResourceLoader(unittest.TestCase):
         loader = FluentResourceLoader(join(root, "{locale}"))
         resources_list = list(loader.resources("en", ["one.ftl", "two.ftl"]))
         self.assertEqual(len(resources_list), 0)
+
+    @patch_files({"en": {"one.ftl": "one = exists"}, "de": {}})
+    def test_directory_index(self, root):
+        loader = FluentResourceLoader(
+            [join(root, "{locale}"), join(root, "missing", "{locale}")]
+        )
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            for _ in range(2):
+                for locale in ("en", "de"):
+                    list(loader.resources(locale, ["one.ftl", "two.ftl"]))
+            self.assertEqual(scandir.call_count, 4)
+
+        # Files missing from the listing are checked on disk once.
+        with mock.patch("os.path.isfile", wraps=os.path.isfile) as isfile:
+            for _ in range(3):
+                self.assertFalse(loader.is_file(join(root, "de", "one.ftl")))
+            self.assertEqual(isfile.call_count, 0)
+            for _ in range(3):
+                self.assertFalse(loader.is_file(join(root, "de", "three.ftl")))
+            self.assertEqual(isfile.call_count, 1)
+
+        # Files added since the listing are found after refresh.
+        with open(join(root, "de", "one.ftl"), "w") as file:
+            file.write("one = exists")
+        self.assertEqual(list(loader.resources("de", ["one.ftl"])), [])
+        loader.refresh()
+        self.assertEqual(len(list(loader.resources("de", ["one.ftl"]))), 1)
+
+        # Files removed since the listing are skipped.
+        loader = FluentResourceLoader(join(root, "{locale}"))
+        self.assertTrue(loader.is_file(join(root, "de", "one.ftl")))
+        os.remove(join(root, "de", "one.ftl"))
+        self.assertEqual(list(loader.resources("de", ["one.ftl"])), [])
+
+
+class TestMappedResourceLoader(unittest.TestCase):
+    @patch_files(
+        {
+            "en": {
+                "one.ftl": "one = exists\n",
+                "two.ftl": "two = { one } too\n",
+            }
+        }
+    )
+    def test_localization(self, root):
+        loader = MappedFluentResourceLoader(join(root, "{locale}"))
+        resources_list = list(loader.resources("en", ["one.ftl", "two.ftl"]))
+        self.assertEqual(len(resources_list), 1)
+        for resource in resources_list[0]:
+            self.assertIsInstance(resource, LazyFluentResource)
+
+        l10n = FluentLocalization(["en"], ["one.ftl", "two.ftl"], loader)
+        self.assertEqual(l10n.format_value("two"), "exists too")
+        self.assertEqual(l10n.format_value("three"), "three")
+        for resource in resources_list[0]:
+            resource.close()
+
+    @patch_files({"en": {"one.ftl": "one = One\ntwo = Two\n"}})
+    def test_reload_keeps_replaced(self, root):
+        l10n = FluentLocalization(
+            ["en"], ["one.ftl"], MappedFluentResourceLoader(join(root, "{locale}"))
+        )
+        self.assertEqual(l10n.format_value("one"), "One")
+        old_bundle = next(l10n._bundles())
+        ((_, (resource,)),) = l10n._bundle_resources.values()
+        # Mapped files must be replaced, not rewritten in place.
+        path = join(root, "en", "one.ftl")
+        with open(path + ".new", "w", encoding="utf-8", newline="\n") as file:
+            file.write("one = New\ntwo = Two too\n")
+        os.replace(path + ".new", path)
+        l10n.reload()
+        self.assertEqual(l10n.format_value("one"), "New")
+        # The old bundle can still parse its messages.
+        self.assertEqual(
+            old_bundle.format_pattern(old_bundle.get_message("two").value),
+            ("Two", []),
+        )
+        resource.close()
+        self.assertEqual(resource.messages, {})
+        for _, resources in l10n._bundle_resources.values():
+            for resource in resources:
+                resource.close()
+
+    @patch_files({"en": {"main.ftl": "".join(f"m{i} = M{i}\n" for i in range(50))}})
+    def test_mapped_reload_while_formatting(self, root):
+        l10n = FluentLocalization(
+            ["en"], ["main.ftl"], MappedFluentResourceLoader(join(root, "{locale}"))
+        )
+        path = join(root, "en", "main.ftl")
+        done = threading.Event()
+        errors = []
+        values = []
+
+        def format_values():
+            while not done.is_set():
+                try:
+                    values.extend(l10n.format_value(f"m{i}") for i in range(50))
+                except Exception as e:
+                    errors.append(e)
+
+        thread = threading.Thread(target=format_values)
+        thread.start()
+        try:
+            for index in range(20):
+                content = "".join(f"m{i} = {index}\n" for i in range(50))
+                with open(path + ".new", "w", encoding="utf-8") as file:
+                    file.write(content)
+                os.replace(path + ".new", path)
+                l10n.reload()
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertFalse(any(value.startswith("m") for value in values))
+
+
+def rewrite(path, content):
+    """Rewrite a file, with a later modification time."""
+    stat = os.stat(path)
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        file.write(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestReload(unittest.TestCase):
+    @patch_files(
+        {
+            "de": {"one.ftl": "one = Eins\n", "two.ftl": "two = { one } und zwei\n"},
+            "en": {
+                "one.ftl": "one = One\n",
+                "two.ftl": "two = Two\nthree = { two } and three\nfour = Four\n",
+            },
+        }
+    )
+    def test_reload(self, root):
+        l10n = FluentLocalization(
+            ["de", "en"],
+            ["one.ftl", "two.ftl"],
+            FluentResourceLoader(join(root, "{locale}")),
+        )
+        for msg_id in ("one", "two", "three", "four"):
+            l10n.format_value(msg_id)
+        bundle_de, bundle_en = l10n._bundles()
+        compiled_four = bundle_en._compiled["four"]
+
+        rewrite(join(root, "en", "two.ftl"), "two = New Two\nfour = Four\n")
+        l10n.reload()
+
+        new_de, new_en = l10n._bundles()
+        self.assertIs(new_de, bundle_de)
+        self.assertIsNot(new_en, bundle_en)
+        self.assertEqual(sorted(new_en._compiled), ["four"])
+        self.assertIs(new_en._compiled["four"], compiled_four)
+        self.assertEqual(l10n.format_value("two"), "Eins und zwei")
+        self.assertEqual(l10n.format_value("three"), "three")
+        self.assertEqual(l10n.format_value("four"), "Four")
+
+        rewrite(join(root, "de", "one.ftl"), "one = Neu\n")
+        l10n.reload()
+        self.assertEqual(l10n.format_value("two"), "Neu und zwei")
+        self.assertIs(list(l10n._bundles())[1], new_en)
+
+    @patch_files({"en": {"one.ftl": "one = One\n"}})
+    def test_dependents(self, root):
+        l10n = FluentLocalization(
+            ["en"], ["one.ftl"], FluentResourceLoader(join(root, "{locale}"))
+        )
+        rewrite(
+            join(root, "en", "one.ftl"),
+            "one = { two }\ntwo = { -three }\n-three = Three\nfour = Four\n",
+        )
+        l10n.reload()
+        self.assertEqual(l10n.format_value("one"), "Three")
+        self.assertEqual(l10n.format_value("four"), "Four")
+        bundle = next(l10n._bundles())
+        self.assertEqual(bundle._get_dependents({"-three"}), {"one", "two", "-three"})
+        self.assertEqual(bundle._get_dependents({"four"}), {"four"})
+
+    @patch_files({"en": {"one.ftl": "one = One\n"}})
+    def test_reload_while_formatting(self, root):
+        path = join(root, "en", "one.ftl")
+        l10n = FluentLocalization(
+            ["en"], ["one.ftl"], FluentResourceLoader(join(root, "{locale}"))
+        )
+        l10n.format_value("one")
+        done = threading.Event()
+        results = set()
+
+        def format_values():
+            while not done.is_set():
+                results.add(l10n.format_value("one"))
+
+        thread = threading.Thread(target=format_values)
+        thread.start()
+        try:
+            for index in range(20):
+                rewrite(path, f"one = Version {index}\n")
+                l10n.reload()
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(l10n.format_value("one"), "Version 19")
+        self.assertLessEqual(results, {"One"} | {f"Version {i}" for i in range(20)})
+
+    @patch_files({"en": {"one.ftl": "one = One\n"}})
+    def test_shared_loader(self, root):
+        loader = FluentResourceLoader(join(root, "{locale}"))
+        l10n = FluentLocalization(["en"], ["one.ftl"], loader)
+        self.assertEqual(l10n.format_value("one"), "One")
+        same = FluentLocalization(["en"], ["one.ftl"], loader)
+        self.assertEqual(same.format_value("one"), "One")
+        self.assertIs(
+            same._bundle_resources[next(same._bundles())][1][0],
+            l10n._bundle_resources[next(l10n._bundles())][1][0],
+        )
+
+        rewrite(join(root, "en", "one.ftl"), "one = New\n")
+        new = FluentLocalization(["en"], ["one.ftl"], loader)
+        self.assertEqual(new.format_value("one"), "New")
+        self.assertEqual(l10n.format_value("one"), "One")
+
+    @patch_files({"de": {"one.ftl": "one = Eins\n"}, "en": {"one.ftl": "one = One\n"}})
+    def test_reload_while_iterating(self, root):
+        l10n = FluentLocalization(
+            ["de", "en"], ["one.ftl"], FluentResourceLoader(join(root, "{locale}"))
+        )
+        bundles = l10n._bundles()
+        bundle_de = next(bundles)
+        os.remove(join(root, "de", "one.ftl"))
+        l10n.reload()
+        # The German bundle is replaced by an English one.
+        self.assertEqual(len(l10n._bundle_cache), 1)
+        new_en = l10n._bundle_cache[0]
+        self.assertEqual(new_en.locales, ["en"])
+        # The iterator keeps creating the bundles from before reload,
+        # without adding them to the new ones.
+        bundle_en = next(bundles)
+        self.assertEqual(bundle_en.locales, ["en"])
+        self.assertEqual(list(bundles), [])
+        self.assertNotIn(bundle_de, l10n._bundle_resources)
+        self.assertNotIn(bundle_en, l10n._bundle_resources)
+        self.assertEqual(list(l10n._bundle_resources), [new_en])
+        self.assertEqual(list(l10n._bundles()), [new_en])
+        self.assertEqual(l10n.format_value("one"), "One")
+
+    @patch_files(
+        {
+            "de": {"one.ftl": "one = Eins\n"},
+            "fr": {"one.ftl": "one = Un\n"},
+            "en": {"one.ftl": "one = One\n", "two.ftl": "two = Two\n"},
+        }
+    )
+    def test_reload_while_iterating_threads(self, root):
+        l10n = FluentLocalization(
+            ["de", "fr", "en"],
+            ["one.ftl", "two.ftl"],
+            FluentResourceLoader(join(root, "{locale}")),
+        )
+        done = threading.Event()
+        errors = []
+
+        def format_values():
+            while not done.is_set():
+                try:
+                    l10n.format_value("two")
+                    for bundle in l10n._bundles():
+                        pass
+                except Exception as e:
+                    errors.append(e)
+
+        thread = threading.Thread(target=format_values)
+        thread.start()
+        try:
+            for index in range(50):
+                for locale in ("de", "fr"):
+                    path = join(root, locale, "one.ftl")
+                    if index % 2:
+                        with open(path, "w", encoding="utf-8") as file:
+                            file.write(f"one = {index}\n")
+                    else:
+                        os.remove(path)
+                l10n.reload()
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(set(l10n._bundle_cache), set(l10n._bundle_resources))
@@ -0,0 +1,97 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from os.path import join
+
+from fluent.runtime import FluentBundle, FluentLocalization, FluentResourceLoader
+from fluent.runtime.footprint import (
+    Footprint,
+    bundle_footprint,
+    localization_footprint,
+    main,
+    resource_footprint,
+)
+from fluent.syntax import FluentParser
+
+from .utils import dedent_ftl, patch_files
+
+FTL = dedent_ftl(
+    """
+    # A comment
+    short = Short
+    long = A much longer message, with { -term } and { $variable }
+        .attr = And an attribute
+    -term = Term
+    """
+)
+
+
+class TestFootprint(unittest.TestCase):
+    def test_resource(self):
+        footprint = resource_footprint(FluentParser().parse(FTL))
+        self.assertGreater(footprint.total, 0)
+        self.assertGreater(footprint.spans, 0)
+        self.assertGreater(footprint.comments, 0)
+        self.assertEqual(footprint.compiled, 0)
+        self.assertEqual(footprint.total, sum(footprint.types.values()))
+        self.assertEqual([name for name, _ in footprint.largest(2)], ["long", "short"])
+        self.assertIn("-term", footprint.entries)
+        self.assertIn("ast.Message", footprint.types)
+        self.assertIn("ast.Span", footprint.types)
+
+    def test_without_spans(self):
+        with_spans = resource_footprint(FluentParser().parse(FTL))
+        without_spans = resource_footprint(FluentParser(with_spans=False).parse(FTL))
+        self.assertEqual(without_spans.spans, 0)
+        # The nodes without spans have one field less, too.
+        self.assertLessEqual(without_spans.total, with_spans.total - with_spans.spans)
+
+    def test_counted_once(self):
+        resource = FluentParser().parse(FTL)
+        footprint = Footprint()
+        total = footprint.add(resource)
+        self.assertEqual(footprint.add(resource), 0)
+        self.assertEqual(footprint.add(resource.body[0]), 0)
+        self.assertEqual(footprint.total, total)
+
+    def test_bundle(self):
+        bundle = FluentBundle(["en"])
+        bundle.add_resource(FluentParser().parse(FTL))
+        before = bundle_footprint(bundle)
+        self.assertEqual(before.compiled, 0)
+        bundle.get_message("long")
+        after = bundle_footprint(bundle)
+        self.assertGreater(after.compiled, 0)
+        self.assertEqual(after.total, before.total + after.compiled)
+        self.assertIn("resolver.Message", after.types)
+        self.assertGreater(after.entries["long"], before.entries["long"])
+
+    @patch_files(
+        {
+            "de": {"main.ftl": "one = Eins\n"},
+            "en": {"main.ftl": FTL},
+        }
+    )
+    def test_localization(self, root):
+        l10n = FluentLocalization(
+            ["de", "en"], ["main.ftl"], FluentResourceLoader(join(root, "{locale}"))
+        )
+        footprints = localization_footprint(l10n)
+        self.assertEqual(list(footprints), ["de", "en"])
+        self.assertEqual(list(footprints["de"].entries), ["one"])
+        self.assertGreater(footprints["en"].total, footprints["de"].total)
+
+    @patch_files(
+        {
+            "de": {"main.ftl": "one = Eins\n"},
+            "en": {"main.ftl": FTL, "sub": {"other.ftl": "two = Two\n"}},
+        }
+    )
+    def test_main(self, root):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main([root, "--compile", "--top", "1"]), 0)
+        lines = output.getvalue().splitlines()
+        self.assertIn("de: 1 files", lines)
+        self.assertIn("en: 2 files", lines)
+        self.assertTrue(lines[-2].endswith("  long"))
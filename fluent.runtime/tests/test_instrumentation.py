@@ -0,0 +1,213 @@
+import threading
+import unittest
+from os.path import join
+
+from fluent.runtime import (
+    FluentBundle,
+    FluentLocalization,
+    FluentResource,
+    FluentResourceLoader,
+    FormatEvent,
+    LocalizationMetrics,
+    MessageProfiler,
+)
+from fluent.runtime.instrumentation import LocalizationEvent
+
+from .utils import dedent_ftl, patch_files
+
+
+class TestObserver(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.bundle = FluentBundle(["en-US"], observer=self.events.append)
+        self.bundle.add_resource(
+            FluentResource(
+                dedent_ftl(
+                    """
+            foo = Foo { $arg }
+                .attr = Attr
+            -term = Term
+            bar = { -term } { missing }
+        """
+                )
+            )
+        )
+
+    def test_events(self):
+        foo = self.bundle.get_message("foo")
+        self.bundle.format_pattern(foo.value, {"arg": 1})
+        self.bundle.format_pattern(foo.value, {"arg": 2, "other": 3})
+        self.bundle.format_pattern(foo.attributes["attr"])
+        self.assertEqual(
+            [event[:1] + event[2:] for event in self.events],
+            [
+                ("foo", 1, [], False),
+                ("foo", 2, [], True),
+                ("foo.attr", 0, [], False),
+            ],
+        )
+        for event in self.events:
+            self.assertIsInstance(event, FormatEvent)
+            self.assertGreaterEqual(event.duration, 0)
+
+    def test_errors(self):
+        bar = self.bundle.get_message("bar")
+        val, errors = self.bundle.format_pattern(bar.value)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.events[0].message_id, "bar")
+        self.assertEqual(self.events[0].errors, errors)
+
+    def test_no_observer(self):
+        self.bundle.observer = None
+        foo = self.bundle.get_message("foo")
+        self.bundle.format_pattern(foo.value, {"arg": 1})
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.bundle._unformatted, set())
+        self.assertEqual(self.bundle._pattern_ids, {})
+
+    @patch_files(
+        {
+            "de": {"main.ftl": "one = Eins\n"},
+            "en": {"main.ftl": "one = One\ntwo = Two\n"},
+        }
+    )
+    def test_localization(self, root):
+        l10n = FluentLocalization(
+            ["de", "en"], ["main.ftl"], FluentResourceLoader(join(root, "{locale}"))
+        )
+        self.assertEqual(l10n.format_value("one"), "Eins")
+        events = []
+        l10n.observer = events.append
+        self.assertEqual(l10n.format_value("one"), "Eins")
+        self.assertEqual(l10n.format_value("two"), "Two")
+        self.assertEqual(
+            [(event.message_id, event.cache_hit) for event in events],
+            [("one", True), ("two", False)],
+        )
+
+
+class TestMessageProfiler(unittest.TestCase):
+    def test_aggregate(self):
+        profiler = MessageProfiler()
+        profiler(FormatEvent("foo", 0.001, 0, [], False))
+        profiler(FormatEvent("foo", 0.003, 1, [], True))
+        profiler(FormatEvent("bar", 0.004, 0, [ValueError()], False))
+        foo = profiler.stats["foo"]
+        self.assertEqual((foo.count, foo.errors, foo.misses), (2, 0, 1))
+        self.assertAlmostEqual(foo.total, 0.004)
+        self.assertAlmostEqual(foo.mean, 0.002)
+        self.assertAlmostEqual(foo.max, 0.003)
+        self.assertEqual([item[0] for item in profiler.hottest(1)], ["foo"])
+        self.assertEqual([item[0] for item in profiler.slowest()], ["bar", "foo"])
+        report = profiler.report(1).splitlines()
+        self.assertEqual(report[0], "Hottest messages")
+        self.assertTrue(report[2].endswith("  foo"))
+        self.assertEqual(report[4], "Slowest messages")
+        self.assertTrue(report[6].endswith("  bar"))
+        profiler.reset()
+        self.assertEqual(profiler.stats, {})
+
+    def test_bundle(self):
+        profiler = MessageProfiler()
+        bundle = FluentBundle(["en-US"], observer=profiler)
+        bundle.add_resource(FluentResource("foo = Foo\n"))
+        for _ in range(3):
+            bundle.format_pattern(bundle.get_message("foo").value)
+        self.assertEqual(profiler.stats["foo"].count, 3)
+        self.assertEqual(profiler.stats["foo"].misses, 1)
+
+    def test_threads(self):
+        profiler = MessageProfiler()
+        event = FormatEvent("foo", 0.001, 0, [], True)
+
+        def observe():
+            for _ in range(1000):
+                profiler(event)
+                profiler.hottest(1)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(profiler.stats["foo"].count, 4000)
+        # The returned stats are copies.
+        [(_, stats)] = profiler.hottest(1)
+        profiler(event)
+        self.assertEqual(stats.count, 4000)
+
+
+class TestLocalizationMetrics(unittest.TestCase):
+    @patch_files(
+        {
+            "de": {"main.ftl": "one = Eins\nbroken = { $missing }\n"},
+            "fr": {"main.ftl": "two = Deux\n"},
+            "en": {"main.ftl": "one = One\ntwo = Two\nthree = Three\n"},
+        }
+    )
+    def test_localization(self, root):
+        metrics = LocalizationMetrics(sample_every=2)
+        l10n = FluentLocalization(
+            ["de", "fr", "en"],
+            ["main.ftl"],
+            FluentResourceLoader(join(root, "{locale}")),
+            metrics=metrics,
+        )
+        self.assertEqual(l10n.format_value("one"), "Eins")
+        self.assertEqual(l10n.format_value("two"), "Deux")
+        self.assertEqual(l10n.format_value("three"), "Three")
+        self.assertEqual(l10n.format_value("four"), "four")
+        self.assertEqual(l10n.format_message("broken").value, "missing")
+        self.assertEqual(l10n.format_message("three").value, "Three")
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["count"], 6)
+        self.assertEqual(snapshot["formatted"], {"de": 2, "fr": 1, "en": 2})
+        self.assertEqual(snapshot["fallbacks"], {"fr": 1, "en": 2})
+        self.assertEqual(snapshot["errors"], {"de": 1})
+        self.assertEqual(snapshot["depths"], {0: 2, 1: 1, 2: 2})
+        self.assertEqual(snapshot["missing"], {"four": 1})
+        self.assertEqual(
+            [sample[:3] for sample in snapshot["samples"]],
+            [("two", "fr", 1), ("four", None, 3), ("three", "en", 2)],
+        )
+        self.assertIsInstance(snapshot["samples"][0], LocalizationEvent)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()["count"], 0)
+        self.assertEqual(metrics.snapshot()["formatted"], {})
+
+    @patch_files(
+        {
+            "app": {"de": {"main.ftl": "one = Eins\n"}},
+            "lib": {
+                "de": {"main.ftl": "two = Zwei\n"},
+                "en": {"main.ftl": "three = Three\n"},
+            },
+        }
+    )
+    def test_roots(self, root):
+        metrics = LocalizationMetrics()
+        l10n = FluentLocalization(
+            ["de", "en"],
+            ["main.ftl"],
+            FluentResourceLoader(
+                [join(root, "app", "{locale}"), join(root, "lib", "{locale}")]
+            ),
+            metrics=metrics,
+        )
+        self.assertEqual(l10n.format_value("one"), "Eins")
+        self.assertEqual(l10n.format_value("two"), "Zwei")
+        self.assertEqual(l10n.format_value("three"), "Three")
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["formatted"], {"de": 2, "en": 1})
+        self.assertEqual(snapshot["fallbacks"], {"en": 1})
+        self.assertEqual(snapshot["depths"], {0: 1, 1: 1, 2: 1})
+
+    def test_max_samples(self):
+        metrics = LocalizationMetrics(sample_every=1, max_samples=2)
+        for message_id in ("one", "two", "three"):
+            metrics.record(message_id, "en", 0, [])
+        self.assertEqual(
+            [sample.message_id for sample in metrics.samples], ["two", "three"]
+        )
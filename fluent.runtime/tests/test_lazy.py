@@ -0,0 +1,245 @@
+import threading
+import unittest
+from os.path import join
+from unittest import mock
+
+from fluent.runtime import FluentBundle, FluentResource, LazyFluentResource
+from fluent.runtime.lazy import map_resource, scan_entries
+
+from .utils import dedent_ftl, patch_files
+
+FTL_CONTENT = dedent_ftl(
+    """
+    ### Resource comment
+
+    # Message comment
+    foo = Foo
+    -term = Term
+        .attr = Attribute
+    bar =
+        Multiline
+        { -term }
+    broken = {
+    baz = Baz { $arg }
+
+    ## Group comment
+    dup = First
+    dup = Second
+    """
+)
+
+
+class TestScanEntries(unittest.TestCase):
+    def test_index(self):
+        messages, terms = scan_entries(FTL_CONTENT)
+        self.assertEqual(list(messages), ["foo", "bar", "broken", "baz", "dup"])
+        self.assertEqual(list(terms), ["term"])
+        start, end = messages["bar"][0]
+        self.assertEqual(
+            FTL_CONTENT[start:end], "bar =\n    Multiline\n    { -term }\n"
+        )
+        start, end = terms["term"][0]
+        self.assertEqual(
+            FTL_CONTENT[start:end], "-term = Term\n    .attr = Attribute\n"
+        )
+        self.assertEqual(len(messages["dup"]), 2)
+
+
+class TestLazyFluentResource(unittest.TestCase):
+    def setUp(self):
+        self.resource = LazyFluentResource(FTL_CONTENT)
+
+    def test_get_entry(self):
+        foo = self.resource.get_entry("foo")
+        self.assertEqual(foo.id.name, "foo")
+        self.assertIsNone(foo.span)
+        self.assertEqual(self.resource.get_entry("term", term=True).id.name, "term")
+        self.assertIsNone(self.resource.get_entry("term"))
+        self.assertIsNone(self.resource.get_entry("broken"))
+        self.assertIsNone(self.resource.get_entry("missing"))
+        self.assertEqual(
+            self.resource.get_entry("dup").value.elements[0].value, "First"
+        )
+
+    def test_placeable_on_entry_start_line(self):
+        resource = LazyFluentResource("foo = {\n-term }\n-term = Term\n")
+        self.assertEqual(
+            resource.get_entry("foo").value.elements[0].expression.id.name, "term"
+        )
+
+    def test_skip_junk_definition(self):
+        resource = LazyFluentResource("foo = {\nfoo = Foo\n")
+        self.assertEqual(resource.get_entry("foo").value.elements[0].value, "Foo")
+
+
+class TestEncodedSource(unittest.TestCase):
+    source = dedent_ftl(
+        """
+        unicode = Ünïcödé
+        foo = {
+        -term }
+        -term = Tërm
+        """
+    )
+
+    def test_scan_bytes(self):
+        encoded = self.source.encode("utf-8")
+        messages, terms = scan_entries(encoded)
+        self.assertEqual(list(messages), ["unicode", "foo"])
+        self.assertEqual(list(terms), ["term"])
+        start, end = messages["unicode"][0]
+        self.assertEqual(encoded[start:end].decode("utf-8"), "unicode = Ünïcödé\n")
+
+    def test_bytes(self):
+        resource = LazyFluentResource(self.source.encode("utf-8"))
+        self.assertEqual(
+            resource.get_entry("unicode").value.elements[0].value, "Ünïcödé"
+        )
+        self.assertEqual(
+            resource.get_entry("foo").value.elements[0].expression.id.name, "term"
+        )
+        self.assertEqual(
+            resource.get_entry("term", term=True).value.elements[0].value, "Tërm"
+        )
+
+    @patch_files({"en.ftl": source, "empty.ftl": ""})
+    def test_map_resource(self, root):
+        resource = map_resource(join(root, "en.ftl"))
+        self.assertEqual(
+            resource.get_entry("term", term=True).value.elements[0].value, "Tërm"
+        )
+        resource.close()
+        resource = map_resource(join(root, "empty.ftl"))
+        self.assertEqual(resource.messages, {})
+
+    @patch_files({"en.ftl": source})
+    def test_close(self, root):
+        with map_resource(join(root, "en.ftl")) as resource:
+            source = resource.source
+            self.assertEqual(
+                resource.get_entry("unicode").value.elements[0].value, "Ünïcödé"
+            )
+        self.assertTrue(source.closed)
+        self.assertIsNone(resource.get_entry("term", term=True))
+        resource.close()
+
+    def decoded_size(self, source, entry_id):
+        """Parse an entry of source, and return it with the characters decoded."""
+        resource = LazyFluentResource(source.encode("utf-8"))
+        decode = resource._decode
+        decoded = []
+
+        def record_decode(start, end=None):
+            text = decode(start, end)
+            decoded.append(text)
+            return text
+
+        resource._decode = record_decode
+        return resource.get_entry(entry_id), sum(map(len, decoded))
+
+    def test_junk_window(self):
+        messages = "".join(f"msg-{index} = Message {index}\n" for index in range(1000))
+        entry, size = self.decoded_size("foo = {\n-term }\n" + messages, "foo")
+        self.assertEqual(entry.value.elements[0].expression.id.name, "term")
+        self.assertLess(size, 200)
+
+        entry, size = self.decoded_size("foo = {\n" + messages, "foo")
+        self.assertIsNone(entry)
+        self.assertLess(size, 200)
+
+    def test_junk_window_continued(self):
+        source = "foo =\n    { -term(\nbar: 1) } done\n-term = Term\nbaz = Baz\n"
+        resource = LazyFluentResource(source.encode("utf-8"))
+        self.assertEqual(resource.get_entry("foo").value.elements[-1].value, " done")
+        self.assertEqual(resource.get_entry("baz").value.elements[0].value, "Baz")
+
+
+class TestLazyBundle(unittest.TestCase):
+    def setUp(self):
+        self.bundle = FluentBundle(["en-US"], use_isolating=False)
+        self.bundle.add_resource(LazyFluentResource(FTL_CONTENT))
+
+    def test_parse_on_demand(self):
+        self.assertEqual(self.bundle._messages, {})
+        self.assertTrue(self.bundle.has_message("foo"))
+        self.assertEqual(list(self.bundle._messages), ["foo"])
+        self.assertFalse(self.bundle.has_message("broken"))
+        self.assertFalse(self.bundle.has_message("term"))
+        self.assertFalse(self.bundle.has_message("missing"))
+
+    def test_format(self):
+        eager = FluentBundle(["en-US"], use_isolating=False)
+        eager.add_resource(FluentResource(FTL_CONTENT))
+        for msg_id in ("foo", "bar", "baz", "dup"):
+            self.assertEqual(
+                self.bundle.format_pattern(
+                    self.bundle.get_message(msg_id).value, {"arg": 1}
+                ),
+                eager.format_pattern(eager.get_message(msg_id).value, {"arg": 1}),
+            )
+        self.assertEqual(list(self.bundle._terms), ["term"])
+
+    def test_lookup_missing(self):
+        self.assertRaises(LookupError, self.bundle.get_message, "broken")
+        self.assertRaises(LookupError, self.bundle.get_message, "missing")
+
+    def test_threads(self):
+        # Look up foo in other threads while it's parsed.
+        resource = self.bundle._lazy_messages["foo"][0]
+        get_entry = resource.get_entry
+        started = []
+        found = []
+
+        def look_up():
+            found.append(self.bundle.has_message("foo"))
+            found.append(self.bundle.get_message("foo").id.name)
+
+        def get_entry_later(entry_id, term=False):
+            if not started:
+                started.append(True)
+                thread = threading.Thread(target=look_up)
+                thread.start()
+                thread.join()
+            return get_entry(entry_id, term=term)
+
+        with mock.patch.object(resource, "get_entry", side_effect=get_entry_later):
+            self.assertTrue(self.bundle.has_message("foo"))
+        self.assertEqual(found, [True, "foo"])
+        self.assertNotIn("foo", self.bundle._lazy_messages)
+
+
+class TestLazyPrecedence(unittest.TestCase):
+    def format(self, bundle):
+        return bundle.format_pattern(bundle.get_message("foo").value)[0]
+
+    def test_first_wins(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(LazyFluentResource("foo = First\n"))
+        bundle.add_resource(FluentResource("foo = Second\n"))
+        bundle.add_resource(LazyFluentResource("foo = Third\n"))
+        self.assertEqual(self.format(bundle), "First")
+
+    def test_eager_first_wins(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(FluentResource("foo = First\n"))
+        bundle.add_resource(LazyFluentResource("foo = Second\n"))
+        self.assertEqual(self.format(bundle), "First")
+
+    def test_broken_lazy_skipped(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(LazyFluentResource("foo = {\n"))
+        bundle.add_resource(LazyFluentResource("foo = Second\n"))
+        self.assertEqual(self.format(bundle), "Second")
+
+    def test_overrides(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(FluentResource("foo = First\n"))
+        bundle.add_resource(LazyFluentResource("foo = Second\n"), allow_overrides=True)
+        bundle.add_resource(LazyFluentResource("foo = {\n"), allow_overrides=True)
+        self.assertEqual(self.format(bundle), "Second")
+
+    def test_eager_override(self):
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(LazyFluentResource("foo = First\n"))
+        bundle.add_resource(FluentResource("foo = Second\n"), allow_overrides=True)
+        self.assertEqual(self.format(bundle), "Second")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The benchmark helpers are shared with the fluent.syntax benchmarks.
+sys.path.append(
+    os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "..",
+        "..",
+        "fluent.syntax",
+        "tools",
+        "benchmarks",
+    )
+)
+from memory import measure_memory  # noqa: E402
+
+
+@pytest.fixture
+def benchmark(benchmark):
+    return measure_memory(benchmark)
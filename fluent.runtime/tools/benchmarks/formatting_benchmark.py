@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# This should be run using pytest
+
+from datetime import date
+
+import pytest
+from fluent.runtime import (
+    AbstractResourceLoader,
+    FluentBundle,
+    FluentLocalization,
+    FluentResource,
+)
+
+# conftest.py adds the fluent.syntax benchmarks to the path.
+from catalog import ARGS, generate_catalog, message_ids  # noqa: E402
+
+CATALOG_SIZES = [100, 1000, 10000]
+
+FTL_CONTENT = """
+-brand =
+    { $case ->
+       *[nominative] Firefox
+        [genitive] Firefox's
+    }
+plural =
+    { $count ->
+        [one] One new message
+       *[other] { $count } new messages
+    }
+ordinal =
+    { NUMBER($position, type: "ordinal") ->
+        [one] { $position }st
+        [two] { $position }nd
+        [few] { $position }rd
+       *[other] { $position }th
+    }
+select =
+    { $gender ->
+        [feminine] She updated her profile
+        [masculine] He updated his profile
+       *[other] They updated their profile
+    }
+number = Total: { NUMBER($amount, minimumFractionDigits: 2) }
+datetime = Updated on { DATETIME($date, dateStyle: "long") }
+term-arguments = Settings of { -brand(case: "genitive") }
+placeables = { $first } and { $second } and { $third } and { $fourth }
+"""
+
+
+def format_message(bundle, message_id, args=None):
+    return bundle.format_pattern(bundle.get_message(message_id).value, args)[0]
+
+
+@pytest.fixture(params=[False, True], ids=["unisolated", "isolated"])
+def bundle(request):
+    bundle = FluentBundle(["en-US"], use_isolating=request.param)
+    bundle.add_resource(FluentResource(FTL_CONTENT))
+    return bundle
+
+
+@pytest.fixture(scope="module", params=CATALOG_SIZES)
+def catalog(request):
+    return FluentResource(generate_catalog(request.param)), request.param
+
+
+class TestFormat:
+    def test_plural(self, bundle, benchmark):
+        benchmark(lambda: format_message(bundle, "plural", {"count": 5}))
+
+    def test_ordinal(self, bundle, benchmark):
+        benchmark(lambda: format_message(bundle, "ordinal", {"position": 23}))
+
+    def test_select(self, bundle, benchmark):
+        benchmark(lambda: format_message(bundle, "select", {"gender": "masculine"}))
+
+    def test_number(self, bundle, benchmark):
+        benchmark(lambda: format_message(bundle, "number", {"amount": 1234.5}))
+
+    def test_datetime(self, bundle, benchmark):
+        args = {"date": date(2020, 2, 29)}
+        benchmark(lambda: format_message(bundle, "datetime", args))
+
+    def test_term_arguments(self, bundle, benchmark):
+        benchmark(lambda: format_message(bundle, "term-arguments"))
+
+    def test_placeables(self, bundle, benchmark):
+        args = {"first": "one", "second": "two", "third": "three", "fourth": "four"}
+        benchmark(lambda: format_message(bundle, "placeables", args))
+
+
+class TestCatalog:
+    def test_compile_all(self, catalog, benchmark):
+        resource, size = catalog
+        ids = message_ids(size)
+
+        def setup():
+            bundle = FluentBundle(["en-US"])
+            bundle.add_resource(resource)
+            return (bundle,), {}
+
+        def compile_all(bundle):
+            for message_id in ids:
+                bundle.get_message(message_id)
+
+        benchmark.pedantic(compile_all, setup=setup, rounds=10)
+
+    def test_format_all(self, catalog, benchmark):
+        resource, size = catalog
+        ids = message_ids(size)
+        bundle = FluentBundle(["en-US"])
+        bundle.add_resource(resource)
+
+        def format_all():
+            for message_id in ids:
+                format_message(bundle, message_id, ARGS)
+
+        benchmark(format_all)
+
+
+class MemoryLoader(AbstractResourceLoader):
+    """Resource loader for the resources of each locale in a dict."""
+
+    def __init__(self, resources):
+        self._resources = resources
+
+    def resources(self, locale, resource_ids):
+        if locale in self._resources:
+            yield [self._resources[locale]]
+
+
+class TestFallback:
+    @pytest.mark.parametrize("depth", [0, 4])
+    def test_fallback(self, depth, benchmark):
+        locales = ["de", "fr", "it", "es", "en"]
+        resources = {
+            locale: FluentResource(f"{locale} = {locale}\n") for locale in locales
+        }
+        resources["en"] = FluentResource(FTL_CONTENT)
+        l10n = FluentLocalization(
+            locales[4 - depth :], ["main.ftl"], MemoryLoader(resources)
+        )
+        benchmark(lambda: l10n.format_value("plural", {"count": 5}))
@@ -1,4 +1,5 @@
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, TextIO
 
 from . import ast
 from .errors import ParseError
@@ -15,8 +16,10 @@ __all__ = [
     "Transformer",
     "Visitor",
     "ast",
+    "iter_entries",
     "parse",
     "serialize",
+    "serialize_to",
 ]
 
 
@@ -26,7 +29,19 @@ def parse(source: str, **kwargs: Any) -> ast.Resource:
     return parser.parse(source)
 
 
+def iter_entries(fileobj: TextIO, **kwargs: Any) -> Iterator[ast.EntryType]:
+    """Iterate over the ast.Entry objects of a Fluent Syntax file object."""
+    parser = FluentParser(**kwargs)
+    return parser.parse_iter(fileobj)
+
+
 def serialize(resource: ast.Resource, **kwargs: Any) -> str:
     """Serialize an ast.Resource to a unicode string."""
     serializer = FluentSerializer(**kwargs)
     return serializer.serialize(resource)
+
+
+def serialize_to(resource: ast.Resource, fp: TextIO, **kwargs: Any) -> None:
+    """Serialize an ast.Resource to a text stream."""
+    serializer = FluentSerializer(**kwargs)
+    serializer.serialize_to(resource, fp)
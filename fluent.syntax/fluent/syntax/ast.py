@@ -1,6 +1,8 @@
+import hashlib
 import json
 import re
 import sys
+import weakref
 from typing import Any, Callable, TypeVar, Union, cast
 
 Node = TypeVar("Node", bound="BaseNode")
@@ -29,6 +31,33 @@ def from_json(value: Any) -> Any:
         return value
 
 
+# Fingerprints of nodes, keyed by the fields ignored to compute them.
+fingerprints: "weakref.WeakKeyDictionary[BaseNode, dict[tuple[str, ...], bytes]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def update_fingerprint(hasher: Any, value: Any, ignored_fields: list[str]) -> None:
+    """Add a field value to the fingerprint being computed in hasher."""
+    if isinstance(value, BaseNode):
+        hasher.update(b"N")
+        hasher.update(value.fingerprint(ignored_fields))
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"L%d:" % len(value))
+        for item in value:
+            update_fingerprint(hasher, item, ignored_fields)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        hasher.update(b"S%d:" % len(encoded))
+        hasher.update(encoded)
+    elif value is None:
+        hasher.update(b"0")
+    else:
+        encoded = f"{type(value).__name__}:{value!r}".encode("utf-8")
+        hasher.update(b"V%d:" % len(encoded))
+        hasher.update(encoded)
+
+
 def scalars_equal(node1: Any, node2: Any, ignored_fields: list[str]) -> bool:
     """Compare two nodes which are not lists."""
 
@@ -105,6 +134,41 @@ class BaseNode:
 
         return True
 
+    def fingerprint(self, ignored_fields: list[str] = ["span"]) -> bytes:
+        """Compute a digest of the content of the node.
+
+        Nodes which are equal according to :meth:`equals` with the same
+        ``ignored_fields`` have the same fingerprint. Fingerprints are cached
+        on the nodes, and are only valid as long as the tree under them isn't
+        modified. :class:`.visitor.Transformer` forgets them for the nodes it
+        visits, but nodes don't know their parents, so the ancestors of the
+        node it's called with keep theirs. After transforming a subtree, or
+        any other modification, call :meth:`forget_fingerprint` on the
+        ancestors of the modified nodes.
+        """
+        key = tuple(sorted(ignored_fields)) if ignored_fields else ()
+        cached = fingerprints.get(self)
+        if cached is None:
+            cached = fingerprints[self] = {}
+        elif key in cached:
+            return cached[key]
+
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(self.__class__.__name__.encode("utf-8"))
+        for name, value in sorted(vars(self).items()):
+            if name in key:
+                continue
+            hasher.update(b"\0%s=" % name.encode("utf-8"))
+            update_fingerprint(hasher, value, list(key))
+
+        digest = cached[key] = hasher.digest()
+        return digest
+
+    def forget_fingerprint(self) -> None:
+        """Drop the cached fingerprints of the node."""
+        if fingerprints:
+            fingerprints.pop(self, None)
+
     def to_json(self, fn: Union[ToJsonFn, None] = None) -> Any:
         obj = {name: to_json(value, fn) for name, value in vars(self).items()}
         obj.update({"type": self.__class__.__name__})
@@ -142,7 +206,7 @@ class Message(Entry):
         value: Union["Pattern", None] = None,
         attributes: Union[list["Attribute"], None] = None,
         comment: Union["Comment", None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.id = id
@@ -158,7 +222,7 @@ class Term(Entry):
         value: "Pattern",
         attributes: Union[list["Attribute"], None] = None,
         comment: Union["Comment", None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.id = id
@@ -189,7 +253,7 @@ class Placeable(PatternElement):
     def __init__(
         self,
         expression: Union["InlineExpression", "Placeable", "SelectExpression"],
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.expression = expression
@@ -247,7 +311,7 @@ class MessageReference(Expression):
         self,
         id: "Identifier",
         attribute: Union["Identifier", None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.id = id
@@ -260,7 +324,7 @@ class TermReference(Expression):
         id: "Identifier",
         attribute: Union["Identifier", None] = None,
         arguments: Union["CallArguments", None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.id = id
@@ -295,7 +359,7 @@ class CallArguments(SyntaxNode):
         self,
         positional: Union[list[Union["InlineExpression", Placeable]], None] = None,
         named: Union[list["NamedArgument"], None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.positional = [] if positional is None else positional
@@ -315,7 +379,7 @@ class Variant(SyntaxNode):
         key: Union["Identifier", NumberLiteral],
         value: Pattern,
         default: bool = False,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.key = key
@@ -328,7 +392,7 @@ class NamedArgument(SyntaxNode):
         self,
         name: "Identifier",
         value: Union[NumberLiteral, StringLiteral],
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.name = name
@@ -367,7 +431,7 @@ class Junk(SyntaxNode):
         self,
         content: Union[str, None] = None,
         annotations: Union[list["Annotation"], None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.content = content
@@ -390,7 +454,7 @@ class Annotation(SyntaxNode):
         code: str,
         arguments: Union[list[Any], None] = None,
         message: Union[str, None] = None,
-        **kwargs: Any
+        **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self.code = code
@@ -0,0 +1,265 @@
+"""A compact binary encoding of AST nodes.
+
+The encoding is meant for caches and for passing ASTs between processes of
+the same version of ``fluent.syntax``, and round-trips all node types of
+:py:mod:`fluent.syntax.ast`. Strings are stored once in a string table, nodes
+as codes for their types followed by their fields, and spans in a separate
+table of offsets which can be left out.
+"""
+
+import inspect
+import struct
+import sys
+from array import array
+from typing import Any, Union
+
+from . import ast
+
+MAGIC = b"FTLB"
+VERSION = 1
+HEADER = struct.Struct("<4sBB3sIIII")
+
+FLAG_SPANS = 1
+
+# The types of nodes. Only ever append to this, the codes are part of the format.
+NODE_TYPES: tuple[type[ast.BaseNode], ...] = (
+    ast.Resource,
+    ast.Message,
+    ast.Term,
+    ast.Pattern,
+    ast.TextElement,
+    ast.Placeable,
+    ast.StringLiteral,
+    ast.NumberLiteral,
+    ast.MessageReference,
+    ast.TermReference,
+    ast.VariableReference,
+    ast.FunctionReference,
+    ast.SelectExpression,
+    ast.CallArguments,
+    ast.Attribute,
+    ast.Variant,
+    ast.NamedArgument,
+    ast.Identifier,
+    ast.Comment,
+    ast.GroupComment,
+    ast.ResourceComment,
+    ast.Junk,
+    ast.Span,
+    ast.Annotation,
+)
+
+# Tags of the values in the structure table. Nodes are tagged with the code
+# of their type plus NODE.
+NONE, FALSE, TRUE, STR, INT, LIST, NODE = range(7)
+
+
+def get_fields(cls: type[ast.BaseNode]) -> tuple[str, ...]:
+    """The fields of a node type, in the order of its constructor arguments."""
+    return tuple(
+        name
+        for name, param in inspect.signature(cls).parameters.items()
+        if param.kind is not param.VAR_KEYWORD
+    )
+
+
+# For each node type, its code, its fields and whether it's a SyntaxNode.
+TYPE_INFO = {
+    cls: (code, get_fields(cls), issubclass(cls, ast.SyntaxNode))
+    for code, cls in enumerate(NODE_TYPES)
+}
+
+
+def get_typecode(values: list[int]) -> str:
+    """The smallest unsigned typecode which fits all values."""
+    top = max(values, default=0)
+    for typecode in ("B", "H", "I", "Q"):
+        if top < 1 << (8 * array(typecode).itemsize):
+            return typecode
+    raise ValueError(f"Value too large to encode: {top}")
+
+
+def pack(values: list[int]) -> tuple[str, bytes]:
+    typecode = get_typecode(values)
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return typecode, packed.tobytes()
+
+
+def unpack(typecode: str, data: memoryview) -> list[int]:
+    unpacked = array(typecode)
+    unpacked.frombytes(data)
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def to_bytes(node: ast.BaseNode, with_spans: bool = True) -> bytes:
+    """Encode an AST node and its children.
+
+    ``with_spans`` controls whether the spans of the nodes are kept.
+    """
+    structure: list[int] = []
+    spans: list[int] = []
+    strings: dict[str, int] = {}
+
+    def encode(value: Any) -> None:
+        if value is None:
+            structure.append(NONE)
+        elif value is True:
+            structure.append(TRUE)
+        elif value is False:
+            structure.append(FALSE)
+        elif isinstance(value, str):
+            structure.append(STR)
+            structure.append(strings.setdefault(value, len(strings)))
+        elif isinstance(value, int):
+            structure.append(INT)
+            structure.append(value)
+        elif isinstance(value, (list, tuple)):
+            structure.append(LIST)
+            structure.append(len(value))
+            for item in value:
+                encode(item)
+        else:
+            try:
+                code, fields, is_syntax_node = TYPE_INFO[type(value)]
+            except KeyError:
+                raise TypeError(f"Cannot encode {type(value).__name__}") from None
+            structure.append(NODE + code)
+            if is_syntax_node and with_spans:
+                span = value.span
+                if span is None:
+                    structure.append(0)
+                else:
+                    structure.append(1)
+                    spans.append(span.start)
+                    spans.append(span.end)
+            for name in fields:
+                encode(getattr(value, name))
+
+    encode(node)
+
+    text = "".join(strings)
+    blob = text.encode("utf-8")
+    structure_type, structure_data = pack(structure)
+    lengths_type, lengths_data = pack([len(string) for string in strings])
+    spans_type, spans_data = pack(spans)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        FLAG_SPANS if with_spans else 0,
+        (structure_type + lengths_type + spans_type).encode("ascii"),
+        len(structure),
+        len(strings),
+        len(spans),
+        len(blob),
+    )
+    return b"".join((header, structure_data, lengths_data, spans_data, blob))
+
+
+def from_bytes(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """Decode an AST node encoded with :func:`to_bytes`.
+
+    Raise ``ValueError`` if the data isn't an encoded AST, or is truncated or
+    corrupt.
+    """
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise ValueError("Not an encoded AST")
+    magic, version, flags, typecodes, n_structure, n_strings, n_spans, n_blob = (
+        HEADER.unpack_from(data)
+    )
+    if magic != MAGIC:
+        raise ValueError("Not an encoded AST")
+    if version != VERSION:
+        raise ValueError(f"Unsupported encoding version: {version}")
+    try:
+        structure_type, lengths_type, spans_type = typecodes.decode("ascii")
+    except UnicodeDecodeError:
+        raise ValueError("Corrupt encoded AST") from None
+    if not {structure_type, lengths_type, spans_type} <= set("BHIQ"):
+        raise ValueError("Corrupt encoded AST")
+
+    pos = HEADER.size
+    tables = []
+    for typecode, count in (
+        (structure_type, n_structure),
+        (lengths_type, n_strings),
+        (spans_type, n_spans),
+    ):
+        size = array(typecode).itemsize * count
+        if pos + size > len(data):
+            raise ValueError("Truncated encoded AST")
+        tables.append(unpack(typecode, data[pos : pos + size]))
+        pos += size
+    structure, lengths, spans = tables
+    if pos + n_blob > len(data):
+        raise ValueError("Truncated encoded AST")
+    try:
+        text = str(data[pos : pos + n_blob], "utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("Corrupt encoded AST") from None
+    if sum(lengths) != len(text):
+        raise ValueError("Corrupt encoded AST")
+
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(text[start : start + length])
+        start += length
+
+    with_spans = bool(flags & FLAG_SPANS)
+    types = [
+        (cls, fields, is_syntax_node)
+        for cls, (_, fields, is_syntax_node) in TYPE_INFO.items()
+    ]
+    new = object.__new__
+    index = 0
+    span_index = 0
+
+    def decode() -> Any:
+        nonlocal index, span_index
+        tag = structure[index]
+        index += 1
+        if tag >= NODE:
+            cls, fields, is_syntax_node = types[tag - NODE]
+            node = new(cls)
+            attrs = node.__dict__
+            if is_syntax_node:
+                span = None
+                if with_spans:
+                    has_span = structure[index]
+                    index += 1
+                    if has_span:
+                        span = new(ast.Span)
+                        span.__dict__.update(
+                            start=spans[span_index], end=spans[span_index + 1]
+                        )
+                        span_index += 2
+                attrs["span"] = span
+            for name in fields:
+                attrs[name] = decode()
+            return node
+        if tag == STR:
+            index += 1
+            return strings[structure[index - 1]]
+        if tag == LIST:
+            length = structure[index]
+            index += 1
+            return [decode() for _ in range(length)]
+        if tag == NONE:
+            return None
+        if tag == INT:
+            index += 1
+            return structure[index - 1]
+        return tag == TRUE
+
+    try:
+        node = decode()
+    except (IndexError, RecursionError):
+        raise ValueError("Corrupt encoded AST") from None
+    if index != len(structure):
+        raise ValueError("Corrupt encoded AST")
+    return node
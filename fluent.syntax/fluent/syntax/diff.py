@@ -0,0 +1,62 @@
+"""Compare the entries of resources using node fingerprints."""
+
+from typing import NamedTuple
+
+from . import ast
+
+
+class ResourceDiff(NamedTuple):
+    """The ids of the Messages and Terms which differ between two resources.
+
+    Term ids start with ``-``.
+    """
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+
+def get_entry_ids(entries: list[ast.EntryType]) -> dict[str, ast.EntryType]:
+    """Map the ids of Messages and Terms to the entries, with "-" for Terms.
+
+    Like in ``FluentBundle``, the first entry with an id wins.
+    """
+    ids: dict[str, ast.EntryType] = {}
+    for entry in entries:
+        if isinstance(entry, (ast.Message, ast.Term)):
+            entry_id = ("-" if isinstance(entry, ast.Term) else "") + entry.id.name
+            ids.setdefault(entry_id, entry)
+    return ids
+
+
+def diff_entries(
+    old: list[ast.EntryType],
+    new: list[ast.EntryType],
+    ignored_fields: list[str] = ["span"],
+) -> ResourceDiff:
+    """Compare the Messages and Terms in two lists of entries.
+
+    Entries are compared by their fingerprint, ignoring ``ignored_fields``.
+    The cached fingerprints of entries which were modified must have been
+    forgotten, see :meth:`.ast.BaseNode.fingerprint`.
+    """
+    old_ids = get_entry_ids(old)
+    new_ids = get_entry_ids(new)
+    return ResourceDiff(
+        added=[entry_id for entry_id in new_ids if entry_id not in old_ids],
+        removed=[entry_id for entry_id in old_ids if entry_id not in new_ids],
+        changed=[
+            entry_id
+            for entry_id, entry in new_ids.items()
+            if entry_id in old_ids
+            and entry.fingerprint(ignored_fields)
+            != old_ids[entry_id].fingerprint(ignored_fields)
+        ],
+    )
+
+
+def diff(
+    old: ast.Resource, new: ast.Resource, ignored_fields: list[str] = ["span"]
+) -> ResourceDiff:
+    """Compare the Messages and Terms of two resources."""
+    return diff_entries(old.body, new.body, ignored_fields)
@@ -1,12 +1,19 @@
 import re
-from typing import Any, Callable, TypeVar, Union, cast
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, NamedTuple, TextIO, TypeVar, Union, cast
 
 from . import ast
+from .diff import diff_entries
 from .errors import ParseError
-from .stream import EOL, FluentParserStream
+from .stream import EOL, FluentParserStream, FluentPartialParserStream
+from .visitor import Visitor
 
 R = TypeVar("R", bound=ast.SyntaxNode)
 
+# A line which starts like an entry, see skip_to_next_entry_start().
+ENTRY_START_LINE = re.compile(r"\n(?=[a-zA-Z#-])")
+
 
 def with_span(fn: Callable[..., R]) -> Callable[..., R]:
     def decorated(
@@ -30,6 +37,68 @@ def with_span(fn: Callable[..., R]) -> Callable[..., R]:
     return decorated
 
 
+class SpanShifter(Visitor):
+    """Move all spans in a tree by a fixed offset.
+
+    The cached fingerprints of the nodes are forgotten, as they include the
+    spans unless they're ignored.
+    """
+
+    def __init__(self, offset: int):
+        self.offset = offset
+
+    def generic_visit(self, node: ast.BaseNode) -> None:
+        node.forget_fingerprint()
+        super().generic_visit(node)
+
+    def visit_Span(self, node: ast.Span) -> None:
+        node.forget_fingerprint()
+        node.start += self.offset
+        node.end += self.offset
+
+
+def shift_spans(node: ast.BaseNode, offset: int) -> None:
+    """Add offset to the start and the end of all spans in node."""
+    SpanShifter(offset).visit(node)
+
+
+def split_source(source: str, chunk_size: int) -> list[int]:
+    """Find the starts of chunks of about chunk_size characters in source.
+
+    Chunks begin at lines which look like the start of an entry.
+    """
+    starts = [0]
+    pos = chunk_size
+    while pos < len(source):
+        match = ENTRY_START_LINE.search(source, pos)
+        if match is None:
+            break
+        starts.append(match.end())
+        pos = match.end() + chunk_size
+    return starts
+
+
+def bisect_entries(entries: list[ast.EntryType], pos: int, end: bool = False) -> int:
+    """Find the index of the first entry which starts (or ends) at or after pos."""
+    lo, hi = 0, len(entries)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        span = cast(ast.Span, entries[mid].span)
+        if (span.end if end else span.start) < pos:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class TextEdit(NamedTuple):
+    """Replace the text from start to end of a source with text."""
+
+    start: int
+    end: int
+    text: str
+
+
 class FluentParser:
     """This class is used to parse Fluent source content.
 
@@ -45,23 +114,250 @@ class FluentParser:
         ps = FluentParserStream(source)
         ps.skip_blank_block()
 
-        entries: list[ast.EntryType] = []
-        last_comment = None
+        entries = list(self.attach_comments(self.get_entries(ps)))
+        res = ast.Resource(entries)
 
+        if self.with_spans:
+            res.add_span(0, ps.index)
+
+        return res
+
+    def parse_iter(
+        self, fileobj: TextIO, chunk_size: int = 65536
+    ) -> Iterator[ast.EntryType]:
+        """Parse a Fluent source from a file object, one entry at a time.
+
+        The source is read in chunks of (at least) ``chunk_size`` characters,
+        so that only the entry being parsed and the rest of the current chunk
+        are held in memory. The yielded entries are the same as the ones in
+        the ``body`` of the :class:`.ast.Resource` returned by :meth:`parse`
+        for the whole source, including their spans.
+        """
+        return self.attach_comments(self.get_entries_from_file(fileobj, chunk_size))
+
+    def parse_parallel(
+        self,
+        source: str,
+        chunk_size: int = 1 << 20,
+        max_workers: Union[int, None] = None,
+        executor: Union[Executor, None] = None,
+    ) -> ast.Resource:
+        """Create a :class:`.ast.Resource` from a Fluent source, using
+        multiple processes.
+
+        The source is split into chunks of about ``chunk_size`` characters at
+        lines which look like the start of an entry, and the chunks are
+        parsed in a :class:`concurrent.futures.ProcessPoolExecutor` with
+        ``max_workers``, or in the given ``executor``. The result is the same
+        as the one of :meth:`parse`: entries which could depend on the text of
+        the next chunk are parsed again when the results are joined.
+        """
+        starts = split_source(source, chunk_size)
+        if len(starts) == 1:
+            return self.parse(source)
+
+        ends = starts[1:] + [len(source)]
+        chunks = [source[start:end] for start, end in zip(starts, ends)]
+        finals = [False] * (len(chunks) - 1) + [True]
+
+        parsed: dict[int, tuple[ast.EntryType, bool, int]] = {}
+        if executor is None:
+            with ProcessPoolExecutor(max_workers) as pool:
+                results = list(pool.map(self.get_chunk_entries, chunks, starts, finals))
+        else:
+            results = list(executor.map(self.get_chunk_entries, chunks, starts, finals))
+        for chunk_entries in results:
+            for start, entry, adjacent, end in chunk_entries:
+                parsed[start] = (entry, adjacent, end)
+
+        ps = FluentParserStream(source)
+        ps.skip_blank_block()
+
+        def get_entries() -> Iterator[tuple[ast.EntryType, bool]]:
+            while ps.current_char:
+                if ps.index in parsed:
+                    entry, adjacent, end = parsed.pop(ps.index)
+                    ps.index = end
+                    yield entry, adjacent
+                else:
+                    # The entry crosses the end of a chunk.
+                    entry = self.get_entry_or_junk(ps)
+                    blank_lines = ps.skip_blank_block()
+                    yield entry, len(blank_lines) == 0 and bool(ps.current_char)
+
+        entries = list(self.attach_comments(get_entries()))
+        res = ast.Resource(entries)
+
+        if self.with_spans:
+            res.add_span(0, ps.index)
+
+        return res
+
+    def reparse(
+        self, resource: ast.Resource, source: str, edit: TextEdit
+    ) -> tuple[ast.Resource, set[str]]:
+        """Update a :class:`.ast.Resource` after an edit of its source.
+
+        ``resource`` must have been parsed with spans from the source before
+        the ``edit``, the offsets of which refer to that previous source.
+        ``source`` is the source after the edit.
+
+        Only the entries around the edit are parsed again. The following
+        entries are reused from ``resource`` with their spans shifted, so
+        ``resource`` must not be used anymore. Return the updated resource
+        and the ids of the Messages and Terms which were added, removed or
+        changed, with a leading ``-`` for Terms. Changes are found with
+        fingerprints, so ``resource`` must not have been modified since it
+        was parsed without forgetting them, see
+        :meth:`.ast.BaseNode.fingerprint`.
+        """
+        if not self.with_spans or resource.span is None:
+            raise ValueError("Incremental parsing requires spans")
+
+        body = resource.body
+        delta = len(edit.text) - (edit.end - edit.start)
+        edit_end = edit.start + len(edit.text)
+
+        # Start at the entry before the first one touched by the edit. The
+        # edit might change whether a Comment attaches to the entry after it,
+        # or where the Junk before it ends.
+        first = max(bisect_entries(body, edit.start, end=True) - 1, 0)
+        # The old entries after the edit, which can be reused as soon as the
+        # parser reaches one of their starts.
+        reuse = bisect_entries(body, edit.end)
+
+        ps = FluentParserStream(source)
+        if first > 0:
+            ps.index = cast(ast.Span, body[first].span).start
+        else:
+            ps.skip_blank_block()
+
+        def get_entries() -> Iterator[tuple[ast.EntryType, bool]]:
+            nonlocal reuse
+            stashed_comment = False
+            while ps.current_char:
+                if ps.index >= edit_end and not stashed_comment:
+                    while (
+                        reuse < len(body)
+                        and cast(ast.Span, body[reuse].span).start + delta < ps.index
+                    ):
+                        reuse += 1
+                    if (
+                        reuse < len(body)
+                        and cast(ast.Span, body[reuse].span).start + delta == ps.index
+                    ):
+                        return
+                entry = self.get_entry_or_junk(ps)
+                blank_lines = ps.skip_blank_block()
+                adjacent = len(blank_lines) == 0 and bool(ps.current_char)
+                stashed_comment = isinstance(entry, ast.Comment) and adjacent
+                yield entry, adjacent
+            reuse = len(body)
+
+        entries = list(self.attach_comments(get_entries()))
+        following = body[reuse:]
+        if delta:
+            for entry in following:
+                shift_spans(entry, delta)
+
+        added, removed, changed = diff_entries(body[first:reuse], entries)
+
+        res = ast.Resource(body[:first] + entries + following)
+        res.add_span(0, len(source))
+        return res, {*added, *removed, *changed}
+
+    def get_chunk_entries(
+        self, source: str, offset: int, final: bool
+    ) -> list[tuple[int, ast.EntryType, bool, int]]:
+        """Parse the entries of a chunk of a larger source.
+
+        Return the start, the entry, its adjacency to the next entry and the
+        end of each entry which only depends on the text of the chunk.
+        ``offset`` is the position of the chunk in the whole source.
+        """
+        ps = FluentPartialParserStream(source)
+        ps.skip_blank_block()
+
+        entries: list[tuple[int, ast.EntryType, bool, int]] = []
+        while ps.current_char:
+            start = ps.index
+            entry = self.get_entry_or_junk(ps)
+            blank_lines = ps.skip_blank_block()
+            adjacent = len(blank_lines) == 0 and bool(ps.current_char)
+            if ps.exhausted and not final:
+                break
+            if self.with_spans and offset:
+                shift_spans(entry, offset)
+            entries.append((start + offset, entry, adjacent, ps.index + offset))
+
+        return entries
+
+    def get_entries(
+        self, ps: FluentParserStream
+    ) -> Iterator[tuple[ast.EntryType, bool]]:
+        """Yield each entry of ps, and whether the next entry follows it
+        immediately, without any blank lines in between.
+        """
         while ps.current_char:
             entry = self.get_entry_or_junk(ps)
             blank_lines = ps.skip_blank_block()
+            yield entry, len(blank_lines) == 0 and bool(ps.current_char)
+
+    def get_entries_from_file(
+        self, fileobj: TextIO, chunk_size: int
+    ) -> Iterator[tuple[ast.EntryType, bool]]:
+        buffer = ""
+        # The index in buffer at which the next entry starts, and the index
+        # in the whole source at which the buffer starts.
+        pos = 0
+        offset = 0
+        at_eof = False
+
+        while True:
+            ps = FluentPartialParserStream(buffer)
+            ps.index = pos
+            ps.skip_blank_block()
+
+            entry = None
+            adjacent = False
+            if ps.current_char:
+                entry = self.get_entry_or_junk(ps)
+                blank_lines = ps.skip_blank_block()
+                adjacent = len(blank_lines) == 0 and bool(ps.current_char)
+
+            if ps.exhausted and not at_eof:
+                # The parser needs to see more of the source to be sure about
+                # this entry. Drop what has been parsed already, and at least
+                # double the rest, so that long entries are only re-parsed a
+                # logarithmic number of times.
+                chunk = fileobj.read(max(chunk_size, len(buffer) - pos))
+                at_eof = not chunk
+                buffer = buffer[pos:] + chunk
+                offset += pos
+                pos = 0
+                continue
+
+            if entry is None:
+                return
+
+            if self.with_spans and offset:
+                shift_spans(entry, offset)
+            yield entry, adjacent
+            pos = ps.index
 
+    def attach_comments(
+        self, entries: Iterable[tuple[ast.EntryType, bool]]
+    ) -> Iterator[ast.EntryType]:
+        """Attach Comments to the Messages and Terms which follow them."""
+        last_comment = None
+
+        for entry, adjacent in entries:
             # Regular Comments require special logic. Comments may be attached
             # to Messages or Terms if they are followed immediately by them.
             # However they should parse as standalone when they're followed by
             # Junk. Consequently, we only attach Comments once we know that the
             # Message or the Term parsed successfully.
-            if (
-                isinstance(entry, ast.Comment)
-                and len(blank_lines) == 0
-                and ps.current_char
-            ):
+            if isinstance(entry, ast.Comment) and adjacent:
                 # Stash the comment and decide what to do with it
                 # in the next pass.
                 last_comment = entry
@@ -75,19 +371,12 @@ class FluentParser:
                             ast.Span, entry.comment.span
                         ).start
                 else:
-                    entries.append(last_comment)
+                    yield last_comment
                 # In either case, the stashed comment has been dealt with;
                 # clear it.
                 last_comment = None
 
-            entries.append(entry)
-
-        res = ast.Resource(entries)
-
-        if self.with_spans:
-            res.add_span(0, ps.index)
-
-        return res
+            yield entry
 
     def parse_entry(self, source: str) -> ast.EntryType:
         """Parse the first :class:`.ast.Entry` in source.
@@ -1,4 +1,5 @@
-from typing import Union
+from collections.abc import Iterable, Iterator
+from typing import TextIO, Union
 
 from . import ast
 
@@ -43,21 +44,85 @@ class FluentSerializer:
     def __init__(self, with_junk: bool = False):
         self.with_junk = with_junk
 
-    def serialize(self, resource: ast.Resource) -> str:
-        "Serialize a :class:`.ast.Resource` to a string."
+    def serialize(self, resource: ast.Resource, source: Union[str, None] = None) -> str:
+        """Serialize a :class:`.ast.Resource` to a string.
+
+        If the resource was parsed with spans from ``source``, pass it to copy
+        the entries which still have their spans from it, see
+        :meth:`serialize_iter`.
+        """
         if not isinstance(resource, ast.Resource):
             raise Exception(f"Unknown resource type: {type(resource)}")
 
-        state = 0
+        return "".join(self.serialize_iter(resource.body, source))
 
-        parts: list[str] = []
-        for entry in resource.body:
-            if not isinstance(entry, ast.Junk) or self.with_junk:
-                parts.append(self.serialize_entry(entry, state))
-                if not state & self.HAS_ENTRIES:
-                    state |= self.HAS_ENTRIES
+    def serialize_to(
+        self, resource: ast.Resource, fp: TextIO, source: Union[str, None] = None
+    ) -> None:
+        "Serialize a :class:`.ast.Resource` to a text stream."
+        if not isinstance(resource, ast.Resource):
+            raise Exception(f"Unknown resource type: {type(resource)}")
 
-        return "".join(parts)
+        self.serialize_entries(resource.body, fp, source)
+
+    def serialize_entries(
+        self,
+        entries: Iterable[ast.EntryType],
+        fp: TextIO,
+        source: Union[str, None] = None,
+    ) -> None:
+        """Serialize entries to a text stream.
+
+        Each entry is written as soon as it's serialized, which together with
+        :meth:`.FluentParser.parse_iter` formats files with bounded memory.
+        """
+        for part in self.serialize_iter(entries, source):
+            fp.write(part)
+
+    def serialize_iter(
+        self, entries: Iterable[ast.EntryType], source: Union[str, None] = None
+    ) -> Iterator[str]:
+        """Serialize entries to an iterator of strings.
+
+        Without ``source``, each entry is serialized from its AST.
+
+        With ``source``, the entries which have a span are copied verbatim
+        from it, along with the whitespace up to the next entry if that is
+        copied too and was adjacent in the source. Only the entries without
+        spans are serialized, so drop the span of an entry when modifying it,
+        and create new entries without spans.
+        """
+        state = 0
+        # Where the last text copied from source ended, or None if the last
+        # entry was serialized.
+        copied_end = None if source is None else 0
+
+        for entry in entries:
+            if isinstance(entry, ast.Junk) and not self.with_junk:
+                continue
+
+            span = None if source is None else entry.span
+            if source is not None and copied_end is not None:
+                yield serialize_gap(source, copied_end, span.start if span else None)
+
+            if source is None or span is None:
+                yield self.serialize_entry(entry, state)
+                copied_end = None
+            else:
+                if (
+                    copied_end is None
+                    and state & self.HAS_ENTRIES
+                    and isinstance(entry, ast.BaseComment)
+                ):
+                    yield "\n"
+                yield source[span.start : span.end]
+                copied_end = span.end
+
+            if not state & self.HAS_ENTRIES:
+                state |= self.HAS_ENTRIES
+
+        if source is not None and copied_end is not None:
+            yield serialize_gap(source, copied_end, len(source))
 
     def serialize_entry(self, entry: ast.EntryType, state: int = 0) -> str:
         "Serialize an :class:`.ast.Entry` to a string."
@@ -82,6 +147,20 @@ class FluentSerializer:
         raise Exception(f"Unknown entry type: {type(entry)}")
 
 
+def serialize_gap(source: str, start: int, end: Union[int, None]) -> str:
+    """Serialize the text between two parts of the source copied verbatim.
+
+    Keep the whitespace between them, otherwise end the line of the first.
+    """
+    if end is not None and start <= end:
+        gap = source[start:end]
+        if gap.isspace() or not gap:
+            return gap
+    if start == 0 or source[start - 1] == "\n":
+        return ""
+    return "\n"
+
+
 def serialize_comment(
     comment: Union[ast.Comment, ast.GroupComment, ast.ResourceComment],
     prefix: str = "#",
@@ -199,10 +278,11 @@ def serialize_expression(expression: Union[ast.Expression, ast.Placeable]) -> st
         args = serialize_call_arguments(expression.arguments)
         return f"{expression.id.name}{args}"
     if isinstance(expression, ast.SelectExpression):
-        out = f"{serialize_expression(expression.selector)} ->"
+        parts = [f"{serialize_expression(expression.selector)} ->"]
         for variant in expression.variants:
-            out += serialize_variant(variant)
-        return f"{out}\n"
+            parts.append(serialize_variant(variant))
+        parts.append("\n")
+        return "".join(parts)
     if isinstance(expression, ast.Placeable):
         return serialize_placeable(expression)
     raise Exception(f"Unknown expression type: {type(expression)}")
@@ -287,3 +287,24 @@ class FluentParserStream(ParserStream):
             )  # a-f
 
         return self.take_char(closure)
+
+
+class FluentPartialParserStream(FluentParserStream):
+    """A FluentParserStream over the beginning of a longer source.
+
+    ``exhausted`` is set as soon as the parser looks past the end of the
+    available text. Anything parsed after that might change once more of the
+    source is appended, while anything parsed before only depends on the text
+    already seen.
+    """
+
+    def __init__(self, string: str):
+        super().__init__(string)
+        self.exhausted = False
+
+    def get(self, offset: int) -> Union[str, None]:
+        try:
+            return self.string[offset]
+        except IndexError:
+            self.exhausted = True
+            return None
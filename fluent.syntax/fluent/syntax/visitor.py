@@ -1,7 +1,43 @@
-from typing import Any
+from typing import Any, Callable, ClassVar, Union
 
+from . import ast
 from .ast import BaseNode, Node
 
+# The fields of the AST node types which can hold nodes, in the order in which
+# they are set by the constructors. Subclasses of these node types fall back
+# to all the fields of the instances.
+CHILD_FIELDS: dict[type, tuple[str, ...]] = {
+    ast.Resource: ("span", "body"),
+    ast.Message: ("span", "id", "value", "attributes", "comment"),
+    ast.Term: ("span", "id", "value", "attributes", "comment"),
+    ast.Pattern: ("span", "elements"),
+    ast.TextElement: ("span",),
+    ast.Placeable: ("span", "expression"),
+    ast.StringLiteral: ("span",),
+    ast.NumberLiteral: ("span",),
+    ast.MessageReference: ("span", "id", "attribute"),
+    ast.TermReference: ("span", "id", "attribute", "arguments"),
+    ast.VariableReference: ("span", "id"),
+    ast.FunctionReference: ("span", "id", "arguments"),
+    ast.SelectExpression: ("span", "selector", "variants"),
+    ast.CallArguments: ("span", "positional", "named"),
+    ast.Attribute: ("span", "id", "value"),
+    ast.Variant: ("span", "key", "value"),
+    ast.NamedArgument: ("span", "name", "value"),
+    ast.Identifier: ("span",),
+    ast.Comment: ("span",),
+    ast.GroupComment: ("span",),
+    ast.ResourceComment: ("span",),
+    ast.Junk: ("span", "annotations"),
+    ast.Span: (),
+    ast.Annotation: ("span", "arguments"),
+}
+
+
+def get_child_fields(node: BaseNode) -> Any:
+    fields = CHILD_FIELDS.get(type(node))
+    return list(vars(node)) if fields is None else fields
+
 
 class Visitor:
     """Read-only visitor pattern.
@@ -12,22 +48,99 @@ class Visitor:
     To handle specific node types, add methods like `visit_Pattern`.
     If you want to still descend into the children of the node, call
     `generic_visit` of the superclass.
+
+    The visit methods are looked up once per node type and visitor class.
+    Visit methods set on an instance, like ``visitor.visit_Pattern = fn``,
+    are looked up for that instance instead.
+
+    Set `iterative` to True on a subclass to traverse the AST with an explicit
+    stack instead of recursive calls, for very deep ASTs. Nodes are still
+    visited in the same order, but calling `generic_visit` or `visit` from a
+    visit method only schedules the children, so any code after it runs
+    before the children are visited.
     """
 
+    iterative: ClassVar[bool] = False
+
+    _dispatch: ClassVar[dict[type, Callable[..., Any]]] = {}
+    _pending: Union[list[Any], None] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name.startswith("visit_"):
+            # Dispatch on the visit methods of this instance.
+            super().__setattr__("_dispatch", {})
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        if name.startswith("visit_"):
+            super().__setattr__("_dispatch", {})
+
+    def get_visit(self, node_type: type) -> Callable[..., Any]:
+        """The visit method for a node type, as a function of self and node."""
+        try:
+            return self._dispatch[node_type]
+        except KeyError:
+            pass
+        name = f"visit_{node_type.__name__}"
+        method = vars(self).get(name)
+        if method is not None:
+            visit: Callable[..., Any] = lambda _, node: method(node)
+        else:
+            cls = type(self)
+            visit = getattr(cls, name, cls.generic_visit)
+        self._dispatch[node_type] = visit
+        return visit
+
     def visit(self, node: Any) -> None:
+        if self._pending is not None:
+            self._pending.append(node)
+            return
+        if self.iterative:
+            self.visit_iteratively(node)
+            return
         if isinstance(node, list):
             for child in node:
                 self.visit(child)
             return
         if not isinstance(node, BaseNode):
             return
-        nodename = type(node).__name__
-        visit = getattr(self, f"visit_{nodename}", self.generic_visit)
-        visit(node)
+        visit = self._dispatch.get(type(node)) or self.get_visit(type(node))
+        visit(self, node)
+
+    def visit_iteratively(self, node: Any) -> None:
+        stack = [node]
+        pending: list[Any] = []
+        dispatch = self._dispatch
+        self._pending = pending
+        try:
+            while stack:
+                node = stack.pop()
+                if isinstance(node, list):
+                    stack.extend(reversed(node))
+                elif isinstance(node, BaseNode):
+                    visit = dispatch.get(type(node)) or self.get_visit(type(node))
+                    visit(self, node)
+                    if pending:
+                        stack.extend(reversed(pending))
+                        pending.clear()
+        finally:
+            self._pending = None
 
     def generic_visit(self, node: BaseNode) -> None:
-        for propvalue in vars(node).values():
-            self.visit(propvalue)
+        pending = self._pending
+        for name in get_child_fields(node):
+            propvalue = getattr(node, name, None)
+            if propvalue is None:
+                continue
+            if pending is not None:
+                pending.append(propvalue)
+            else:
+                self.visit(propvalue)
 
 
 class Transformer(Visitor):
@@ -37,19 +150,75 @@ class Transformer(Visitor):
     of the given AST.
     If you need to keep the original AST around, pass
     a `node.clone()` to the transformer.
+
+    With `iterative` set, the children scheduled by `generic_visit` are
+    replaced by the results of their visit methods after the visit method
+    of their parent returns. Nodes passed to `visit` by a visit method are
+    visited later, and their results are discarded.
     """
 
     def visit(self, node: Any) -> Any:
         if not isinstance(node, BaseNode):
             return node
+        if self._pending is not None:
+            self._pending.append((node, None, None))
+            return node
+        if self.iterative:
+            return self.visit_iteratively(node)
 
-        nodename = type(node).__name__
-        visit = getattr(self, f"visit_{nodename}", self.generic_visit)
-        return visit(node)
+        visit = self._dispatch.get(type(node)) or self.get_visit(type(node))
+        result = visit(self, node)
+        # The node might have been modified.
+        node.forget_fingerprint()
+        return result
+
+    def visit_iteratively(self, node: Any) -> Any:
+        # The stack holds nodes to visit along with the list or node and the
+        # index or field name where to store the result. A None node marks
+        # the end of the children of a list, which is then compacted.
+        root = [node]
+        stack: list[tuple[Any, Any, Any]] = [(node, root, 0)]
+        pending: list[tuple[Any, Any, Any]] = []
+        dispatch = self._dispatch
+        self._pending = pending
+        try:
+            while stack:
+                node, owner, key = stack.pop()
+                if node is None:
+                    owner[:] = [child for child in owner if child is not None]
+                    continue
+                visit = dispatch.get(type(node)) or self.get_visit(type(node))
+                result = visit(self, node)
+                # The node might have been modified.
+                node.forget_fingerprint()
+                if isinstance(owner, list):
+                    owner[key] = result
+                elif owner is None:
+                    pass
+                elif result is None:
+                    delattr(owner, key)
+                else:
+                    setattr(owner, key, result)
+                if pending:
+                    stack.extend(reversed(pending))
+                    pending.clear()
+        finally:
+            self._pending = None
+        return root[0]
 
     def generic_visit(self, node: Node) -> Node:  # type: ignore
-        for propname, propvalue in vars(node).items():
+        pending = self._pending
+        for propname in get_child_fields(node):
+            propvalue = getattr(node, propname, None)
             if isinstance(propvalue, list):
+                if pending is not None:
+                    pending.extend(
+                        (child, propvalue, index)
+                        for index, child in enumerate(propvalue)
+                        if isinstance(child, BaseNode)
+                    )
+                    pending.append((None, propvalue, None))
+                    continue
                 new_vals: list[Any] = []
                 for child in propvalue:
                     new_val = self.visit(child)
@@ -58,6 +227,9 @@ class Transformer(Visitor):
                 # in-place manipulation
                 propvalue[:] = new_vals
             elif isinstance(propvalue, BaseNode):
+                if pending is not None:
+                    pending.append((propvalue, node, propname))
+                    continue
                 new_val = self.visit(propvalue)
                 if new_val is None:
                     delattr(node, propname)
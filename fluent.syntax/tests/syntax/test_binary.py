@@ -0,0 +1,83 @@
+import json
+import os
+import unittest
+
+from fluent.syntax import ast, parse
+from fluent.syntax.binary import from_bytes, to_bytes
+
+
+def read_file(path):
+    with open(path, "r", encoding="utf-8", newline="\n") as file:
+        text = file.read()
+    return text
+
+
+fixtures_dirs = [
+    os.path.join(os.path.dirname(__file__), name)
+    for name in ("fixtures_reference", "fixtures_structure")
+]
+
+
+class TestBinary(unittest.TestCase):
+    maxDiff = None
+
+    def test_fixtures(self):
+        for fixtures in fixtures_dirs:
+            for file_name in sorted(os.listdir(fixtures)):
+                if not file_name.endswith(".ftl"):
+                    continue
+                source = read_file(os.path.join(fixtures, file_name))
+                for with_spans in (True, False):
+                    with self.subTest(file_name=file_name, with_spans=with_spans):
+                        resource = parse(source, with_spans=with_spans)
+                        decoded = from_bytes(to_bytes(resource))
+                        self.assertEqual(decoded.to_json(), resource.to_json())
+                        self.assertTrue(decoded.equals(resource, ignored_fields=None))
+
+    def test_without_spans(self):
+        resource = parse("# Comment\nfoo = Foo { $bar }\n")
+        decoded = from_bytes(to_bytes(resource, with_spans=False))
+        self.assertIsNone(decoded.span)
+        self.assertIsNone(decoded.body[0].value.elements[1].span)
+        self.assertTrue(decoded.equals(resource))
+
+    def test_smaller_than_json(self):
+        source = read_file(
+            os.path.join(os.path.dirname(__file__), "fixtures_perf", "workload-low.ftl")
+        )
+        resource = parse(source)
+        self.assertLess(
+            len(to_bytes(resource)), len(json.dumps(resource.to_json())) / 4
+        )
+
+    def test_nodes(self):
+        node = ast.Span(0, 1 << 40)
+        self.assertEqual(from_bytes(to_bytes(node)).to_json(), node.to_json())
+        annotation = ast.Annotation("E0003", ["␤"], "message")
+        self.assertEqual(
+            from_bytes(to_bytes(annotation)).to_json(), annotation.to_json()
+        )
+
+    def test_errors(self):
+        self.assertRaises(ValueError, from_bytes, b"")
+        self.assertRaises(
+            ValueError, from_bytes, b"JSON" + to_bytes(ast.Resource())[4:]
+        )
+        self.assertRaises(TypeError, to_bytes, ast.Resource([{}]))
+
+    def test_truncated(self):
+        data = to_bytes(parse("# Comment\nfoo = Foo { $bar }\n    .baz = Baz\n"))
+        for size in range(len(data)):
+            with self.subTest(size=size):
+                self.assertRaises(ValueError, from_bytes, data[:size])
+
+    def test_corrupt(self):
+        data = to_bytes(parse("foo = Foo { $bar }\n-baz = { foo }\n"))
+        for index in range(4, len(data)):
+            corrupt = bytearray(data)
+            corrupt[index] ^= 0xFF
+            with self.subTest(index=index):
+                try:
+                    from_bytes(corrupt)
+                except ValueError:
+                    pass
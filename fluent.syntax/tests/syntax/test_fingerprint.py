@@ -0,0 +1,177 @@
+import unittest
+
+from fluent.syntax import ast
+from fluent.syntax.diff import diff, get_entry_ids
+from fluent.syntax.parser import FluentParser, TextEdit
+from fluent.syntax.visitor import Transformer
+
+from . import dedent_ftl
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.parser = FluentParser()
+
+    def parse_ftl_entry(self, string):
+        return self.parser.parse_entry(dedent_ftl(string))
+
+    def test_equal_nodes(self):
+        message1 = self.parse_ftl_entry(
+            """\
+            foo = Foo { $num ->
+                   *[one] One
+                }
+        """
+        )
+        message2 = self.parse_ftl_entry(
+            """\
+            foo =
+                Foo { $num ->
+                   *[one] One
+                }
+        """
+        )
+
+        self.assertTrue(message1.equals(message2))
+        self.assertEqual(message1.fingerprint(), message2.fingerprint())
+        self.assertEqual(message1.fingerprint(), message1.clone().fingerprint())
+
+    def test_different_nodes(self):
+        message1 = self.parse_ftl_entry("foo = Foo")
+        message2 = self.parse_ftl_entry("foo = Bar")
+        message3 = self.parse_ftl_entry("foo = { Foo }")
+
+        self.assertNotEqual(message1.fingerprint(), message2.fingerprint())
+        self.assertNotEqual(message1.fingerprint(), message3.fingerprint())
+
+    def test_ignored_fields(self):
+        message1 = self.parse_ftl_entry("foo = Foo")
+        message2 = self.parse_ftl_entry("\nfoo = Foo")
+
+        self.assertNotEqual(
+            message1.fingerprint(ignored_fields=[]),
+            message2.fingerprint(ignored_fields=[]),
+        )
+        self.assertEqual(message1.fingerprint(), message2.fingerprint())
+
+    def test_comments(self):
+        message1 = self.parser.parse("foo = Foo").body[0]
+        message2 = self.parser.parse("# Comment\nfoo = Foo").body[0]
+
+        self.assertNotEqual(message1.fingerprint(), message2.fingerprint())
+        self.assertEqual(
+            message1.fingerprint(ignored_fields=["span", "comment"]),
+            message2.fingerprint(ignored_fields=["span", "comment"]),
+        )
+
+    def test_forget_fingerprint(self):
+        message = self.parse_ftl_entry("foo = Foo")
+        fingerprint = message.fingerprint()
+
+        message.id.name = "bar"
+        message.id.forget_fingerprint()
+        self.assertEqual(message.fingerprint(), fingerprint)
+        message.forget_fingerprint()
+        self.assertNotEqual(message.fingerprint(), fingerprint)
+
+    def test_transformer(self):
+        class Rename(Transformer):
+            def visit_Identifier(self, node):
+                return ast.Identifier(node.name.upper())
+
+        message = self.parse_ftl_entry("foo = Foo")
+        fingerprint = message.fingerprint()
+        Rename().visit(message)
+
+        self.assertNotEqual(message.fingerprint(), fingerprint)
+        self.assertEqual(
+            message.fingerprint(), self.parse_ftl_entry("FOO = Foo").fingerprint()
+        )
+
+    def test_transformer_subtree(self):
+        class Rename(Transformer):
+            def visit_Identifier(self, node):
+                return ast.Identifier(node.name.upper())
+
+        resource = self.parser.parse("foo = { bar }\n")
+        old = resource.clone()
+        message = resource.body[0]
+        fingerprint = message.fingerprint()
+        Rename().visit(message.value)
+        # The message wasn't visited, and keeps its stale fingerprint.
+        self.assertEqual(message.fingerprint(), fingerprint)
+        self.assertEqual(diff(old, resource).changed, [])
+        message.forget_fingerprint()
+        self.assertNotEqual(message.fingerprint(), fingerprint)
+        self.assertEqual(diff(old, resource).changed, ["foo"])
+
+    def test_reparse(self):
+        source = "foo = Foo\nbar = Bar\n"
+        resource = self.parser.parse(source)
+        bar = resource.body[1]
+        fingerprint = bar.fingerprint(ignored_fields=[])
+        new_source = "foo = Changed\nbar = Bar\n"
+        self.parser.reparse(resource, new_source, TextEdit(6, 9, "Changed"))
+
+        self.assertIs(resource.body[1], bar)
+        self.assertNotEqual(bar.fingerprint(ignored_fields=[]), fingerprint)
+        self.assertEqual(
+            bar.fingerprint(ignored_fields=[]),
+            self.parser.parse(new_source).body[1].fingerprint(ignored_fields=[]),
+        )
+
+
+class TestDiff(unittest.TestCase):
+    def setUp(self):
+        self.parser = FluentParser()
+
+    def test_diff(self):
+        old = self.parser.parse(
+            dedent_ftl(
+                """\
+            foo = Foo
+            bar = Bar
+            -baz = Baz
+            qux = Qux
+        """
+            )
+        )
+        new = self.parser.parse(
+            dedent_ftl(
+                """\
+            # Comment
+
+            foo = Foo
+            bar = New Bar
+            -qux = Qux
+            qux = Qux
+            -baz = Baz
+        """
+            )
+        )
+
+        result = diff(old, new)
+        self.assertEqual(result.added, ["-qux"])
+        self.assertEqual(result.removed, [])
+        self.assertEqual(result.changed, ["bar"])
+
+        result = diff(new, old)
+        self.assertEqual(result.added, [])
+        self.assertEqual(result.removed, ["-qux"])
+        self.assertEqual(result.changed, ["bar"])
+
+    def test_same(self):
+        source = dedent_ftl(
+            """\
+            foo = Foo
+            -bar = Bar
+        """
+        )
+        result = diff(self.parser.parse(source), self.parser.parse(source))
+        self.assertEqual(result, ([], [], []))
+
+    def test_duplicates(self):
+        old = self.parser.parse("foo = Foo\nfoo = Other\n")
+        new = self.parser.parse("foo = Foo\nfoo = Changed\n")
+        self.assertEqual(get_entry_ids(old.body)["foo"], old.body[0])
+        self.assertEqual(diff(old, new), ([], [], []))
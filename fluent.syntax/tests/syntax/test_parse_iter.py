@@ -0,0 +1,74 @@
+import io
+import os
+import unittest
+
+from fluent.syntax import iter_entries
+from fluent.syntax.parser import FluentParser
+
+from . import dedent_ftl
+
+
+def read_file(path):
+    with open(path, "r", encoding="utf-8", newline="\n") as file:
+        text = file.read()
+    return text
+
+
+fixtures_dirs = [
+    os.path.join(os.path.dirname(__file__), name)
+    for name in ("fixtures_reference", "fixtures_structure")
+]
+
+
+class TestParseIter(unittest.TestCase):
+    maxDiff = None
+
+    def assert_same_entries(self, source, chunk_size, with_spans=True):
+        parser = FluentParser(with_spans=with_spans)
+        expected = parser.parse(source).body
+        entries = list(parser.parse_iter(io.StringIO(source), chunk_size))
+        self.assertEqual(
+            [entry.to_json() for entry in entries],
+            [entry.to_json() for entry in expected],
+        )
+
+    def test_fixtures(self):
+        for fixtures in fixtures_dirs:
+            for file_name in sorted(os.listdir(fixtures)):
+                if not file_name.endswith(".ftl"):
+                    continue
+                source = read_file(os.path.join(fixtures, file_name))
+                for chunk_size in (1, 7, 64, 65536):
+                    with self.subTest(file_name=file_name, chunk_size=chunk_size):
+                        self.assert_same_entries(source, chunk_size)
+                with self.subTest(file_name=file_name, with_spans=False):
+                    self.assert_same_entries(source, 16, with_spans=False)
+
+    def test_comment_attachment_across_chunks(self):
+        source = dedent_ftl(
+            """\
+            # Attached comment
+            foo = Foo
+
+            # Standalone comment
+
+            bar = Bar
+            # Comment before junk
+            err = {
+            """
+        )
+        entries = list(FluentParser().parse_iter(io.StringIO(source), 3))
+        self.assertEqual(
+            [type(entry).__name__ for entry in entries],
+            ["Message", "Comment", "Message", "Comment", "Junk"],
+        )
+        self.assertEqual(entries[0].comment.content, "Attached comment")
+        self.assertEqual(entries[0].span.start, 0)
+
+    def test_iter_entries(self):
+        entries = iter_entries(io.StringIO("foo = Foo\n-bar = Bar\n"), with_spans=False)
+        self.assertEqual([entry.id.name for entry in entries], ["foo", "bar"])
+
+    def test_empty(self):
+        self.assertEqual(list(iter_entries(io.StringIO(""))), [])
+        self.assertEqual(list(iter_entries(io.StringIO("\n\n  \n"))), [])
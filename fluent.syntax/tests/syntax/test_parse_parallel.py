@@ -0,0 +1,69 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from fluent.syntax.parser import FluentParser, split_source
+
+from . import dedent_ftl
+
+
+def read_file(path):
+    with open(path, "r", encoding="utf-8", newline="\n") as file:
+        text = file.read()
+    return text
+
+
+fixtures_dirs = [
+    os.path.join(os.path.dirname(__file__), name)
+    for name in ("fixtures_reference", "fixtures_structure")
+]
+
+
+class TestParseParallel(unittest.TestCase):
+    maxDiff = None
+
+    def assert_same_resource(self, source, chunk_size, executor, with_spans=True):
+        parser = FluentParser(with_spans=with_spans)
+        expected = parser.parse(source)
+        resource = parser.parse_parallel(source, chunk_size, executor=executor)
+        self.assertEqual(resource.to_json(), expected.to_json())
+
+    def test_fixtures(self):
+        with ThreadPoolExecutor(2) as executor:
+            for fixtures in fixtures_dirs:
+                for file_name in sorted(os.listdir(fixtures)):
+                    if not file_name.endswith(".ftl"):
+                        continue
+                    source = read_file(os.path.join(fixtures, file_name))
+                    for chunk_size in (1, 10, 100):
+                        with self.subTest(file_name=file_name, chunk_size=chunk_size):
+                            self.assert_same_resource(source, chunk_size, executor)
+                    with self.subTest(file_name=file_name, with_spans=False):
+                        self.assert_same_resource(
+                            source, 10, executor, with_spans=False
+                        )
+
+    def test_process_pool(self):
+        source = "".join(
+            f"# Comment {i}\nmsg-{i} = Message {{ $num }}\n    .attr = Attribute\n"
+            for i in range(200)
+        )
+        parser = FluentParser()
+        resource = parser.parse_parallel(source, chunk_size=1000, max_workers=2)
+        self.assertEqual(resource.to_json(), parser.parse(source).to_json())
+
+    def test_placeable_across_chunks(self):
+        source = dedent_ftl(
+            """\
+            foo = {
+            -term }
+            bar = Bar
+            """
+        )
+        with ThreadPoolExecutor(2) as executor:
+            self.assert_same_resource(source, 1, executor)
+
+    def test_split_source(self):
+        source = "a = A\n  b\nc = C\n# d\n-e = E\n"
+        self.assertEqual(split_source(source, 1), [0, 10, 16, 20])
+        self.assertEqual(split_source(source, 100), [0])
@@ -0,0 +1,139 @@
+import os
+import random
+import unittest
+
+from fluent.syntax.diff import get_entry_ids
+from fluent.syntax.parser import FluentParser, TextEdit
+
+from . import dedent_ftl
+
+
+def read_file(path):
+    with open(path, "r", encoding="utf-8", newline="\n") as file:
+        text = file.read()
+    return text
+
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures_structure")
+
+SNIPPETS = [
+    "",
+    "\n",
+    "\n\n",
+    "# ",
+    "## ",
+    "-",
+    "=",
+    " ",
+    "    ",
+    "{",
+    "}",
+    "a",
+    "x = y\n",
+]
+
+
+def apply(source, edit):
+    return source[: edit.start] + edit.text + source[edit.end :]
+
+
+class TestReparse(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.parser = FluentParser()
+
+    def assert_reparse(self, source, edit):
+        resource = self.parser.parse(source)
+        old_ids = get_entry_ids(resource.body)
+        new_source = apply(source, edit)
+        expected = self.parser.parse(new_source)
+        expected_ids = get_entry_ids(expected.body)
+
+        updated, changed = self.parser.reparse(resource, new_source, edit)
+
+        self.assertEqual(updated.to_json(), expected.to_json())
+        self.assertEqual(
+            changed,
+            {
+                entry_id
+                for entry_id in old_ids.keys() | expected_ids.keys()
+                if entry_id not in old_ids
+                or entry_id not in expected_ids
+                or not old_ids[entry_id].equals(expected_ids[entry_id])
+            },
+        )
+        return updated, changed
+
+    def test_change_message(self):
+        source = dedent_ftl(
+            """\
+            foo = Foo
+            bar = Bar
+            baz = Baz
+            """
+        )
+        start = source.index("Bar")
+        updated, changed = self.assert_reparse(
+            source, TextEdit(start, start + 3, "Changed")
+        )
+        self.assertEqual(changed, {"bar"})
+        self.assertEqual(updated.body[2].span.start, source.index("baz") + 4)
+
+    def test_attach_comment(self):
+        source = dedent_ftl(
+            """\
+            # Comment
+
+            foo = Foo
+            -bar = Bar
+            """
+        )
+        _, changed = self.assert_reparse(source, TextEdit(10, 11, ""))
+        self.assertEqual(changed, {"foo"})
+
+    def test_break_entry(self):
+        source = dedent_ftl(
+            """\
+            foo = Foo
+            bar = Bar
+                .attr = Attr
+            baz = Baz
+            """
+        )
+        start = source.index("bar")
+        # A placeable at the start of a line continues the previous pattern.
+        _, changed = self.assert_reparse(source, TextEdit(start, start, "{"))
+        self.assertEqual(changed, {"foo", "bar"})
+
+    def test_random_edits(self):
+        rnd = random.Random(0)
+        for file_name in sorted(os.listdir(fixtures)):
+            if not file_name.endswith(".ftl"):
+                continue
+            source = read_file(os.path.join(fixtures, file_name))
+            for _ in range(20):
+                start = rnd.randint(0, len(source))
+                end = min(start + rnd.choice((0, 0, 1, 2, 5, 20)), len(source))
+                edit = TextEdit(start, end, rnd.choice(SNIPPETS))
+                with self.subTest(file_name=file_name, edit=edit):
+                    self.assert_reparse(source, edit)
+
+    def test_consecutive_edits(self):
+        rnd = random.Random(1)
+        source = read_file(os.path.join(fixtures, "multiline_pattern.ftl"))
+        resource = self.parser.parse(source)
+        for _ in range(50):
+            start = rnd.randint(0, len(source))
+            end = min(start + rnd.choice((0, 1, 3)), len(source))
+            edit = TextEdit(start, end, rnd.choice(SNIPPETS))
+            source = apply(source, edit)
+            resource, _ = self.parser.reparse(resource, source, edit)
+            self.assertEqual(resource.to_json(), self.parser.parse(source).to_json())
+
+    def test_requires_spans(self):
+        resource = FluentParser(with_spans=False).parse("foo = Foo\n")
+        edit = TextEdit(6, 9, "Bar")
+        self.assertRaises(
+            ValueError, self.parser.reparse, resource, "foo = Bar\n", edit
+        )
@@ -1,6 +1,7 @@
+import io
 import unittest
 
-from fluent.syntax import FluentParser, FluentSerializer
+from fluent.syntax import FluentParser, FluentSerializer, serialize_to
 from fluent.syntax.serializer import serialize_expression, serialize_variant_key
 from tests.syntax import dedent_ftl
 
@@ -445,6 +446,163 @@ class TestSerializeResource(unittest.TestCase):
         self.assertEqual(self.pretty_ftl(input), dedent_ftl(input))
 
 
+class TestSerializeTo(unittest.TestCase):
+    source = dedent_ftl(
+        """\
+        # Attached Comment
+        foo = Foo
+        ## Group Comment
+        -bar = Bar
+            .attr = { $num ->
+                [one] One
+               *[other] Other
+            }
+        baz = { -bar }
+        junk
+        """
+    )
+
+    def test_serialize_to(self):
+        resource = FluentParser().parse(self.source)
+        for with_junk in (False, True):
+            serializer = FluentSerializer(with_junk=with_junk)
+            output = io.StringIO()
+            serializer.serialize_to(resource, output)
+            self.assertEqual(output.getvalue(), serializer.serialize(resource))
+
+    def test_serialize_entries(self):
+        resource = FluentParser().parse(self.source)
+        serializer = FluentSerializer()
+        output = io.StringIO()
+        serializer.serialize_entries(
+            FluentParser().parse_iter(io.StringIO(self.source)), output
+        )
+        self.assertEqual(output.getvalue(), serializer.serialize(resource))
+
+    def test_helper(self):
+        resource = FluentParser().parse(self.source)
+        output = io.StringIO()
+        serialize_to(resource, output, with_junk=True)
+        self.assertEqual(
+            output.getvalue(), FluentSerializer(with_junk=True).serialize(resource)
+        )
+
+    def test_invalid_resource(self):
+        with self.assertRaisesRegex(Exception, "Unknown resource type"):
+            FluentSerializer().serialize_to(None, io.StringIO())
+
+
+class TestSerializeWithSource(unittest.TestCase):
+    source = dedent_ftl(
+        """\
+        # Attached Comment
+        foo   =   Foo
+        bar = { $num ->
+          [one] One
+         *[other] Other
+        }
+
+
+        ## Group Comment
+        -baz =     Baz
+        junk
+        qux = Qux
+        """
+    )
+
+    def setUp(self):
+        self.resource = FluentParser().parse(self.source)
+
+    def test_unchanged(self):
+        serializer = FluentSerializer(with_junk=True)
+        self.assertEqual(serializer.serialize(self.resource, self.source), self.source)
+
+    def test_without_junk(self):
+        serializer = FluentSerializer()
+        self.assertEqual(
+            serializer.serialize(self.resource, self.source),
+            self.source.replace("junk\n", ""),
+        )
+
+    def test_modified(self):
+        serializer = FluentSerializer(with_junk=True)
+        bar = self.resource.body[1]
+        bar.value.elements[0].expression.selector.id.name = "count"
+        bar.span = None
+        self.assertEqual(
+            serializer.serialize(self.resource, self.source),
+            self.source.replace(
+                dedent_ftl(
+                    """\
+            bar = { $num ->
+              [one] One
+             *[other] Other
+            }
+            """
+                ),
+                dedent_ftl(
+                    """\
+            bar =
+                { $count ->
+                    [one] One
+                   *[other] Other
+                }
+            """
+                ),
+            ).replace("}\n\n\n", "}\n\n"),
+        )
+
+    def test_added_and_removed(self):
+        serializer = FluentSerializer(with_junk=True)
+        parser = FluentParser(with_spans=False)
+        body = self.resource.body
+        body[0:2] = [parser.parse_entry("new = New")]
+        body.append(parser.parse("# Comment").body[0])
+        self.assertEqual(
+            serializer.serialize(self.resource, self.source),
+            dedent_ftl(
+                """\
+            new = New
+
+            ## Group Comment
+            -baz =     Baz
+            junk
+            qux = Qux
+
+            # Comment
+            """
+            )
+            + "\n",
+        )
+
+    def test_reordered(self):
+        serializer = FluentSerializer()
+        body = self.resource.body
+        body.reverse()
+        self.assertEqual(
+            serializer.serialize(self.resource, self.source),
+            dedent_ftl(
+                """\
+            qux = Qux
+            -baz =     Baz
+            ## Group Comment
+            bar = { $num ->
+              [one] One
+             *[other] Other
+            }
+            # Attached Comment
+            foo   =   Foo
+            """
+            ),
+        )
+
+    def test_serialize_to(self):
+        serializer = FluentSerializer(with_junk=True)
+        output = io.StringIO()
+        serializer.serialize_to(self.resource, output, self.source)
+        self.assertEqual(output.getvalue(), self.source)
+
+
 class TestSerializeExpression(unittest.TestCase):
     @staticmethod
     def pretty_expr(text):
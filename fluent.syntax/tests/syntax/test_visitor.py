@@ -47,6 +47,25 @@ class TestVisitor(unittest.TestCase):
             },
         )
 
+    def test_instance_method(self):
+        resource = FluentParser().parse("one = One\ntwo = Two\n")
+        # The dispatch of the class is cached first.
+        MockVisitor().visit(resource)
+        mv = MockVisitor()
+        patterns = []
+        mv.visit_Pattern = patterns.append
+        mv.visit(resource)
+        self.assertEqual(len(patterns), 2)
+        self.assertEqual(mv.pattern_calls, 0)
+        del mv.visit_Pattern
+        mv.visit(resource)
+        self.assertEqual(len(patterns), 2)
+        self.assertEqual(mv.pattern_calls, 2)
+        # Other instances use the methods of the class.
+        other = MockVisitor()
+        other.visit(resource)
+        self.assertEqual(other.pattern_calls, 2)
+
 
 class TestTransformer(unittest.TestCase):
     def test(self):
@@ -118,3 +137,139 @@ class ReplaceTransformer(visitor.Transformer):
         """Perform find and replace on text values only"""
         node.value = node.value.replace(self.before, self.after)
         return node
+
+
+class IterativeMockVisitor(MockVisitor):
+    iterative = True
+
+
+class IterativeReplaceTransformer(ReplaceTransformer):
+    iterative = True
+
+
+class DropAttributes(visitor.Transformer):
+    def visit_Attribute(self, node):
+        return None
+
+
+class IterativeDropAttributes(DropAttributes):
+    iterative = True
+
+
+class TestIterative(unittest.TestCase):
+    def setUp(self):
+        self.resource = FluentParser().parse(
+            dedent_ftl(
+                """\
+        one = Message
+        # Comment
+        two = Messages
+        three = Messages with
+            .an = Attribute
+            .other = { $var ->
+                [one] Message
+               *[other] Messages
+            }
+        """
+            )
+        )
+
+    def test_visitor(self):
+        mv = MockVisitor()
+        mv.visit(self.resource)
+        iterative = IterativeMockVisitor()
+        iterative.visit(self.resource)
+        self.assertEqual(iterative.pattern_calls, mv.pattern_calls)
+        self.assertDictEqual(iterative.calls, mv.calls)
+
+    def test_order(self):
+        class Collect(visitor.Visitor):
+            def __init__(self):
+                self.names = []
+
+            def visit_Identifier(self, node):
+                self.names.append(node.name)
+
+        class IterativeCollect(Collect):
+            iterative = True
+
+        recursive = Collect()
+        recursive.visit(self.resource)
+        iterative = IterativeCollect()
+        iterative.visit(self.resource)
+        self.assertEqual(
+            iterative.names,
+            ["one", "two", "three", "an", "other", "var", "one", "other"],
+        )
+        self.assertEqual(iterative.names, recursive.names)
+
+    def test_transformer(self):
+        expected = ReplaceTransformer("Message", "Term").visit(self.resource.clone())
+        transformed = IterativeReplaceTransformer("Message", "Term").visit(
+            self.resource
+        )
+        self.assertIs(transformed, self.resource)
+        self.assertTrue(transformed.equals(expected))
+
+    def test_transformer_remove(self):
+        expected = DropAttributes().visit(self.resource.clone())
+        transformed = IterativeDropAttributes().visit(self.resource)
+        self.assertEqual(transformed.body[2].attributes, [])
+        self.assertTrue(transformed.equals(expected))
+
+    def test_deep(self):
+        expression = ast.StringLiteral("deep")
+        for _ in range(10000):
+            expression = ast.Placeable(expression)
+        message = ast.Message(ast.Identifier("deep"), ast.Pattern([expression]))
+
+        class Count(visitor.Visitor):
+            iterative = True
+            placeables = 0
+
+            def visit_Placeable(self, node):
+                self.placeables += 1
+                self.generic_visit(node)
+
+        counter = Count()
+        counter.visit(message)
+        self.assertEqual(counter.placeables, 10000)
+
+        class Upper(visitor.Transformer):
+            iterative = True
+
+            def visit_StringLiteral(self, node):
+                return ast.StringLiteral(node.value.upper())
+
+        Upper().visit(message)
+        depth = 0
+        expression = message.value.elements[0]
+        while isinstance(expression, ast.Placeable):
+            depth += 1
+            expression = expression.expression
+        self.assertEqual(depth, 10000)
+        self.assertTrue(expression.equals(ast.StringLiteral("DEEP")))
+
+        class Unwrap(visitor.Transformer):
+            iterative = True
+
+            def visit_Placeable(self, node):
+                while isinstance(node.expression, ast.Placeable):
+                    node = node.expression
+                self.generic_visit(node)
+                return node
+
+        Unwrap().visit(message)
+        self.assertTrue(
+            message.value.equals(
+                ast.Pattern([ast.Placeable(ast.StringLiteral("DEEP"))])
+            )
+        )
+
+    def test_instance_method(self):
+        resource = FluentParser().parse("one = One\n")
+        transformer = IterativeReplaceTransformer("One", "Two")
+        transformer.visit_Identifier = lambda node: ast.Identifier("two")
+        transformer.visit(resource)
+        self.assertEqual(resource.body[0].id.name, "two")
+        self.assertEqual(resource.body[0].value.elements[0].value, "Two")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Generate synthetic Fluent catalogs of any size for the benchmarks.
+
+The catalogs cycle through the kinds of messages found in real projects,
+so that benchmarks on catalogs of different sizes are comparable. Run this
+as a script to write a catalog to stdout.
+"""
+
+import argparse
+import sys
+from datetime import date
+
+TERMS = """\
+-brand-{index} =
+    {{ $case ->
+       *[nominative] Brand {index}
+        [genitive] Brand {index}'s
+    }}
+    .gender = feminine
+"""
+
+MESSAGES = [
+    "msg-{index} = Simple text message number {index}\n",
+    "msg-{index} = Hello {{ $name }}, welcome back\n",
+    """\
+msg-{index} =
+    {{ $count ->
+        [one] One item in folder {index}
+       *[other] {{ $count }} items in folder {index}
+    }}
+""",
+    "msg-{index} = Total: {{ NUMBER($amount, minimumFractionDigits: 2) }}\n",
+    'msg-{index} = Updated on {{ DATETIME($date, dateStyle: "long") }}\n',
+    'msg-{index} = Settings of {{ -brand-{term}(case: "genitive") }}\n',
+    """\
+msg-{index} = {{ msg-{previous} }} and more
+    .title = Title for {{ $name }}
+    .accesskey = M
+""",
+    """\
+msg-{index} =
+    {{ $gender ->
+        [feminine] She shared {{ $count }} photos with {{ -brand-{term} }}
+        [masculine] He shared {{ $count }} photos with {{ -brand-{term} }}
+       *[other] They shared {{ $count }} photos with {{ -brand-{term} }}
+    }}
+""",
+]
+
+ARGS = {
+    "name": "Anna",
+    "count": 3,
+    "amount": 1234.5,
+    "date": date(2020, 2, 29),
+    "gender": "feminine",
+}
+
+
+def generate_catalog(size, terms=10):
+    """Return the source of a catalog of size messages and a few terms.
+
+    Every tenth message has a comment, and every hundredth starts a group.
+    The messages are named msg-0 to msg-{size - 1}, and all of them can be
+    formatted with `ARGS`.
+    """
+    parts = [TERMS.format(index=index) for index in range(terms)]
+    for index in range(size):
+        if index % 100 == 0:
+            parts.append(f"\n## Group {index // 100}\n\n")
+        if index % 10 == 0:
+            parts.append(f"# Comment for msg-{index}\n")
+        template = MESSAGES[index % len(MESSAGES)]
+        parts.append(
+            template.format(index=index, previous=max(index - 1, 0), term=index % terms)
+        )
+    return "".join(parts)
+
+
+def message_ids(size):
+    return [f"msg-{index}" for index in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("size", type=int, help="number of messages")
+    parser.add_argument("--terms", type=int, default=10, help="number of terms")
+    args = parser.parse_args()
+    sys.stdout.write(generate_catalog(args.size, args.terms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import pytest
+from memory import measure_memory
+
+
+@pytest.fixture
+def benchmark(benchmark):
+    return measure_memory(benchmark)
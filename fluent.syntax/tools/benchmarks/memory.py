@@ -0,0 +1,41 @@
+"""Record the peak memory of benchmarks, along with their timings."""
+
+import tracemalloc
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+
+class MemoryBenchmarkFixture(BenchmarkFixture):
+    """The benchmark fixture of pytest-benchmark, also measuring memory.
+
+    Unless benchmarks are disabled, the benchmarked function is run once
+    more with tracemalloc, and the peak of the memory allocated by it is
+    stored in bytes as `peak_memory` in the extra info of the benchmark.
+    """
+
+    def __call__(self, function, *args, **kwargs):
+        if not self.disabled:
+            self.trace(function, args, kwargs)
+        return super().__call__(function, *args, **kwargs)
+
+    def pedantic(self, target, args=(), kwargs=None, setup=None, **options):
+        if not self.disabled:
+            trace_args, trace_kwargs = args, kwargs
+            if setup is not None:
+                trace_args, trace_kwargs = setup() or (args, kwargs)
+            self.trace(target, trace_args, trace_kwargs or {})
+        return super().pedantic(target, args, kwargs, setup, **options)
+
+    def trace(self, function, args, kwargs):
+        tracemalloc.start()
+        try:
+            function(*args, **kwargs)
+            self.extra_info["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def measure_memory(benchmark):
+    """Make a benchmark fixture measure memory, too."""
+    benchmark.__class__ = MemoryBenchmarkFixture
+    return benchmark
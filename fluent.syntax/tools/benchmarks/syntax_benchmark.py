@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# This should be run using pytest
+
+import os
+from typing import Any
+
+import pytest
+from catalog import generate_catalog
+from fluent.syntax import FluentParser, FluentSerializer, ast, parse
+from fluent.syntax.visitor import Transformer, Visitor
+
+WORKLOAD = os.path.join(
+    os.path.dirname(__file__), "..", "..", "tests", "syntax", "fixtures_perf"
+)
+CATALOG_SIZES = [100, 1000, 10000]
+
+MESSAGE = """
+message-{index} = Message { $var } with { -term-{index} } and { message-{index}.attr }
+    .attr = { $num ->
+        [one] One { NUMBER($num, minimumFractionDigits: 2) }
+       *[other] Other { $num }
+    }
+-term-{index} = Term
+"""
+
+
+@pytest.fixture(scope="module")
+def resource():
+    return parse(
+        "".join(MESSAGE.replace("{index}", str(index)) for index in range(2000))
+    )
+
+
+@pytest.fixture(scope="module")
+def workload():
+    with open(
+        os.path.join(WORKLOAD, "workload-low.ftl"), encoding="utf-8", newline="\n"
+    ) as file:
+        return file.read()
+
+
+@pytest.fixture(scope="module", params=CATALOG_SIZES)
+def catalog(request):
+    return generate_catalog(request.param)
+
+
+class TestParse:
+    def test_workload(self, workload, benchmark):
+        benchmark(lambda: FluentParser().parse(workload))
+
+    def test_workload_without_spans(self, workload, benchmark):
+        benchmark(lambda: FluentParser(with_spans=False).parse(workload))
+
+    def test_catalog(self, catalog, benchmark):
+        benchmark(lambda: FluentParser().parse(catalog))
+
+    def test_catalog_without_spans(self, catalog, benchmark):
+        benchmark(lambda: FluentParser(with_spans=False).parse(catalog))
+
+
+class TestSerialize:
+    def test_workload(self, workload, benchmark):
+        resource = parse(workload)
+        benchmark(lambda: FluentSerializer().serialize(resource))
+
+    def test_catalog(self, catalog, benchmark):
+        resource = parse(catalog)
+        benchmark(lambda: FluentSerializer().serialize(resource))
+
+    def test_catalog_with_source(self, catalog, benchmark):
+        resource = parse(catalog)
+        benchmark(lambda: FluentSerializer().serialize(resource, source=catalog))
+
+
+class RecursiveVisitor:
+    """The reference traversal, with a method lookup by name for each node."""
+
+    def visit(self, node: Any) -> None:
+        if isinstance(node, list):
+            for child in node:
+                self.visit(child)
+            return
+        if not isinstance(node, ast.BaseNode):
+            return
+        nodename = type(node).__name__
+        visit = getattr(self, f"visit_{nodename}", self.generic_visit)
+        visit(node)
+
+    def generic_visit(self, node: ast.BaseNode) -> None:
+        for propvalue in vars(node).values():
+            self.visit(propvalue)
+
+
+class ReferenceCounter(RecursiveVisitor):
+    count = 0
+
+    def visit_VariableReference(self, node: ast.VariableReference) -> None:
+        self.count += 1
+
+
+class Counter(Visitor):
+    count = 0
+
+    def visit_VariableReference(self, node: ast.VariableReference) -> None:
+        self.count += 1
+
+
+class IterativeCounter(Counter):
+    iterative = True
+
+
+class Identity(Transformer):
+    pass
+
+
+class IterativeIdentity(Transformer):
+    iterative = True
+
+
+class TestVisitor:
+    def test_catalog(self, catalog, benchmark):
+        resource = parse(catalog)
+        benchmark(lambda: Counter().visit(resource))
+
+    def test_reference(self, resource, benchmark):
+        benchmark(lambda: ReferenceCounter().visit(resource))
+
+    def test_visitor(self, resource, benchmark):
+        benchmark(lambda: Counter().visit(resource))
+
+    def test_iterative_visitor(self, resource, benchmark):
+        benchmark(lambda: IterativeCounter().visit(resource))
+
+    def test_transformer(self, resource, benchmark):
+        benchmark(lambda: Identity().visit(resource))
+
+    def test_iterative_transformer(self, resource, benchmark):
+        benchmark(lambda: IterativeIdentity().visit(resource))
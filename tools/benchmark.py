@@ -0,0 +1,262 @@
+#!/usr/bin/python
+"""Run the benchmarks, keep their results, and compare them between commits.
+
+The results are stored in a JSON history, by commit and by Python version.
+Each benchmark has its mean, standard deviation, number of rounds and peak
+memory.
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The benchmark files of each package.
+SUITES = {
+    "fluent.syntax": ["tools/benchmarks/syntax_benchmark.py"],
+    "fluent.runtime": [
+        "tools/benchmarks/fluent_benchmark.py",
+        "tools/benchmarks/formatting_benchmark.py",
+    ],
+}
+
+# The benchmarks which make compare fail when they regress.
+FAIL_ON = [
+    "fluent.syntax/*TestParse::*",
+    "fluent.syntax/*TestSerialize::*",
+    "fluent.runtime/*TestBenchmark::test_template",
+    "fluent.runtime/*TestFormat::*",
+    "fluent.runtime/*TestCatalog::*",
+]
+
+# The exit code of pytest when no tests were selected.
+NO_TESTS_COLLECTED = 5
+
+
+def read_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def git_commit(ref="HEAD"):
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", ref],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    if ref == "HEAD":
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        if status:
+            commit += "-dirty"
+    return commit
+
+
+def resolve_commit(ref, history):
+    """The key of a commit in the history, for a key or a git reference."""
+    return ref if ref in history else git_commit(ref)
+
+
+def python_version():
+    return ".".join(map(str, sys.version_info[:2]))
+
+
+def run_suite(package, files, pytest_args):
+    """Run the benchmark files of a package, and return their results.
+
+    Exit if pytest fails, but not if the pytest arguments deselected all of
+    the benchmarks of the package.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(ROOT, "fluent.syntax"), os.path.join(ROOT, "fluent.runtime")]
+        + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "benchmark.json")
+        returncode = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", f"--benchmark-json={output}"]
+            + files
+            + pytest_args,
+            cwd=os.path.join(ROOT, package),
+            env=env,
+            check=False,
+        ).returncode
+        if returncode not in (0, NO_TESTS_COLLECTED):
+            sys.exit(f"The benchmarks of {package} failed with exit code {returncode}")
+        data = read_json(output, {"benchmarks": []})
+    return {
+        f"{package}/{benchmark['fullname']}": {
+            "mean": benchmark["stats"]["mean"],
+            "stddev": benchmark["stats"]["stddev"],
+            "rounds": benchmark["stats"]["rounds"],
+            "peak_memory": benchmark["extra_info"].get("peak_memory"),
+        }
+        for benchmark in data["benchmarks"]
+    }
+
+
+def run(history_path, pytest_args):
+    results = {}
+    for package, files in SUITES.items():
+        results.update(run_suite(package, files, pytest_args))
+    commit = git_commit()
+    history = read_json(history_path, {})
+    history.setdefault(commit, {})[python_version()] = results
+    write_json(history_path, history)
+    print(f"Stored {len(results)} results for {commit} on Python {python_version()}")
+    return commit
+
+
+def compare_results(baseline, results, threshold, noise):
+    """Compare two runs, benchmark by benchmark.
+
+    A benchmark regressed if its mean time got worse by more than the
+    threshold, relative to the baseline, and by more than noise times the
+    standard error of the difference. Its peak memory regressed if it grew by
+    more than the threshold.
+    Return rows of the name, the relative change in time and memory, and a
+    list of regressions. Benchmarks of the baseline which are missing from
+    the results are listed last, with no changes and "missing".
+    """
+    rows = []
+    for name in sorted(baseline.keys() & results.keys()):
+        base, new = baseline[name], results[name]
+        delta = new["mean"] - base["mean"]
+        error = math.sqrt(
+            base["stddev"] ** 2 / base["rounds"] + new["stddev"] ** 2 / new["rounds"]
+        )
+        regressions = []
+        if delta > threshold * base["mean"] and delta > noise * error:
+            regressions.append("time")
+        memory_change = None
+        if base.get("peak_memory") and new.get("peak_memory") is not None:
+            memory_change = new["peak_memory"] / base["peak_memory"] - 1
+            if memory_change > threshold:
+                regressions.append("memory")
+        rows.append((name, delta / base["mean"], memory_change, regressions))
+    for name in sorted(baseline.keys() - results.keys()):
+        rows.append((name, None, None, ["missing"]))
+    return rows
+
+
+def compare(history_path, baseline, current, threshold, noise, fail_on):
+    history = read_json(history_path, {})
+    version = python_version()
+    try:
+        baseline_results = history[baseline][version]
+        results = history[current][version]
+    except KeyError as e:
+        print(f"No results for {e.args[0]} on Python {version} in {history_path}")
+        return 2
+
+    failed = []
+    for name, time_change, memory_change, regressions in compare_results(
+        baseline_results, results, threshold, noise
+    ):
+        time = "" if time_change is None else f"{time_change:+8.1%}"
+        memory = "" if memory_change is None else f"{memory_change:+8.1%}"
+        flags = ", ".join(regressions)
+        print(f"{time:>8} {memory:>8}  {name}  {flags}")
+        if ("time" in regressions or "memory" in regressions) and any(
+            fnmatch.fnmatch(name, pattern) for pattern in fail_on
+        ):
+            failed.append(name)
+    if failed:
+        print(f"\n{len(failed)} benchmarks regressed from {baseline} to {current}:")
+        for name in failed:
+            print(f"  {name}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog="Arguments after -- are passed to pytest, like -k.",
+    )
+    parser.add_argument(
+        "--history",
+        default=os.path.join(ROOT, ".benchmarks-history.json"),
+        help="the JSON file with the results",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "run", help="run the benchmarks, and store the results of the commit"
+    )
+    compare_parser = commands.add_parser(
+        "compare", help="compare the stored results of two commits"
+    )
+    compare_parser.add_argument("baseline", help="the commit to compare to")
+    compare_parser.add_argument(
+        "current",
+        nargs="?",
+        help="the commit to compare, instead of running the benchmarks",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="the relative change to report as a regression",
+    )
+    compare_parser.add_argument(
+        "--noise",
+        type=float,
+        default=2.0,
+        help="the number of standard errors a regression must exceed",
+    )
+    compare_parser.add_argument(
+        "--fail-on",
+        action="append",
+        help="glob of the benchmarks which fail when they regress",
+    )
+    # Arguments after -- are passed to pytest.
+    argv = sys.argv[1:]
+    pytest_args = []
+    if "--" in argv:
+        pytest_args = argv[argv.index("--") + 1 :]
+        argv = argv[: argv.index("--")]
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run(args.history, pytest_args)
+        return 0
+    history = read_json(args.history, {})
+    if args.current is None:
+        current = run(args.history, pytest_args)
+    else:
+        current = resolve_commit(args.current, history)
+    return compare(
+        args.history,
+        resolve_commit(args.baseline, history),
+        current,
+        args.threshold,
+        args.noise,
+        args.fail_on or FAIL_ON,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,22 @@
 #!/usr/bin/python
 
+import argparse
+import glob
+import hashlib
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
 
-from fluent.syntax import parse, serialize
+from fluent.syntax import FluentSerializer, iter_entries, parse, serializer
 
 sys.path.append("./")
 
+# The options of the serializer, the same for printing and formatting files.
+# Junk is kept, so that formatting never drops content.
+SERIALIZER_OPTIONS = {"with_junk": True}
+
 
 def read_file(path):
     with open(path, "r", encoding="utf-8", newline="\n") as file:
@@ -13,12 +24,138 @@ def read_file(path):
     return text
 
 
-def pretty_print(fileType, data):
-    ast = parse(data)
-    print(serialize(ast))
+def pretty_print(fileType, path):
+    with open(path, "r", encoding="utf-8", newline="\n") as file:
+        FluentSerializer(**SERIALIZER_OPTIONS).serialize_entries(
+            iter_entries(file), sys.stdout
+        )
+
+
+def find_files(patterns):
+    """Expand directories and glob patterns to the FTL files they contain."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*.ftl"), recursive=True)
+        elif glob.has_magic(pattern):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern]
+        paths.extend(sorted(matches))
+    return list(dict.fromkeys(os.path.normpath(path) for path in paths))
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def formatter_key():
+    """Identify the formatter, so that a cache is dropped when it changes."""
+    try:
+        version = metadata.version("fluent.syntax")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "fluent.syntax": version,
+        "serializer": content_hash(read_file(serializer.__file__)),
+        "options": SERIALIZER_OPTIONS,
+    }
+
+
+def format_file(path, known_hash=None):
+    """Format a file, returning its hash and its formatted text if it changed.
+
+    Files with known_hash are known to be formatted, and aren't parsed.
+    """
+    text = read_file(path)
+    digest = content_hash(text)
+    if digest == known_hash:
+        return path, digest, None
+    formatted = FluentSerializer(**SERIALIZER_OPTIONS).serialize(parse(text))
+    if formatted == text:
+        return path, digest, None
+    return path, content_hash(formatted), formatted
+
+
+def load_cache(path):
+    """The hashes of formatted files, if the cache is for this formatter."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("key") != formatter_key():
+        return {}
+    return data.get("files", {})
+
+
+def save_cache(path, cache):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {"key": formatter_key(), "files": cache}, file, indent=0, sort_keys=True
+        )
+
+
+def format_files(paths, write, cache_path=None, jobs=None):
+    """Format files in a process pool, skipping those known to be formatted.
+
+    Return the paths of the files which weren't formatted.
+    """
+    cache = load_cache(cache_path) if cache_path else {}
+    known_hashes = [cache.get(os.path.abspath(path)) for path in paths]
+
+    changed = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for path, digest, formatted in executor.map(
+            format_file, paths, known_hashes, chunksize=max(1, len(paths) // 64)
+        ):
+            if formatted is None:
+                cache[os.path.abspath(path)] = digest
+                continue
+            changed.append(path)
+            if write:
+                with open(path, "w", encoding="utf-8", newline="\n") as file:
+                    file.write(formatted)
+                cache[os.path.abspath(path)] = digest
+
+    if cache_path:
+        save_cache(cache_path, cache)
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Format Fluent files. Without --check or --write, print "
+        "the formatted file to stdout."
+    )
+    parser.add_argument("paths", nargs="+", help="files, directories or globs")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--check", action="store_true", help="exit with 1 if any file would change"
+    )
+    mode.add_argument(
+        "--write", action="store_true", help="rewrite the files which change"
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="store the hashes of formatted files in PATH, to skip them the next "
+        "time, like .fluentfmt-cache.json",
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="number of processes")
+    args = parser.parse_args()
+
+    paths = find_files(args.paths)
+    if not (args.check or args.write):
+        for path in paths:
+            pretty_print("ftl", path)
+        return 0
+
+    changed = format_files(paths, args.write, args.cache, args.jobs)
+    for path in changed:
+        print(f"{'reformatted' if args.write else 'would reformat'} {path}")
+    return 1 if changed and args.check else 0
 
 
 if __name__ == "__main__":
-    file_type = "ftl"
-    f = read_file(sys.argv[1])
-    pretty_print(file_type, f)
+    sys.exit(main())
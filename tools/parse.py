@@ -1,11 +1,19 @@
 #!/usr/bin/python
 
+import argparse
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-from fluent.syntax import parse
+from fluent.syntax import ast, parse
 
 sys.path.append("./")
+# fluentfmt is next to this script, which may be run from anywhere.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fluentfmt import find_files  # noqa: E402
 
 
 def read_file(path):
@@ -19,7 +27,79 @@ def print_ast(fileType, data):
     print(json.dumps(ast.to_json(), indent=2, ensure_ascii=False))
 
 
+def entry_lines(path, with_spans=True, with_comments=True):
+    """Dump the entries of a file as lines of JSON, tagged with file and id."""
+    dropped = set()
+    if not with_spans:
+        dropped.add("span")
+    if not with_comments:
+        dropped.add("comment")
+
+    def drop_fields(obj):
+        for name in dropped:
+            obj.pop(name, None)
+        return obj
+
+    lines = []
+    for entry in parse(read_file(path), with_spans=with_spans).body:
+        if isinstance(entry, ast.BaseComment) and not with_comments:
+            continue
+        entry_id = None
+        if isinstance(entry, (ast.Message, ast.Term)):
+            entry_id = entry.id.name
+            if isinstance(entry, ast.Term):
+                entry_id = f"-{entry_id}"
+        line = {
+            "file": path,
+            "id": entry_id,
+            "entry": entry.to_json(drop_fields if dropped else None),
+        }
+        lines.append(json.dumps(line, ensure_ascii=False) + "\n")
+    return lines
+
+
+def dump_entries(paths, with_spans=True, with_comments=True, jobs=None):
+    """Write the entries of files to stdout as newline-delimited JSON.
+
+    Files are parsed in a process pool, and written in order as soon as
+    they're parsed.
+    """
+    dump = partial(entry_lines, with_spans=with_spans, with_comments=with_comments)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for lines in executor.map(dump, paths, chunksize=max(1, len(paths) // 64)):
+            sys.stdout.writelines(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the AST of Fluent files.")
+    parser.add_argument("paths", nargs="+", help="files, directories or globs")
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="print one line of JSON for each entry of all files",
+    )
+    parser.add_argument(
+        "--no-spans",
+        action="store_false",
+        dest="with_spans",
+        help="drop spans, with --ndjson",
+    )
+    parser.add_argument(
+        "--no-comments",
+        action="store_false",
+        dest="with_comments",
+        help="drop comments, with --ndjson",
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="number of processes")
+    args = parser.parse_args()
+
+    paths = find_files(args.paths)
+    if args.ndjson:
+        dump_entries(paths, args.with_spans, args.with_comments, args.jobs)
+    else:
+        for path in paths:
+            print_ast("ftl", read_file(path))
+
+
 if __name__ == "__main__":
-    file_type = "ftl"
-    f = read_file(sys.argv[1])
-    print_ast(file_type, f)
+    main()